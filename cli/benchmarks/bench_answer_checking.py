@@ -0,0 +1,76 @@
+"""
+Spanish Learning Chatbot - Answer Checking Benchmark
+Measures typed answers graded per second with answers compiled once
+against compiling (normalizing) the accepted answer on every check
+
+Usage:
+    python benchmarks/bench_answer_checking.py [--answers N]
+"""
+
+import time
+import random
+import argparse
+
+import common
+from src.utils import load_json_data
+from src.answer_checker import AnswerChecker, CompiledAnswer, normalize_answer, GRADE_EXACT, GRADE_NEAR
+
+
+def make_response(rng, answer):
+    """Make a learner response: exact, without accents, with a typo or wrong"""
+    kind = rng.randrange(4)
+    if kind == 0:
+        return answer
+    if kind == 1:
+        return answer.lower().replace("á", "a").replace("é", "e").replace("í", "i").replace("ó", "o")
+    if kind == 2 and len(answer) > 4:
+        i = rng.randrange(1, len(answer))
+        return answer[:i] + answer[i + 1:]
+    return "no sé"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, default=100000, help="answers to grade")
+    args = parser.parse_args()
+
+    vocabulary = load_json_data('data/vocabulary.json')
+    answers = [word[field] for category in vocabulary['categories'] for word in category['words']
+               for field in ('spanish', 'english')]
+    rng = random.Random(0)
+    pairs = []
+    for _ in range(args.answers):
+        answer = rng.choice(answers)
+        pairs.append((make_response(rng, answer), answer))
+
+    # Sanity checks on the tolerant matching
+    checker = AnswerChecker()
+    assert checker.check("adios", "Adiós")['grade'] == GRADE_EXACT
+    assert checker.check("good night", "Good evening/night")['grade'] == GRADE_EXACT
+    assert checker.check("la manzana", "Manzana")['grade'] == GRADE_EXACT
+    assert checker.check("gracas", "Gracias")['grade'] == GRADE_NEAR
+    assert not checker.check("dos", "Tres")['correct']
+
+    print(f"{len(answers)} accepted answers, {args.answers:,} responses\n")
+    print(f"{'checking':<30}{'answers/s':>14}")
+
+    start = time.perf_counter()
+    for response, answer in pairs:
+        CompiledAnswer(answer).grade(normalize_answer(response))
+    elapsed = time.perf_counter() - start
+    print(f"{'compile on every check':<30}{args.answers / elapsed:>14,.0f}")
+
+    checker = AnswerChecker()
+    checker.precompile(word for category in vocabulary['categories'] for word in category['words'])
+    start = time.perf_counter()
+    grades = {}
+    for response, answer in pairs:
+        grade = checker.check(response, answer)['grade']
+        grades[grade] = grades.get(grade, 0) + 1
+    elapsed = time.perf_counter() - start
+    print(f"{'precompiled':<30}{args.answers / elapsed:>14,.0f}")
+    print("\nGrades: " + ", ".join(f"{grade} {count:,}" for grade, count in sorted(grades.items())))
+
+
+if __name__ == "__main__":
+    main()
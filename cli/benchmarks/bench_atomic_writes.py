@@ -0,0 +1,66 @@
+"""
+Spanish Learning Chatbot - Atomic Write Benchmark
+Compares profile snapshot write latency and size for the old in-place
+write and the atomic temp-file-and-rename write under each fsync policy
+
+Usage:
+    python benchmarks/bench_atomic_writes.py [--mastered N] [--quizzes N] [--writes N]
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+import common
+from src.utils import save_json_data, FSYNC_POLICIES
+
+
+def save_in_place(data, file_path):
+    """The pre-atomic write: truncate the destination and dump into it"""
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    return True
+
+
+def measure(write, file_path, writes):
+    """Time `writes` calls of write() and return (latencies, bytes per write)"""
+    latencies = []
+    for _ in range(writes):
+        start = time.perf_counter()
+        write()
+        latencies.append(time.perf_counter() - start)
+    return latencies, os.path.getsize(file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mastered", type=int, default=20000, help="practiced words in the profile")
+    parser.add_argument("--quizzes", type=int, default=2000, help="quiz history entries in the profile")
+    parser.add_argument("--writes", type=int, default=20, help="writes per mode")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.mastered)
+    profile_data = common.make_profile("Learner", vocabulary, args.mastered, args.quizzes)
+
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        file_path = os.path.join(profiles_dir, "learner.json")
+        print(f"Profile: {args.mastered:,} practiced words, {args.quizzes:,} quizzes, {args.writes} writes per mode\n")
+        print(f"{'mode':<28}{'bytes':>14}{'p50 ms':>10}{'p99 ms':>10}")
+
+        modes = [("in-place (old)", lambda: save_in_place(profile_data, file_path))]
+        for compact in (False, True):
+            for fsync in FSYNC_POLICIES:
+                label = f"atomic, fsync={fsync}" + (", compact" if compact else "")
+                modes.append((label, lambda fsync=fsync, compact=compact: save_json_data(profile_data, file_path, fsync, compact)))
+
+        for label, write in modes:
+            latencies, size = measure(write, file_path, args.writes)
+            cut_points = statistics.quantiles(latencies, n=100)
+            print(f"{label:<28}{size:>14,}{cut_points[49] * 1000:>10.2f}{cut_points[98] * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
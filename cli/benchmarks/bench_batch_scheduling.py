@@ -0,0 +1,84 @@
+"""
+Spanish Learning Chatbot - Batch Scheduling Benchmark
+Times the vectorized scheduler on synthetic columns and checks it against
+the scalar SpacedRepetitionSystem.get_next_review_date (requires NumPy)
+
+Usage:
+    python benchmarks/bench_batch_scheduling.py [--rows N] [--check N]
+"""
+
+import time
+import argparse
+import datetime
+
+import common
+from src.spaced_repetition import SpacedRepetitionSystem
+from src.batch_scheduling import NEVER_PRACTICED, schedule_batch, schedule_profiles, _require_numpy
+
+
+def check_rows(mastery_levels, last_practiced, result):
+    """Compare batch results with the scalar function row by row"""
+    srs = SpacedRepetitionSystem()
+    today = datetime.datetime.now().date()
+    mismatches = 0
+    
+    for level, ordinal, next_review in zip(mastery_levels.tolist(), last_practiced.tolist(),
+                                           result['next_review'].tolist()):
+        last = None if ordinal == NEVER_PRACTICED else datetime.date.fromordinal(ordinal).isoformat()
+        expected = srs.get_next_review_date(level, last, True)
+        if expected != next_review or (expected <= today) != (next_review <= today):
+            mismatches += 1
+    
+    return mismatches
+
+
+def main():
+    _require_numpy()
+    import numpy as np
+    
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000, help="words to schedule")
+    parser.add_argument("--profiles", type=int, default=100_000, help="profiles the words belong to")
+    parser.add_argument("--check", type=int, default=200_000, help="rows to compare with the scalar function")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    today = datetime.datetime.now().date().toordinal()
+    mastery_levels = rng.integers(0, 6, args.rows, dtype=np.int8)
+    last_practiced = rng.integers(today - 90, today + 1, args.rows, dtype=np.int32)
+    last_practiced[rng.random(args.rows) < 0.01] = NEVER_PRACTICED
+    profile_index = rng.integers(0, args.profiles, args.rows, dtype=np.int32)
+    
+    start = time.perf_counter()
+    result = schedule_batch(mastery_levels, last_practiced, profile_index, args.profiles)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{args.rows:,} rows, {args.profiles:,} profiles")
+    print(f"schedule_batch: {elapsed:.3f} s ({args.rows / elapsed / 1e6:.1f}M rows/s), {result['due_count']:,} due")
+    
+    # Scalar comparison on a sample, including out-of-range mastery levels
+    sample = slice(0, min(args.check, args.rows))
+    sample_levels = mastery_levels[sample].copy()
+    sample_levels[::97] = 9
+    sample_result = schedule_batch(sample_levels, last_practiced[sample])
+    
+    start = time.perf_counter()
+    mismatches = check_rows(sample_levels, last_practiced[sample], sample_result)
+    scalar_elapsed = time.perf_counter() - start
+    print(f"scalar check: {mismatches} mismatches in {len(sample_levels):,} rows "
+          f"(scalar path {len(sample_levels) / scalar_elapsed / 1e6:.2f}M rows/s)")
+    
+    # End-to-end from profile dicts
+    vocabulary = common.make_vocabulary(2000)
+    profiles = [common.make_profile(f"Learner {i}", vocabulary, 500, seed=i) for i in range(200)]
+    start = time.perf_counter()
+    columns = schedule_profiles(profiles)
+    print(f"schedule_profiles: {len(columns['mastery_level']):,} rows from {len(profiles)} profiles "
+          f"in {time.perf_counter() - start:.3f} s, {columns['due_count']:,} due")
+    
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
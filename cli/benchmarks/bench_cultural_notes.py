@@ -0,0 +1,70 @@
+"""
+Spanish Learning Chatbot - Cultural Notes Benchmark
+Compares creating CulturalNotesManager and opening one country with the
+old eager load of both notes documents
+
+Usage:
+    python benchmarks/bench_cultural_notes.py [--countries N] [--notes N]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import common
+from src.utils import save_json_data, load_json_cached, clear_json_cache
+from src.cultural_notes import CulturalNotesManager
+from src.vocabulary_search import normalize_text
+
+
+def eager_load(notes_file, grammar_file):
+    """The pre-shard constructor: parse both documents and index names"""
+    cultural_notes = load_json_cached(notes_file)
+    grammar_notes = load_json_cached(grammar_file)
+    countries = {normalize_text(c['name']): c for c in cultural_notes['countries']}
+    topics = {normalize_text(t['name']): t for t in grammar_notes['topics']}
+    return countries, topics
+
+
+def timed(function):
+    """Run a function with a cold JSON cache and return milliseconds"""
+    clear_json_cache()
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--countries", type=int, default=500, help="countries and grammar topics")
+    parser.add_argument("--notes", type=int, default=40, help="notes per country and examples per topic")
+    args = parser.parse_args()
+
+    cultural_notes, grammar_notes = common.make_notes(args.countries, args.notes)
+    with tempfile.TemporaryDirectory() as data_dir:
+        notes_file = os.path.join(data_dir, "cultural_notes.json")
+        grammar_file = os.path.join(data_dir, "grammar_notes.json")
+        save_json_data(cultural_notes, notes_file)
+        save_json_data(grammar_notes, grammar_file)
+        size = os.path.getsize(notes_file) + os.path.getsize(grammar_file)
+        country = f"Country {args.countries // 2}"
+
+        print(f"{args.countries} countries and topics, {size / 1e6:.1f} MB of notes\n")
+        print(f"{'operation':<40}{'ms':>10}")
+        rows = (
+            # First use after the documents change splits them into shards
+            ("split into shards (once per edit)", lambda: (
+                CulturalNotesManager(notes_file, grammar_file).get_country_by_name(country),
+                CulturalNotesManager(notes_file, grammar_file).get_grammar_by_name("Topic 0"))),
+            ("startup, eager load (old)", lambda: eager_load(notes_file, grammar_file)),
+            ("startup, lazy", lambda: CulturalNotesManager(notes_file, grammar_file)),
+            ("open one country, eager (old)", lambda: eager_load(notes_file, grammar_file)[0][normalize_text(country)]),
+            ("open one country, sharded", lambda: CulturalNotesManager(notes_file, grammar_file).get_country_by_name(country)),
+            ("list grammar topics, sharded", lambda: CulturalNotesManager(notes_file, grammar_file).get_grammar_topic_summaries()),
+        )
+        for label, function in rows:
+            print(f"{label:<40}{timed(function):>10.2f}")
+
+if __name__ == "__main__":
+    main()
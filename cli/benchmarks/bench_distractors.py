@@ -0,0 +1,68 @@
+"""
+Spanish Learning Chatbot - Distractor Benchmark
+Compares building quiz questions by filtering the whole category per
+question with the precomputed pools in DistractorEngine
+
+Usage:
+    python benchmarks/bench_distractors.py [--words N] [--questions N]
+"""
+
+import time
+import random
+import argparse
+
+import common
+from src.quiz import QuizSystem
+
+
+def filtered_sample(category, word, rng):
+    """The pre-engine distractor pick: filter the category, then sample"""
+    other_words = [w for w in category['words'] if w != word]
+    return [w['english'] for w in rng.sample(other_words, 3)]
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return the mean seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=50000, help="words in the quizzed category")
+    parser.add_argument("--questions", type=int, default=200, help="questions to time")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words, words_per_category=args.words)
+    category = vocabulary['categories'][0]
+    rng = random.Random(0)
+    words = [rng.choice(category['words']) for _ in range(args.questions)]
+
+    print(f"{args.words:,}-word category, {args.questions} questions\n")
+    print(f"{'distractors':<30}{'us/question':>14}")
+
+    old_time = timed(lambda: [filtered_sample(category, word, rng) for word in words])
+    print(f"{'filter + sample (old)':<30}{old_time / args.questions * 1e6:>14.1f}")
+
+    for label, prefer_confusables, difficulty in (
+        ("pooled", False, None),
+        ("pooled, same difficulty", False, "beginner"),
+        ("pooled, confusables", True, None),
+    ):
+        quiz_system = QuizSystem(vocabulary, prefer_confusables=prefer_confusables)
+        build = lambda: [quiz_system.build_question(category, word, 1, rng, difficulty) for word in words]
+        build()  # Build the pools once, as a running quiz system would have
+        new_time = timed(build)
+
+        # Options are distinct and contain the right answer exactly once
+        for question in build():
+            assert len(set(question['options'])) == 4
+            assert question['options'][question['correct_index']] == question['correct_answer']
+
+        print(f"{label:<30}{new_time / args.questions * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
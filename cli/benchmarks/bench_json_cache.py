@@ -0,0 +1,56 @@
+"""
+Spanish Learning Chatbot - JSON Cache Benchmark
+Compares re-parsing a vocabulary file on every load with the process-wide
+mtime-aware cache in utils
+
+Usage:
+    python benchmarks/bench_json_cache.py [--words N] [--loads N]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import common
+from src.utils import load_json_data, load_json_cached, save_json_data, json_cache_info, clear_json_cache
+from src.vocabulary_manager import VocabularyManager
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return the mean seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=20000, help="words in the vocabulary file")
+    parser.add_argument("--loads", type=int, default=50, help="loads to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        vocabulary_file = os.path.join(data_dir, "vocabulary.json")
+        save_json_data(common.make_vocabulary(args.words), vocabulary_file)
+        print(f"{args.words:,} words, {os.path.getsize(vocabulary_file) / 1e6:.1f} MB\n")
+
+        clear_json_cache()
+        print(f"{'load':<28}{'ms':>10}")
+        print(f"{'load_json_data':<28}{timed(lambda: load_json_data(vocabulary_file), args.loads) * 1000:>10.3f}")
+        print(f"{'load_json_cached (warm)':<28}{timed(lambda: load_json_cached(vocabulary_file), args.loads) * 1000:>10.3f}")
+        print(f"{'VocabularyManager (warm)':<28}{timed(lambda: VocabularyManager(vocabulary_file), args.loads) * 1000:>10.3f}")
+
+        # A changed file is parsed again
+        manager = VocabularyManager(vocabulary_file)
+        manager.add_custom_word("nuevo", "new", category="category_0")
+        with open(vocabulary_file, 'a', encoding='utf-8') as file:
+            file.write("\n")
+        reloaded = load_json_cached(vocabulary_file)
+        print(f"\nreloaded after external change: {reloaded is not manager.vocabulary}")
+        print(f"cache: {json_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Spanish Learning Chatbot - Notes Search Benchmark
+Measures building, reloading and incrementally updating the notes search
+index, and its query latency
+
+Usage:
+    python benchmarks/bench_notes_search.py [--countries N] [--notes N] [--queries N]
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+import common
+from src.utils import save_json_data, clear_json_cache
+from src.cultural_notes import CulturalNotesManager
+
+
+def timed(function):
+    """Run a function with a cold JSON cache and return (milliseconds, result)"""
+    clear_json_cache()
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--countries", type=int, default=500, help="countries and grammar topics")
+    parser.add_argument("--notes", type=int, default=40, help="notes per country and examples per topic")
+    parser.add_argument("--queries", type=int, default=500, help="queries to time")
+    args = parser.parse_args()
+
+    cultural_notes, grammar_notes = common.make_notes(args.countries, args.notes)
+    with tempfile.TemporaryDirectory() as data_dir:
+        notes_file = os.path.join(data_dir, "cultural_notes.json")
+        grammar_file = os.path.join(data_dir, "grammar_notes.json")
+        save_json_data(cultural_notes, notes_file)
+        save_json_data(grammar_notes, grammar_file)
+
+        def new_manager():
+            return CulturalNotesManager(notes_file, grammar_file)
+
+        build_time, index = timed(lambda: new_manager().get_search_index())
+        print(f"{len(index.docs):,} documents, {len(index.postings):,} terms, "
+              f"{os.path.getsize(index.index_file) / 1e6:.1f} MB index file\n")
+        print(f"{'operation':<36}{'ms':>10}")
+        print(f"{'build from scratch':<36}{build_time:>10.1f}")
+        print(f"{'load saved index (startup)':<36}{timed(lambda: new_manager().get_search_index())[0]:>10.1f}")
+
+        cultural_notes['countries'][0]['notes'][0]['content'] += " Edited."
+        save_json_data(cultural_notes, notes_file)
+        manager = new_manager()
+        update_time, _ = timed(manager.get_search_index)
+        print(f"{'update after editing one country':<36}{update_time:>10.1f}")
+
+        # Two or three words picked from random notes
+        rng = random.Random(0)
+        queries = []
+        for _ in range(args.queries):
+            words = rng.choice(rng.choice(cultural_notes['countries'])['notes'])['content'].rstrip(".").split()
+            queries.append(" ".join(rng.sample(words, rng.randint(2, 3))))
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            manager.search_notes(query)
+            latencies.append((time.perf_counter() - start) * 1000)
+        cut_points = statistics.quantiles(latencies, n=100)
+        print(f"\n{'query p50 / p99 ms':<36}{cut_points[49]:>10.2f}{cut_points[98]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Spanish Learning Chatbot - Profile Save Benchmark
+Compares profile writes per session across write-behind and journal modes
+
+Usage:
+    python benchmarks/bench_profile_saves.py [--mastered N] [--quizzes N]
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+
+import common
+from src import profile_storage as profile_storage_module
+from src.user_profile import UserProfile
+from src.utils import save_json_data, append_json_lines
+
+
+class WriteCounter:
+    """Wraps the profile write functions and records how many bytes they wrote"""
+    
+    def __init__(self):
+        self.writes = 0
+        self.bytes_written = 0
+    
+    def save(self, data, file_path, *args, **kwargs):
+        result = save_json_data(data, file_path, *args, **kwargs)
+        self.writes += 1
+        self.bytes_written += os.path.getsize(file_path)
+        return result
+    
+    def append(self, records, file_path, *args, **kwargs):
+        size_before = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        result = append_json_lines(records, file_path, *args, **kwargs)
+        self.writes += 1
+        self.bytes_written += os.path.getsize(file_path) - size_before
+        return result
+
+
+def run_session(profiles_dir, profile_data, write_behind, journal, cards, questions):
+    """Run one flashcard session and one quiz against a fresh profile"""
+    save_json_data(profile_data, os.path.join(profiles_dir, "learner.json"))
+    profile = UserProfile(profiles_dir=profiles_dir, write_behind=write_behind, journal=journal)
+    profile.load_profile("learner")
+    
+    counter = WriteCounter()
+    profile_storage_module.save_json_data = counter.save
+    profile_storage_module.append_json_lines = counter.append
+    rng = random.Random(0)
+    words = [(category, word) for category, words in profile_data["mastered_words"].items() for word in words]
+    
+    try:
+        start = time.perf_counter()
+        
+        # Spaced repetition session
+        for category, word in rng.sample(words, cards):
+            profile.update_word_mastery(word, category, rng.random() < 0.7)
+        profile.update_flashcard_practice(cards)
+        profile.flush()
+        
+        # Quiz session
+        quiz_words = rng.sample(words, questions)
+        profile.update_quiz_score("category_0", questions - 3, questions)
+        for category, word in quiz_words:
+            profile.update_word_mastery(word, category, rng.random() < 0.7)
+        profile.flush()
+        
+        elapsed = time.perf_counter() - start
+    finally:
+        profile_storage_module.save_json_data = save_json_data
+        profile_storage_module.append_json_lines = append_json_lines
+        profile.compact()
+    
+    return counter, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mastered", type=int, default=5000, help="practiced words in the profile")
+    parser.add_argument("--quizzes", type=int, default=500, help="quiz history entries in the profile")
+    parser.add_argument("--cards", type=int, default=50, help="flashcards in the session")
+    parser.add_argument("--questions", type=int, default=20, help="questions in the quiz")
+    args = parser.parse_args()
+    
+    vocabulary = common.make_vocabulary(args.mastered)
+    profile_data = common.make_profile("Learner", vocabulary, args.mastered, args.quizzes)
+    
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        save_json_data(profile_data, os.path.join(profiles_dir, "learner.json"))
+        profile_size = os.path.getsize(os.path.join(profiles_dir, "learner.json"))
+        print(f"Profile: {args.mastered} practiced words, {args.quizzes} quizzes, {profile_size:,} bytes")
+        print(f"Session: {args.cards} flashcards + {args.questions}-question quiz\n")
+        print(f"{'mode':<24}{'writes':>8}{'bytes written':>16}{'seconds':>10}")
+        
+        modes = (
+            ("immediate", False, False),
+            ("write-behind", True, False),
+            ("journal", False, True),
+            ("journal + write-behind", True, True),
+        )
+        for label, write_behind, journal in modes:
+            counter, elapsed = run_session(profiles_dir, profile_data, write_behind, journal, args.cards, args.questions)
+            print(f"{label:<24}{counter.writes:>8}{counter.bytes_written:>16,}{elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
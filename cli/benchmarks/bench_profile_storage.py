@@ -0,0 +1,65 @@
+"""
+Spanish Learning Chatbot - Profile Storage Benchmark
+Compares listing, loading and updating profiles in the JSON and SQLite backends
+
+Usage:
+    python benchmarks/bench_profile_storage.py [--profiles N] [--mastered N]
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import common
+from src.profile_storage import JsonFileStorage, SQLiteStorage
+from src.user_profile import UserProfile
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return the mean seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=20000, help="number of stored profiles")
+    parser.add_argument("--mastered", type=int, default=200, help="practiced words per profile")
+    parser.add_argument("--answers", type=int, default=200, help="answers recorded in the update test")
+    args = parser.parse_args()
+    
+    vocabulary = common.make_vocabulary(args.mastered)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        backends = (
+            ("json", JsonFileStorage(os.path.join(directory, "profiles"))),
+            ("sqlite", SQLiteStorage(os.path.join(directory, "profiles.db"))),
+        )
+        
+        print(f"{args.profiles} profiles, {args.mastered} practiced words each\n")
+        print(f"{'backend':<10}{'populate s':>12}{'list ms':>10}{'page ms':>10}{'load ms':>10}{'answer ms':>11}")
+        
+        for label, storage in backends:
+            populate = timed(lambda: [
+                storage.save(f"learner_{i}", common.make_profile(f"Learner {i}", vocabulary, args.mastered, 20, seed=i))
+                for i in range(args.profiles)
+            ])
+            list_time = timed(storage.list_profiles)
+            page_time = timed(lambda: (storage.count_profiles("learner 1"),
+                                       storage.list_profiles("learner 1", 9, 9)), repeat=20)
+            load_time = timed(lambda: storage.load(f"learner_{args.profiles // 2}"), repeat=20)
+            
+            profile = UserProfile(storage=storage, journal=True, compact_every=None)
+            profile.load_profile(f"learner_{args.profiles // 2}")
+            words = [(category, word) for category, words in profile.current_profile["mastered_words"].items()
+                     for word in words]
+            answer_time = timed(lambda: profile.update_word_mastery(*reversed(words[0]), True), repeat=args.answers)
+            
+            print(f"{label:<10}{populate:>12.2f}{list_time * 1000:>10.1f}{page_time * 1000:>10.1f}{load_time * 1000:>10.2f}{answer_time * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
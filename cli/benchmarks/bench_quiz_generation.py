@@ -0,0 +1,44 @@
+"""
+Spanish Learning Chatbot - Quiz Generation Benchmark
+Measures bulk quiz generation throughput in one process and sharded across
+worker processes, and checks that both give the same quizzes for a seed
+
+Usage:
+    python benchmarks/bench_quiz_generation.py [--words N] [--quizzes N] [--processes N]
+"""
+
+import os
+import time
+import argparse
+
+import common
+from src.quiz import QuizSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=500, help="words in the quizzed category")
+    parser.add_argument("--quizzes", type=int, default=100000, help="quizzes to generate")
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes for the sharded run")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words, words_per_category=args.words)
+    quiz_system = QuizSystem(vocabulary)
+    print(f"{args.quizzes:,} quizzes of {args.questions} questions from a {args.words:,}-word category\n")
+    print(f"{'mode':<20}{'seconds':>10}{'quizzes/min':>14}")
+
+    results = {}
+    for label, processes in (("one process", None), (f"{args.processes} processes", args.processes)):
+        start = time.perf_counter()
+        results[label] = quiz_system.generate_quizzes("category_0", args.quizzes, args.questions, seed=42,
+                                                      processes=processes)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20}{elapsed:>10.2f}{args.quizzes / elapsed * 60:>14,.0f}")
+
+    first, second = results.values()
+    print(f"\nsame quizzes for the same seed: {first == second}")
+
+
+if __name__ == "__main__":
+    main()
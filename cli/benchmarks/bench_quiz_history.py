@@ -0,0 +1,67 @@
+"""
+Spanish Learning Chatbot - Quiz History Benchmark
+Compares a profile keeping every quiz record with one keeping the latest
+records plus daily, weekly and per-category rollups: snapshot size, save
+time, and reading per-category averages
+
+Usage:
+    python benchmarks/bench_quiz_history.py [--quizzes N] [--repeat N]
+"""
+
+import time
+import json
+import argparse
+import tempfile
+
+import common
+from src.profile_storage import JsonFileStorage
+
+
+def scanned_category_means(statistics):
+    """The previous way to get per-category averages: scan every quiz"""
+    totals = {}
+    for quiz in statistics["quiz_history"]:
+        count, total = totals.get(quiz["category"], (0, 0.0))
+        totals[quiz["category"]] = (count + 1, total + quiz["percentage"])
+    return {category: round(total / count, 1) for category, (count, total) in totals.items()}
+
+
+def rolled_up_category_means(statistics):
+    """Per-category averages read from the rollups"""
+    return {category: rollup["mean"] for category, rollup in statistics["quiz_rollups"]["categories"].items()}
+
+
+def timed(function, repeat):
+    """Mean milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quizzes", type=int, default=20000, help="quizzes taken by the learner")
+    parser.add_argument("--repeat", type=int, default=20, help="calls timed per operation")
+    args = parser.parse_args()
+
+    rolled_up = common.make_profile("Learner", quizzes=args.quizzes)
+    unbounded = common.make_profile("Learner", quizzes=args.quizzes, rollups=False)
+
+    print(f"{args.quizzes:,} quizzes\n")
+    print(f"{'':<32}{'every quiz':>14}{'rollups':>14}")
+    print(f"{'snapshot size (kB)':<32}{len(json.dumps(unbounded)) / 1e3:>14.1f}"
+          f"{len(json.dumps(rolled_up)) / 1e3:>14.1f}")
+
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        storage = JsonFileStorage(profiles_dir)
+        print(f"{'save (ms)':<32}{timed(lambda: storage.save('unbounded', unbounded), args.repeat):>14.2f}"
+              f"{timed(lambda: storage.save('rolled_up', rolled_up), args.repeat):>14.2f}")
+
+    print(f"{'per-category averages (ms)':<32}"
+          f"{timed(lambda: scanned_category_means(unbounded['statistics']), args.repeat):>14.3f}"
+          f"{timed(lambda: rolled_up_category_means(rolled_up['statistics']), args.repeat):>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Spanish Learning Chatbot - Review Queue Benchmark
+Compares the due-date heap in SpacedRepetitionSystem with a full scan of
+every practiced word
+
+Usage:
+    python benchmarks/bench_review_queue.py [--mastered N] [--reviews N]
+"""
+
+import time
+import random
+import argparse
+import datetime
+import tempfile
+
+import common
+from src.user_profile import UserProfile
+from src.spaced_repetition import SpacedRepetitionSystem
+
+
+def full_scan(srs, profile_data):
+    """The pre-queue due check: recompute every word's next review date"""
+    today = datetime.datetime.now().date()
+    return [
+        (category_name, word_spanish)
+        for category_name, words in profile_data['mastered_words'].items()
+        for word_spanish, word_data in words.items()
+        if srs.get_next_review_date(word_data['mastery_level'], word_data['last_practiced'], True) <= today
+    ]
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return the mean seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mastered", type=int, default=50000, help="practiced words in the profile")
+    parser.add_argument("--reviews", type=int, default=1000, help="reviews recorded between queries")
+    args = parser.parse_args()
+    
+    vocabulary = common.make_vocabulary(args.mastered)
+    
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        profile = UserProfile(profiles_dir=profiles_dir, journal=True, compact_every=None)
+        profile.create_profile("Learner")
+        profile.current_profile['mastered_words'] = common.make_mastered_words(vocabulary, args.mastered)
+        srs = SpacedRepetitionSystem(profile)
+        
+        build_time = timed(srs.get_due_words)
+        
+        rng = random.Random(0)
+        keys = [(category, word) for category, words in profile.current_profile['mastered_words'].items()
+                for word in words]
+        review_time = timed(lambda: profile.update_word_mastery(*reversed(rng.choice(keys)), rng.random() < 0.7),
+                            args.reviews)
+        
+        print(f"{args.mastered:,} practiced words, {len(srs.get_due_words()):,} due\n")
+        print(f"queue build (once per profile): {build_time * 1000:.1f} ms")
+        print(f"review incl. queue update: {review_time * 1000:.4f} ms\n")
+        print(f"{'query':<20}{'full scan ms':>14}{'queue ms':>12}")
+        
+        scan_time = timed(lambda: full_scan(srs, profile.current_profile), 3)
+        print(f"{'next 10 cards':<20}{scan_time * 1000:>14.3f}{timed(lambda: srs.get_due_words(10), 100) * 1000:>12.3f}")
+        print(f"{'all due cards':<20}{scan_time * 1000:>14.3f}{timed(srs.get_due_words, 3) * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Spanish Learning Chatbot - Server Load Test
+Runs many concurrent learners against the asyncio server and reports
+request latency percentiles
+
+By default a server is started on a free port with a temporary profiles
+directory; pass --port to test a server that is already running.
+
+Usage:
+    python benchmarks/bench_server.py [--clients N] [--rounds N] [--port PORT]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+import common
+
+
+class LearnerClient:
+    """A scripted learner talking the server's line protocol"""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, command, **arguments):
+        """Send one command, record its round-trip time and return the result"""
+        arguments['command'] = command
+        start = time.perf_counter()
+        self.writer.write(json.dumps(arguments).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - start)
+
+        if not response['ok']:
+            raise RuntimeError(f"{command} failed: {response['error']}")
+        return response['result']
+
+
+async def run_learner(host, port, name, rounds, latencies, seed):
+    """Log in and alternate quizzes, flashcards and reviews"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    client = LearnerClient(reader, writer, latencies)
+
+    await client.request("login", name=name)
+    categories = await client.request("categories")
+
+    for round_number in range(rounds):
+        category = rng.choice(categories)['name']
+
+        if round_number % 3 == 0:
+            await client.request("quiz", category=category, questions=5)
+            while await client.request("next"):
+                await client.request("answer", option=rng.randrange(4))
+        else:
+            command = "flashcards" if round_number % 3 == 1 else "review"
+            started = await client.request(command, **({"category": category} if command == "flashcards" else {}))
+            if started['session'] is None:
+                continue
+            for _ in range(5):
+                if not await client.request("next"):
+                    break
+                await client.request("answer", correct=rng.random() < 0.7)
+
+        await client.request("finish")
+
+    await client.request("stats")
+    writer.write(b'{"command": "quit"}\n')
+    await writer.drain()
+    writer.close()
+
+
+async def start_server(profiles_dir):
+    """Start server.py on a free port and return (process, port)"""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.join(common.CLI_DIR, "server.py"),
+        "--port", "0", "--profiles-dir", profiles_dir,
+        cwd=os.path.dirname(common.CLI_DIR),
+        stdout=asyncio.subprocess.PIPE
+    )
+    line = (await process.stdout.readline()).decode()
+    if not line.startswith("Serving on"):
+        process.kill()
+        raise RuntimeError("Server failed to start")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def percentile(cut_points, p):
+    """Get the p-th percentile from statistics.quantiles(n=100) cut points"""
+    return cut_points[p - 1]
+
+
+async def run(args, profiles_dir):
+    process = None
+    port = args.port
+    if port is None:
+        process, port = await start_server(profiles_dir)
+
+    try:
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            run_learner(args.host, port, f"Learner {i}", args.rounds, latencies, i)
+            for i in range(args.clients)
+        ])
+        elapsed = time.perf_counter() - start
+    finally:
+        if process:
+            process.terminate()
+            await process.wait()
+
+    cut_points = statistics.quantiles(latencies, n=100)
+    print(f"{args.clients} clients x {args.rounds} rounds: {len(latencies):,} requests in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:,.0f} req/s)\n")
+    print(f"p50 latency: {percentile(cut_points, 50) * 1000:.2f} ms")
+    print(f"p99 latency: {percentile(cut_points, 99) * 1000:.2f} ms")
+    print(f"max latency: {max(latencies) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50, help="concurrent learners")
+    parser.add_argument("--rounds", type=int, default=10, help="activities per learner")
+    parser.add_argument("--host", default="127.0.0.1", help="server host")
+    parser.add_argument("--port", type=int, help="port of a running server (default: start one)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as profiles_dir:
+        asyncio.run(run(args, profiles_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Spanish Learning Chatbot - Startup Budget Check
+Runs the CLI with --profile-startup against large data files, logs in to
+a profile with a long history and fails if the time to the first menu goes
+over a fixed budget
+
+The time runs from starting the process, so it includes interpreter
+start-up and main.py's own imports, less the pauses and prompts the CLI
+reports. The CLI runs twice: the first launch of the day also picks the
+word of the day, which loads the vocabulary; later launches read it from
+the profile.
+
+Usage:
+    python benchmarks/bench_startup.py [--words N] [--countries N] [--mastered N]
+                                       [--budget MS] [--first-budget MS]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+import common
+from src.utils import save_json_data, clear_json_cache
+
+MAIN_SCRIPT = os.path.join(common.CLI_DIR, "main.py")
+
+# Welcome screen, first profile on the login screen, then Exit
+CLI_INPUT = "\n1\n8\n"
+
+PHASE_PATTERN = re.compile(r"^  (.+?)\s+(-?[\d.]+) ms$", re.MULTILINE)
+
+
+def make_data_dir(root, args):
+    """Write large vocabulary, notes, dialogue and profile files under root/data"""
+    data_dir = os.path.join(root, "data")
+    profile_dir = os.path.join(data_dir, "user_profiles")
+    os.makedirs(profile_dir)
+
+    vocabulary = common.make_vocabulary(args.words)
+    cultural_notes, grammar_notes = common.make_notes(args.countries, 20)
+    dialogues = {"dialogues": [{
+        "title": f"Dialogue {i}",
+        "difficulty": common.DIFFICULTIES[i % 3],
+        "exchanges": [{"speaker_a": f"Hola, frase {j}.", "translation_a": f"Hello, sentence {j}.",
+                       "speaker_b": f"Adiós, frase {j}.", "translation_b": f"Goodbye, sentence {j}."}
+                      for j in range(10)]
+    } for i in range(args.countries)]}
+
+    save_json_data(vocabulary, os.path.join(data_dir, "vocabulary.json"))
+    save_json_data(cultural_notes, os.path.join(data_dir, "cultural_notes.json"))
+    save_json_data(grammar_notes, os.path.join(data_dir, "grammar_notes.json"))
+    save_json_data(dialogues, os.path.join(data_dir, "dialogues.json"))
+    save_json_data(common.make_profile("Learner", vocabulary, args.mastered, quizzes=500),
+                   os.path.join(profile_dir, "learner.json"))
+    return sum(os.path.getsize(os.path.join(data_dir, name)) for name in os.listdir(data_dir)
+               if name.endswith(".json"))
+
+
+def run_cli(root):
+    """
+    Run the CLI in root and time it to the first menu
+
+    Returns:
+        dict: The CLI's startup phases in milliseconds, plus 'process to
+            first menu', timed from starting the process with the CLI's
+            pauses left out
+    """
+    env = dict(os.environ, TERM=os.environ.get("TERM", "dumb"), PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN_SCRIPT, "--profile-startup"], cwd=root, env=env,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding="utf-8")
+    process.stdin.write(CLI_INPUT)
+    process.stdin.close()
+
+    # The report ends with the pauses, printed right after the first menu
+    output = []
+    elapsed = None
+    for line in process.stdout:
+        output.append(line)
+        if line.startswith("  paused "):
+            elapsed = time.perf_counter() - start
+            break
+    output.append(process.stdout.read())
+    stderr = process.stderr.read()
+    process.wait(timeout=120)
+
+    report = "".join(output).partition("Startup profile")[2]
+    if elapsed is None or not report:
+        raise RuntimeError(f"No startup profile in the CLI output:\n{''.join(output)}\n{stderr}")
+    phases = {name: float(ms) for name, ms in PHASE_PATTERN.findall(report.partition("\n\n")[0])}
+    phases["process to first menu"] = elapsed * 1000 - phases["paused"]
+    return phases
+
+
+def eager_startup(root):
+    """Time building every subsystem up front, as the chatbot used to"""
+    from src.engine import LearningEngine
+
+    clear_json_cache()
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        start = time.perf_counter()
+        engine = LearningEngine()
+        engine.vocabulary_manager, engine.dialogues, engine.quiz_system
+        engine.spaced_repetition, engine.cultural_notes.cultural_notes, engine.cultural_notes.grammar_notes
+        return (time.perf_counter() - start) * 1000
+    finally:
+        os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=200000, help="vocabulary words")
+    parser.add_argument("--countries", type=int, default=500, help="countries, grammar topics and dialogues")
+    parser.add_argument("--mastered", type=int, default=20000, help="practiced words in the profile")
+    parser.add_argument("--budget", type=float, default=400, help="time to first menu budget in ms")
+    parser.add_argument("--first-budget", type=float, default=1500,
+                        help="time to first menu budget in ms for the first launch of the day")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        size = make_data_dir(root, args)
+        print(f"{args.words:,} words, {args.countries} countries, {args.mastered:,} practiced words, "
+              f"{size / 1e6:.1f} MB of data\n")
+
+        launches = {"first launch of the day": (run_cli(root), args.first_budget),
+                    "later launch": (run_cli(root), args.budget)}
+        names = list(dict.fromkeys(name for phases, _ in launches.values() for name in phases))
+        print(f"{'phase (ms)':<40}" + "".join(f"{label:>26}" for label in launches))
+        for name in names:
+            print(f"{name:<40}" + "".join(f"{phases.get(name, 0.0):>26.1f}" for phases, _ in launches.values()))
+        print(f"\n{'loading every subsystem up front (old)':<40}{eager_startup(root):>26.1f}")
+
+    failed = False
+    print()
+    for label, (phases, budget) in launches.items():
+        total = phases["process to first menu"]
+        if total > budget:
+            failed = True
+            print(f"FAIL: {label}: {total:.1f} ms to the first menu, over the {budget:.0f} ms budget")
+        else:
+            print(f"OK: {label}: {total:.1f} ms to the first menu, within the {budget:.0f} ms budget")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Spanish Learning Chatbot - Vocabulary Loading Benchmark
+Compares load time and peak memory of VocabularyManager on a JSON
+document against the streaming JSON Lines loader, with and without
+category and difficulty filters
+
+Usage:
+    python benchmarks/bench_vocabulary_loading.py [--words N]
+"""
+
+import os
+import gc
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import common
+from src.utils import save_json_data, clear_json_cache
+from src.vocabulary_manager import VocabularyManager
+from src.vocabulary_stream import save_vocabulary_lines
+
+
+def measure(load):
+    """Run load() under tracemalloc and return (seconds, peak MB, retained MB)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    clear_json_cache()
+    return elapsed, peak / 1e6, retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=200000, help="words in the vocabulary")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words)
+    with tempfile.TemporaryDirectory() as data_dir:
+        json_path = os.path.join(data_dir, "vocabulary.json")
+        lines_path = os.path.join(data_dir, "vocabulary.jsonl")
+        save_json_data(vocabulary, json_path, compact=True)
+        save_vocabulary_lines(vocabulary, lines_path)
+        some_categories = [category['name'] for category in vocabulary['categories'][:len(vocabulary['categories']) // 10]]
+        del vocabulary
+
+        print(f"{args.words:,} words: {os.path.getsize(json_path) / 1e6:.1f} MB JSON, "
+              f"{os.path.getsize(lines_path) / 1e6:.1f} MB JSON Lines\n")
+        print(f"{'loader':<34}{'seconds':>10}{'peak MB':>10}{'kept MB':>10}")
+
+        for label, load in (
+            ("JSON document (old)", lambda: VocabularyManager(json_path)),
+            ("JSON Lines, all words", lambda: VocabularyManager(lines_path)),
+            ("JSON Lines, 10% of categories", lambda: VocabularyManager(lines_path, categories=some_categories)),
+            ("JSON Lines, beginner words", lambda: VocabularyManager(lines_path, difficulties=["beginner"])),
+        ):
+            elapsed, peak, retained = measure(load)
+            print(f"{label:<34}{elapsed:>10.2f}{peak:>10.1f}{retained:>10.1f}")
+        print("\nTimes include tracemalloc's overhead on every allocation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Spanish Learning Chatbot - Vocabulary Lookup Benchmark
+Compares the indexed VocabularyManager lookups with the linear scans they replaced
+
+Usage:
+    python benchmarks/bench_vocabulary_lookups.py [--words N] [--mastered N]
+"""
+
+import os
+import time
+import types
+import argparse
+import tempfile
+
+import common
+from src.utils import save_json_data
+from src.vocabulary_manager import VocabularyManager
+
+
+def linear_category_by_name(vocabulary, name):
+    """The pre-index get_category_by_name"""
+    for category in vocabulary['categories']:
+        if category['name'] == name:
+            return category
+    return None
+
+
+def linear_words_by_mastery(vocabulary, profile_data, mastery_level):
+    """The pre-index get_words_by_mastery"""
+    result_words = []
+    for category_name, words in profile_data['mastered_words'].items():
+        category = linear_category_by_name(vocabulary, category_name)
+        if not category:
+            continue
+        for word_spanish, word_data in words.items():
+            if word_data['mastery_level'] == mastery_level:
+                for vocab_word in category['words']:
+                    if vocab_word['spanish'] == word_spanish:
+                        word_with_info = vocab_word.copy()
+                        word_with_info['category_name'] = category['name']
+                        word_with_info['category_display'] = category['display_name']
+                        result_words.append(word_with_info)
+                        break
+    return result_words
+
+
+def timed(function, repeat=1):
+    """Run a function `repeat` times and return the mean seconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100000, help="words in the synthetic vocabulary")
+    parser.add_argument("--mastered", type=int, default=10000, help="practiced words in the profile")
+    args = parser.parse_args()
+    
+    vocabulary = common.make_vocabulary(args.words)
+    profile = types.SimpleNamespace(current_profile=common.make_profile("Learner", vocabulary, args.mastered))
+    
+    with tempfile.TemporaryDirectory() as directory:
+        vocabulary_file = os.path.join(directory, "vocabulary.json")
+        save_json_data(vocabulary, vocabulary_file)
+        
+        build_time = timed(lambda: VocabularyManager(vocabulary_file))
+        manager = VocabularyManager(vocabulary_file)
+    
+    last_category = vocabulary['categories'][-1]['name']
+    
+    print(f"{args.words:,} words in {len(vocabulary['categories'])} categories, {args.mastered:,} practiced\n")
+    print(f"load + index build: {build_time * 1000:.1f} ms\n")
+    print(f"{'operation':<28}{'linear ms':>12}{'indexed ms':>12}")
+    
+    rows = (
+        ("get_category_by_name",
+         timed(lambda: linear_category_by_name(vocabulary, last_category), 1000),
+         timed(lambda: manager.get_category_by_name(last_category), 1000)),
+        ("get_words_by_mastery",
+         timed(lambda: linear_words_by_mastery(vocabulary, profile.current_profile, 3)),
+         timed(lambda: manager.get_words_by_mastery(profile, 3))),
+    )
+    
+    for label, linear, indexed in rows:
+        print(f"{label:<28}{linear * 1000:>12.4f}{indexed * 1000:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Spanish Learning Chatbot - Vocabulary Search Benchmark
+Measures prefix and fuzzy query latency of VocabularySearch on a large
+lexicon of made-up words
+
+Usage:
+    python benchmarks/bench_vocabulary_search.py [--words N] [--queries N]
+"""
+
+import time
+import random
+import argparse
+import statistics
+
+import common
+from src.vocabulary_search import VocabularySearch
+
+# Spanish-like syllables: onset + vowel + optional coda
+ONSETS = ["", "b", "c", "d", "f", "g", "j", "l", "m", "n", "ñ", "p", "r", "s", "t", "v", "z",
+          "ll", "ch", "br", "cr", "tr", "pl", "gr"]
+SYLLABLES = [onset + vowel + coda for onset in ONSETS for vowel in "aeiou" for coda in ["", "n", "s", "r", "l"]]
+
+
+def make_word(rng, accents=True):
+    """Build a made-up word of 2-4 syllables, sometimes with an accent"""
+    word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    if accents and rng.random() < 0.2:
+        i = rng.randrange(len(word))
+        word = word[:i] + {"a": "á", "e": "é", "i": "í", "o": "ó", "u": "ú"}.get(word[i], word[i]) + word[i + 1:]
+    return word
+
+
+def make_typo(rng, word):
+    """Apply one random edit to a word"""
+    i = rng.randrange(len(word))
+    edit = rng.randrange(3)
+    if edit == 0:
+        return word[:i] + word[i + 1:]
+    if edit == 1:
+        return word[:i] + rng.choice("abcdefghilmnoprstu") + word[i + 1:]
+    return word[:i] + rng.choice("abcdefghilmnoprstu") + word[i:]
+
+
+def latencies(function, queries):
+    """Time one call per query and return the latencies in milliseconds"""
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        results.append((time.perf_counter() - start) * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=200000, help="entries in the lexicon")
+    parser.add_argument("--queries", type=int, default=2000, help="queries per kind")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = [{"spanish": make_word(rng), "english": make_word(rng, accents=False)} for _ in range(args.words)]
+
+    start = time.perf_counter()
+    index = VocabularySearch()
+    for word in words:
+        index.add_word(word, "category_0", "Category 0")
+    index.prefix_search("a")  # Sort the prefix arrays
+    print(f"{args.words:,} entries, index built in {time.perf_counter() - start:.1f} s\n")
+
+    samples = [rng.choice(words)['spanish'] for _ in range(args.queries)]
+    kinds = (
+        ("prefix, 2 letters", index.prefix_search, [s[:2] for s in samples]),
+        ("prefix, 4 letters", index.prefix_search, [s[:4] for s in samples]),
+        ("prefix, no accents", index.prefix_search, [s.replace("á", "a").replace("é", "e") for s in samples]),
+        ("fuzzy, 1 typo", lambda q: index.fuzzy_search(q, 1), [make_typo(rng, s) for s in samples]),
+        ("fuzzy, 2 typos", index.fuzzy_search, [make_typo(rng, make_typo(rng, s)) for s in samples]),
+        ("search (prefix + fuzzy)", index.search, [make_typo(rng, s) for s in samples]),
+    )
+
+    print(f"{'query':<26}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, function, queries in kinds:
+        cut_points = statistics.quantiles(latencies(function, queries), n=100)
+        print(f"{label:<26}{cut_points[49]:>10.3f}{cut_points[98]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Spanish Learning Chatbot - Word of the Day Benchmark
+Compares a word-of-the-day pick that checks candidates against the history
+list with the selector's pools of unfeatured words, including once nearly
+every word was featured, and the history size of full copied words with
+the compact entries
+
+Usage:
+    python benchmarks/bench_word_of_day.py [--words N] [--days N] [--picks N]
+"""
+
+import os
+import json
+import random
+import time
+import argparse
+import datetime
+import tempfile
+
+import common
+from src.utils import save_json_data
+from src.vocabulary_manager import VocabularyManager
+from src.word_of_day import WordOfDaySelector
+from src.word_view import WordView
+from src.profile_storage import word_of_day_history_entry
+
+
+class LoadedProfile:
+    """Just enough of a UserProfile for picking words"""
+
+    def __init__(self, profile_data):
+        self.current_profile = profile_data
+        self.profile_name = "learner"
+
+
+def naive_pick(manager, history):
+    """Draw random words until one isn't in the history list"""
+    while True:
+        category, word = manager.random_word()
+        if not any(entry['category_name'] == category['name'] and entry['spanish'] == word['spanish']
+                   for entry in history):
+            return category, word
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=200000, help="words in the vocabulary")
+    parser.add_argument("--days", type=int, default=3650, help="days of word-of-the-day history")
+    parser.add_argument("--picks", type=int, default=200, help="picks timed per method")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words)
+    profile = common.make_profile("Learner", vocabulary, mastered=args.words // 4)
+    with tempfile.TemporaryDirectory() as data_dir:
+        vocabulary_file = os.path.join(data_dir, "vocabulary.json")
+        save_json_data(vocabulary, vocabulary_file)
+        manager = VocabularyManager(vocabulary_file)
+
+    # Years of daily words, stored both ways
+    start = datetime.date.today() - datetime.timedelta(days=args.days)
+    full_history = []
+    for day, position in enumerate(random.sample(range(len(manager._word_index)), args.days)):
+        category, word = manager._word_index.get(position)
+        entry = WordView(word, category).copy()
+        entry['date'] = (start + datetime.timedelta(days=day)).isoformat()
+        entry['word_id'] = position
+        full_history.append(entry)
+    compact_history = [word_of_day_history_entry(entry) for entry in full_history]
+    profile['word_of_day_history'] = compact_history
+
+    print(f"{args.words:,} words, {args.days:,} days of history\n")
+    print(f"{'history as full words':<44}{len(json.dumps(full_history)) / 1e3:>10.1f} kB")
+    print(f"{'history as compact entries':<44}{len(json.dumps(compact_history)) / 1e3:>10.1f} kB\n")
+    print(f"{'pick':<44}{'µs/pick':>10}")
+
+    begin = time.perf_counter()
+    for _ in range(args.picks):
+        naive_pick(manager, full_history)
+    print(f"{'scan the history list':<44}{(time.perf_counter() - begin) / args.picks * 1e6:>10.1f}")
+
+    selector = WordOfDaySelector(manager)
+    user_profile = LoadedProfile(profile)
+    begin = time.perf_counter()
+    selector.pick(user_profile)
+    print(f"{'selector, first pick of a session':<44}{(time.perf_counter() - begin) * 1e6:>10.1f}")
+
+    begin = time.perf_counter()
+    for _ in range(args.picks):
+        selector.pick(user_profile)
+    print(f"{'selector, later picks':<44}{(time.perf_counter() - begin) / args.picks * 1e6:>10.1f}")
+
+    # The same learner logging in again: the state carries over
+    user_profile.current_profile = dict(profile, word_of_day_history=list(profile['word_of_day_history']))
+    begin = time.perf_counter()
+    selector.pick(user_profile)
+    print(f"{'selector, first pick after a new login':<44}{(time.perf_counter() - begin) * 1e6:>10.1f}")
+
+    # Nearly every word featured: picks must not scan for the few left
+    state = selector._state(user_profile)
+    while len(state.unmastered) + len(state.mastered) > args.picks + 1:
+        pool = state.unmastered if state.unmastered else state.mastered
+        pool.remove(pool.draw(selector.random))
+    begin = time.perf_counter()
+    for _ in range(args.picks):
+        selector.pick(user_profile)
+    print(f"{'selector, last picks before a new round':<44}{(time.perf_counter() - begin) / args.picks * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Spanish Learning Chatbot - Word Sampling Benchmark
+Compares picking random words by going through every category with the
+flat word index in VocabularyManager
+
+Usage:
+    python benchmarks/bench_word_sampling.py [--words N] [--mastered N] [--picks N]
+"""
+
+import os
+import time
+import random
+import argparse
+import tempfile
+
+import common
+from src.utils import save_json_data
+from src.vocabulary_manager import VocabularyManager
+from src.spaced_repetition import SpacedRepetitionSystem, NEW_WORD_FIELDS
+from src.word_view import WordView
+
+
+class LoadedProfile:
+    """Just enough of a UserProfile for the review queue"""
+
+    def __init__(self, profile_data):
+        self.current_profile = profile_data
+
+    def add_listener(self, callback):
+        pass
+
+
+def copied_word_of_day(manager):
+    """The original pick: copy every word into one list, then choose"""
+    all_words = []
+    for category in manager.get_categories():
+        for word in category['words']:
+            word_copy = word.copy()
+            word_copy['category_name'] = category['name']
+            word_copy['category_display'] = category['display_name']
+            all_words.append(word_copy)
+    return random.choice(all_words)
+
+
+def walked_word_of_day(manager):
+    """The previous pick: count the words, then walk the categories to one"""
+    index = random.randrange(sum(len(category['words']) for category in manager.get_categories()))
+    for category in manager.get_categories():
+        if index < len(category['words']):
+            return WordView(category['words'][index], category).copy()
+        index -= len(category['words'])
+
+
+def scanned_new_words(manager, mastered_words, count=10):
+    """The previous fill-up: list every unpracticed word, then sample"""
+    new_words = [WordView(word, category, NEW_WORD_FIELDS) for category in manager.get_categories()
+                 for word in category['words'] if word['spanish'] not in mastered_words.get(category['name'], {})]
+    return random.sample(new_words, min(count, len(new_words)))
+
+
+def beginner_weight(category, word):
+    """Make beginner words three times as likely"""
+    return 3.0 if word['difficulty'] == "beginner" else 1.0
+
+
+def timed(function, repeat):
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=200000, help="words in the vocabulary")
+    parser.add_argument("--mastered", type=int, default=50000, help="practiced words in the profile")
+    parser.add_argument("--picks", type=int, default=200, help="picks timed per method")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words)
+    profile = common.make_profile("Learner", vocabulary, args.mastered)
+    with tempfile.TemporaryDirectory() as data_dir:
+        vocabulary_file = os.path.join(data_dir, "vocabulary.json")
+        save_json_data(vocabulary, vocabulary_file)
+        manager = VocabularyManager(vocabulary_file)
+
+    srs = SpacedRepetitionSystem(LoadedProfile(profile))
+    # Build the alias table up front; it is kept for later weighted picks
+    manager.random_word(weight=beginner_weight)
+    fast_picks = args.picks * 50
+
+    print(f"{args.words:,} words, {args.mastered:,} practiced\n")
+    print(f"{'operation':<44}{'µs/call':>12}")
+    rows = (
+        ("word of day, copy every word (original)", lambda: copied_word_of_day(manager), max(args.picks // 20, 1)),
+        ("word of day, walk categories (previous)", lambda: walked_word_of_day(manager), args.picks),
+        ("word of day, flat index", lambda: manager.get_word_of_day(), fast_picks),
+        ("weighted pick, alias table", lambda: manager.random_word(weight=beginner_weight), fast_picks),
+        ("10 random words, list all (previous)", lambda: random.sample(
+            [WordView(word, category) for category in manager.get_categories() for word in category['words']], 10),
+         max(args.picks // 20, 1)),
+        ("10 random words, partial Fisher-Yates", lambda: manager.sample_words(10), fast_picks),
+        ("10 new words, scan all (previous)", lambda: scanned_new_words(manager, profile['mastered_words']),
+         max(args.picks // 20, 1)),
+        ("10 new words, lazy shuffle", lambda: srs._sample_new_words(manager, 10), fast_picks),
+    )
+    for label, function, repeat in rows:
+        print(f"{label:<44}{timed(function, repeat):>12,.1f}")
+
+
+if __name__ == "__main__":
+    main()
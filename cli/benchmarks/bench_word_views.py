@@ -0,0 +1,99 @@
+"""
+Spanish Learning Chatbot - Word View Benchmark
+Compares memory and time of word lists built from copied dicts with the
+WordViews now returned by the vocabulary and review hot paths
+
+Usage:
+    python benchmarks/bench_word_views.py [--words N]
+"""
+
+import gc
+import time
+import types
+import random
+import argparse
+import tracemalloc
+
+import common
+from src.word_view import WordView
+from src.vocabulary_manager import VocabularyManager
+from src.spaced_repetition import SpacedRepetitionSystem
+
+
+def copied_words(vocabulary):
+    """The pre-view list of every word with its category info"""
+    all_words = []
+    for category in vocabulary['categories']:
+        for word in category['words']:
+            word_with_category = word.copy()
+            word_with_category['category_name'] = category['name']
+            word_with_category['category_display'] = category['display_name']
+            all_words.append(word_with_category)
+    return all_words
+
+
+def copied_words_by_mastery(manager, profile_data, mastery_level):
+    """The pre-view get_words_by_mastery"""
+    result_words = []
+    for category_name, words in profile_data['mastered_words'].items():
+        category = manager.get_category_by_name(category_name)
+        for word_spanish, word_data in words.items():
+            if word_data['mastery_level'] == mastery_level:
+                word_with_info = manager.get_word(category_name, word_spanish).copy()
+                word_with_info['category_name'] = category['name']
+                word_with_info['category_display'] = category['display_name']
+                result_words.append(word_with_info)
+    return result_words
+
+
+def measure(build):
+    """Return (ms, MB held by the result) of one build() call"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed * 1000, retained / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100000, help="words in the synthetic vocabulary")
+    args = parser.parse_args()
+
+    vocabulary = common.make_vocabulary(args.words)
+    manager = VocabularyManager.__new__(VocabularyManager)
+    manager.vocabulary = vocabulary
+    manager.vocabulary_file = None
+    manager.partial = False
+    manager._build_indexes()
+
+    profile_data = common.make_profile("Learner", vocabulary, args.words)
+    for words in profile_data['mastered_words'].values():
+        for word_data in words.values():
+            word_data['mastery_level'] = 0
+    profile = types.SimpleNamespace(current_profile=profile_data)
+    no_profile = SpacedRepetitionSystem(None)
+
+    print(f"{args.words:,} words; times include tracemalloc's overhead\n")
+    print(f"{'word list':<34}{'ms':>10}{'MB':>10}")
+
+    rows = (
+        ("all words, copies (old)", lambda: copied_words(vocabulary)),
+        ("all words, views", lambda: [WordView(w, c) for c in vocabulary['categories'] for w in c['words']]),
+        ("words by mastery, copies (old)", lambda: copied_words_by_mastery(manager, profile_data, 0)),
+        ("words by mastery, views", lambda: manager.get_words_by_mastery(profile, 0)),
+        ("word of day, copy all (old)", lambda: random.choice(copied_words(vocabulary))),
+        ("word of day, by position", lambda: manager.get_word_of_day()),
+        ("review without profile", lambda: no_profile.get_words_due_for_review(manager)),
+    )
+    for label, build in rows:
+        elapsed, retained = measure(build)
+        print(f"{label:<34}{elapsed:>10.1f}{retained:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
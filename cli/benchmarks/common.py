@@ -0,0 +1,188 @@
+"""
+Spanish Learning Chatbot - Benchmark Helpers
+Shared setup and synthetic data generators for the benchmark scripts
+"""
+
+import os
+import sys
+import random
+import datetime
+
+# Make the `src` package importable when a benchmark is run as a script
+CLI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CLI_DIR not in sys.path:
+    sys.path.insert(0, CLI_DIR)
+
+from src.profile_storage import rollup_quiz_history
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+
+
+def make_vocabulary(num_words, words_per_category=500, seed=0):
+    """
+    Build a synthetic vocabulary document shaped like data/vocabulary.json
+    
+    Args:
+        num_words (int): Total number of words
+        words_per_category (int, optional): Words in each category
+        seed (int, optional): Random seed
+        
+    Returns:
+        dict: Vocabulary data with a 'categories' list
+    """
+    rng = random.Random(seed)
+    categories = []
+    
+    for i in range(num_words):
+        if i % words_per_category == 0:
+            category_index = len(categories)
+            categories.append({
+                "name": f"category_{category_index}",
+                "display_name": f"Category {category_index}",
+                "words": []
+            })
+        
+        categories[-1]["words"].append({
+            "spanish": f"palabra{i}",
+            "english": f"word{i}",
+            "example": f"Esta es la palabra{i}.",
+            "example_translation": f"This is word{i}.",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "pronunciation_tip": f"pah-LAH-brah {i}"
+        })
+    
+    return {"categories": categories}
+
+
+def make_mastered_words(vocabulary, num_words, seed=0, days_back=60):
+    """
+    Build a synthetic 'mastered_words' section for a profile
+    
+    Args:
+        vocabulary (dict): Vocabulary data from make_vocabulary()
+        num_words (int): Number of practiced words to generate
+        seed (int, optional): Random seed
+        days_back (int, optional): Spread of last_practiced dates
+        
+    Returns:
+        dict: Mapping of category name -> spanish word -> word data
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now()
+    mastered = {}
+    count = 0
+    
+    for category in vocabulary["categories"]:
+        for word in category["words"]:
+            if count >= num_words:
+                return mastered
+            
+            practiced = now - datetime.timedelta(days=rng.randint(0, days_back))
+            mastered.setdefault(category["name"], {})[word["spanish"]] = {
+                "correct_count": rng.randint(0, 10),
+                "incorrect_count": rng.randint(0, 5),
+                "last_practiced": practiced.isoformat(),
+                "mastery_level": rng.randint(0, 5)
+            }
+            count += 1
+    
+    return mastered
+
+
+def make_profile(name, vocabulary=None, mastered=0, quizzes=0, seed=0, rollups=True):
+    """
+    Build a synthetic profile document shaped like data/user_profiles/*.json
+    
+    Args:
+        name (str): Profile display name
+        vocabulary (dict, optional): Vocabulary to draw practiced words from
+        mastered (int, optional): Number of practiced words
+        quizzes (int, optional): Number of quiz history entries
+        seed (int, optional): Random seed
+        rollups (bool, optional): Summarize all but the latest quizzes into
+            rollups, as for current profiles (False keeps every quiz)
+        
+    Returns:
+        dict: Profile data
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now()
+    
+    quiz_history = []
+    for i in range(quizzes):
+        score = rng.randint(0, 10)
+        quiz_history.append({
+            "date": (now - datetime.timedelta(hours=i)).isoformat(),
+            "category": f"category_{rng.randint(0, 9)}",
+            "score": score,
+            "max_score": 10,
+            "percentage": round(score / 10 * 100, 1)
+        })
+    
+    statistics = {
+        "quizzes_taken": quizzes,
+        "flashcards_practiced": 0,
+        "conversations_practiced": 0,
+        "total_score": sum(q["score"] for q in quiz_history),
+        "quiz_history": quiz_history[::-1]
+    }
+    if rollups:
+        rollup_quiz_history(statistics)
+    
+    return {
+        "name": name,
+        "created_at": now.isoformat(),
+        "last_login": now.isoformat(),
+        "statistics": statistics,
+        "mastered_words": make_mastered_words(vocabulary, mastered, seed) if vocabulary else {},
+        "custom_vocabulary": [],
+        "last_word_of_day": None,
+        "word_of_day": None,
+        "word_of_day_history": []
+    }
+
+
+def make_text(rng, lexicon, weights, num_words):
+    """Build a sentence of lexicon words drawn with Zipf-like frequencies"""
+    return " ".join(rng.choices(lexicon, weights, k=num_words)).capitalize() + "."
+
+
+def make_notes(num_countries, notes_per_country, seed=0, lexicon_size=5000):
+    """
+    Build synthetic cultural and grammar notes documents
+    
+    Texts are made-up words drawn with Zipf-like frequencies, so a few
+    words are everywhere and most are rare, as in real text.
+    
+    Args:
+        num_countries (int): Number of countries and of grammar topics
+        notes_per_country (int): Notes per country, and examples and tips
+            per topic
+        seed (int, optional): Random seed
+        lexicon_size (int, optional): Number of distinct words
+        
+    Returns:
+        tuple: (cultural notes, grammar notes) shaped like data/*_notes.json
+    """
+    rng = random.Random(seed)
+    lexicon = [f"w{rng.randrange(16 ** 6):06x}" for _ in range(lexicon_size)]
+    weights = [1 / rank for rank in range(1, lexicon_size + 1)]
+    
+    countries = [{
+        "name": f"Country {i}",
+        "capital": f"Capital {i}",
+        "language": "Spanish",
+        "dialects": ["Dialect A", "Dialect B"],
+        "population": f"{i} million",
+        "notes": [{"title": make_text(rng, lexicon, weights, 3), "content": make_text(rng, lexicon, weights, 60)}
+                  for _ in range(notes_per_country)]
+    } for i in range(num_countries)]
+    topics = [{
+        "name": f"Topic {i}",
+        "difficulty": DIFFICULTIES[i % 3],
+        "explanation": make_text(rng, lexicon, weights, 120),
+        "examples": [{"spanish": make_text(rng, lexicon, weights, 6), "english": make_text(rng, lexicon, weights, 6)}
+                     for _ in range(notes_per_country)],
+        "tips": [make_text(rng, lexicon, weights, 15) for _ in range(notes_per_country)]
+    } for i in range(num_countries)]
+    return {"countries": countries}, {"topics": topics}
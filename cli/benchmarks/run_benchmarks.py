@@ -0,0 +1,333 @@
+"""
+Spanish Learning Chatbot - Benchmark Suite
+Times every hot path on synthetic data with timeit, writes the results as
+JSON and compares them with an earlier run
+
+Sizes grow with --scale, so the same suite covers small and large
+vocabularies, profile directories and learner histories. Each benchmark is
+run in batches long enough to time reliably (timeit's autorange) and the
+median time per call over --repeat batches is reported.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scale N] [--repeat N] [--filter TEXT]
+                                        [--output FILE] [--compare FILE] [--threshold FRACTION]
+
+    # Record a baseline, then check a later commit against it
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --compare baseline.json --threshold 0.2
+"""
+
+import io
+import os
+import sys
+import json
+import random
+import timeit
+import argparse
+import platform
+import tempfile
+import datetime
+import statistics
+import contextlib
+import subprocess
+from unittest import mock
+
+import common
+from src.utils import load_json_data, save_json_data, clear_json_cache
+from src.vocabulary_manager import VocabularyManager
+from src.user_profile import UserProfile
+from src.spaced_repetition import SpacedRepetitionSystem
+from src.quiz import QuizSystem
+
+# Data sizes at --scale 1
+BASE_WORDS = 20000
+BASE_PROFILES = 2000
+BASE_MASTERED = 5000
+BASE_QUIZZES = 1000
+
+# Registered benchmarks: (name, setup function)
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """
+    Register a benchmark
+
+    The decorated function gets the shared SuiteData and returns the
+    callable to time.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+class SuiteData:
+    """Synthetic data files and loaded objects shared by the benchmarks"""
+
+    def __init__(self, root, scale, seed=0):
+        """
+        Write the data files for one run
+
+        Args:
+            root (str): Directory to write them in
+            scale (float): Size multiplier
+            seed (int, optional): Random seed
+        """
+        self.root = root
+        self.rng = random.Random(seed)
+        self.words = int(BASE_WORDS * scale)
+        self.profiles = int(BASE_PROFILES * scale)
+        self.mastered = int(BASE_MASTERED * scale)
+        self.quizzes = int(BASE_QUIZZES * scale)
+
+        self.vocabulary = common.make_vocabulary(self.words, seed=seed)
+        self.vocabulary_file = os.path.join(root, "vocabulary.json")
+        save_json_data(self.vocabulary, self.vocabulary_file)
+        self.vocabulary_manager = VocabularyManager(self.vocabulary_file)
+
+        # Many small profiles to page through, plus one learner with a long history
+        self.profiles_dir = os.path.join(root, "user_profiles")
+        os.makedirs(self.profiles_dir)
+        for i in range(self.profiles):
+            save_json_data(common.make_profile(f"Learner {i:06d}"),
+                           os.path.join(self.profiles_dir, f"learner_{i:06d}.json"))
+        save_json_data(common.make_profile("Heavy", self.vocabulary, self.mastered, self.quizzes, seed),
+                       os.path.join(self.profiles_dir, "heavy.json"))
+
+        self.user_profile = UserProfile(self.profiles_dir)
+        self.user_profile.load_profile("heavy")
+
+        self.words_by_category = [(category['name'], word['spanish'])
+                                  for category in self.vocabulary['categories'] for word in category['words']]
+
+    def sample_words(self, count):
+        """Pick (category name, spanish) pairs to look up"""
+        return self.rng.sample(self.words_by_category, min(count, len(self.words_by_category)))
+
+
+@benchmark("utils.load_json_data")
+def bench_load_json(data):
+    return lambda: load_json_data(data.vocabulary_file)
+
+
+@benchmark("utils.save_json_data")
+def bench_save_json(data):
+    target = os.path.join(data.root, "saved_vocabulary.json")
+    return lambda: save_json_data(data.vocabulary, target)
+
+
+@benchmark("vocabulary.load")
+def bench_vocabulary_load(data):
+    def run():
+        # Parse and index the file, not just hit the JSON cache
+        clear_json_cache()
+        VocabularyManager(data.vocabulary_file)
+    return run
+
+
+@benchmark("vocabulary.get_word x1000")
+def bench_get_word(data):
+    lookups = data.sample_words(1000)
+    manager = data.vocabulary_manager
+
+    def run():
+        for category_name, spanish in lookups:
+            manager.get_word(category_name, spanish)
+    return run
+
+
+@benchmark("vocabulary.get_category_by_name x1000")
+def bench_get_category(data):
+    names = [category_name for category_name, _ in data.sample_words(1000)]
+    manager = data.vocabulary_manager
+
+    def run():
+        for name in names:
+            manager.get_category_by_name(name)
+    return run
+
+
+@benchmark("vocabulary.search_words")
+def bench_search_words(data):
+    queries = [spanish[:6] for _, spanish in data.sample_words(50)]
+    manager = data.vocabulary_manager
+    manager.get_search_index()
+
+    def run():
+        for query in queries:
+            manager.search_words(query)
+    return run
+
+
+@benchmark("vocabulary.get_word_of_day")
+def bench_word_of_day(data):
+    # Without a profile a new word is picked on every call
+    return lambda: data.vocabulary_manager.get_word_of_day()
+
+
+@benchmark("vocabulary.get_words_by_mastery")
+def bench_words_by_mastery(data):
+    return lambda: data.vocabulary_manager.get_words_by_mastery(data.user_profile, 3)
+
+
+@benchmark("srs.get_words_due_for_review")
+def bench_due_words(data):
+    srs = SpacedRepetitionSystem(data.user_profile)
+    return lambda: srs.get_words_due_for_review(data.vocabulary_manager, limit=20)
+
+
+@benchmark("quiz._run_quiz (10 questions)")
+def bench_run_quiz(data):
+    quiz_system = QuizSystem(data.vocabulary)
+    category = data.vocabulary['categories'][0]
+    category_words = quiz_system.filter_words(category)
+
+    def run():
+        # Always answer 1, skip the screen clearing and drop the output
+        with mock.patch("builtins.input", return_value="1"), \
+                mock.patch("src.quiz.clear_screen"), \
+                contextlib.redirect_stdout(io.StringIO()):
+            quiz_system._run_quiz(category, category_words, 10, 1)
+    return run
+
+
+@benchmark("user_profile.get_available_profiles (page)")
+def bench_available_profiles(data):
+    user_profile = UserProfile(data.profiles_dir)
+    offset = data.profiles // 2
+    return lambda: user_profile.get_available_profiles(None, offset, 9)
+
+
+@benchmark("user_profile.get_available_profiles (prefix)")
+def bench_available_profiles_prefix(data):
+    user_profile = UserProfile(data.profiles_dir)
+    return lambda: user_profile.get_available_profiles("learner 00001", 0, 9)
+
+
+@benchmark("user_profile.load_profile")
+def bench_load_profile(data):
+    # Journaled like the CLI's, so the login event is appended, not a full save
+    user_profile = UserProfile(data.profiles_dir, journal=True)
+    return lambda: user_profile.load_profile("heavy")
+
+
+@benchmark("user_profile.save_current_profile")
+def bench_save_profile(data):
+    user_profile = UserProfile(data.profiles_dir)
+    user_profile.load_profile("heavy")
+    return user_profile.save_current_profile
+
+
+def measure(function, repeat):
+    """
+    Time a function with timeit
+
+    Returns:
+        dict: Median and minimum seconds per call, calls per batch and batches
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    return {"median": statistics.median(times), "min": min(times), "number": number, "repeat": repeat}
+
+
+def git_commit():
+    """Get the checked out commit, or None outside a git checkout"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=common.CLI_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare median times with a baseline run
+
+    Args:
+        results (dict): Benchmark name -> measurement of this run
+        baseline (dict): The same for the baseline run
+        threshold (float): Allowed slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list: Names of the benchmarks that got slower than allowed
+    """
+    regressions = []
+    print(f"\n{'benchmark':<46}{'baseline':>12}{'now':>12}{'change':>10}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["median"], result["median"]
+        change = now / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<46}{format_time(before):>12}{format_time(now):>12}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def format_time(seconds):
+    """Format seconds per call with a readable unit"""
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"size multiplier (1 = {BASE_WORDS:,} words, {BASE_PROFILES:,} profiles, "
+                             f"{BASE_MASTERED:,} practiced words, {BASE_QUIZZES:,} quizzes)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches per benchmark")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown that counts as a regression, as a fraction (default 0.2)")
+    args = parser.parse_args()
+
+    selected = [(name, setup) for name, setup in BENCHMARKS if not args.filter or args.filter in name]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        data = SuiteData(root, args.scale)
+        print(f"{data.words:,} words, {data.profiles:,} profiles, {data.mastered:,} practiced words, "
+              f"{data.quizzes:,} quizzes\n")
+        print(f"{'benchmark':<46}{'median':>12}{'min':>12}")
+        for name, setup in selected:
+            result = measure(setup(data), args.repeat)
+            results[name] = result
+            print(f"{name:<46}{format_time(result['median']):>12}{format_time(result['min']):>12}")
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get("scale") != args.scale:
+            print(f"\nWarning: the baseline was run with --scale {baseline.get('scale')}")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline")
+            sys.exit(1)
+        print(f"\nNo benchmark more than {args.threshold:.0%} slower than the baseline")
+
+
+if __name__ == "__main__":
+    main()
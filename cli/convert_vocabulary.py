@@ -0,0 +1,38 @@
+"""
+Spanish Learning Chatbot - Vocabulary Conversion
+Run this file to convert a vocabulary between the JSON document format and
+the streaming JSON Lines format (chosen by the '.jsonl' suffix)
+
+Usage:
+    python convert_vocabulary.py SOURCE DESTINATION
+"""
+
+import sys
+import argparse
+from src.utils import load_json_data, save_json_data
+from src.vocabulary_stream import is_vocabulary_lines, load_vocabulary_lines, save_vocabulary_lines
+
+def main():
+    """Convert a vocabulary file to the other format"""
+    parser = argparse.ArgumentParser(description="Convert vocabulary between JSON and JSON Lines")
+    parser.add_argument("source", help="vocabulary file to read")
+    parser.add_argument("destination", help="file to write; '.jsonl' writes JSON Lines")
+    args = parser.parse_args()
+    
+    if is_vocabulary_lines(args.source):
+        vocabulary = load_vocabulary_lines(args.source)
+    else:
+        vocabulary = load_json_data(args.source)
+    
+    if is_vocabulary_lines(args.destination):
+        saved = save_vocabulary_lines(vocabulary, args.destination)
+    else:
+        saved = save_json_data(vocabulary, args.destination)
+    if not saved:
+        sys.exit(1)
+    
+    words = sum(len(category['words']) for category in vocabulary['categories'])
+    print(f"Converted {len(vocabulary['categories'])} categories and {words:,} words to {args.destination}")
+
+if __name__ == "__main__":
+    main()
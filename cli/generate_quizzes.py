@@ -0,0 +1,50 @@
+"""
+Spanish Learning Chatbot - Quiz Generation
+Run this file to pre-generate reproducible quiz sets, e.g. for a whole class
+
+Usage:
+    python generate_quizzes.py CATEGORY --count N --output FILE [--seed N] [--processes N]
+"""
+
+import sys
+import time
+import argparse
+from src.quiz import QuizSystem
+from src.utils import load_json_cached, save_json_data
+
+def main():
+    """Generate quizzes for one category and save them as JSON"""
+    parser = argparse.ArgumentParser(description="Pre-generate reproducible vocabulary quizzes")
+    parser.add_argument("category", help="category name, e.g. greetings")
+    parser.add_argument("--count", type=int, required=True, help="number of quizzes")
+    parser.add_argument("--output", required=True, help="JSON file to write")
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz")
+    parser.add_argument("--direction", type=int, choices=[1, 2], default=1,
+                        help="1 for Spanish->English, 2 for English->Spanish")
+    parser.add_argument("--difficulty", choices=["beginner", "intermediate", "advanced"],
+                        help="only quiz words of this difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="seed; the same seed gives the same quizzes")
+    parser.add_argument("--processes", type=int, help="worker processes to generate with")
+    parser.add_argument("--vocabulary", default="data/vocabulary.json", help="vocabulary file")
+    args = parser.parse_args()
+    
+    quiz_system = QuizSystem(load_json_cached(args.vocabulary))
+    
+    start = time.perf_counter()
+    try:
+        quizzes = quiz_system.generate_quizzes(
+            args.category, args.count, args.questions, args.direction, args.difficulty, args.seed, args.processes
+        )
+    except KeyError as e:
+        print(f"Error: {e.args[0]}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    
+    settings = {key: getattr(args, key) for key in ("category", "questions", "direction", "difficulty", "seed")}
+    if not save_json_data({"settings": settings, "quizzes": quizzes}, args.output, compact=True):
+        sys.exit(1)
+    
+    print(f"Generated {len(quizzes):,} quizzes in {elapsed:.2f}s and saved them to {args.output}")
+
+if __name__ == "__main__":
+    main()
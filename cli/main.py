@@ -6,9 +6,88 @@ Run this file to start the chatbot application
 import os
 import sys
 import time
-from src.chatbot import SpanishChatbot
-from src.user_profile import UserProfile
-from src.utils import clear_screen
+import atexit
+import datetime
+import argparse
+from contextlib import contextmanager
+
+# The chatbot's modules are imported where they are first needed, so the
+# welcome screen shows before any of them load
+
+# Number of profiles shown per page on the login screen
+PROFILES_PER_PAGE = 9
+
+# When main.py started running, after interpreter start-up
+MAIN_STARTED = time.perf_counter()
+
+class StartupProfiler:
+    """
+    Collects how long each phase before the first menu takes
+
+    Pauses and prompts before the first menu go through sleep() and input(),
+    so the time spent in them can be left out of the total.
+    """
+
+    def __init__(self):
+        """Initialize a disabled profiler"""
+        self.enabled = False
+        self.phases = {}
+        self.waiting = 0.0
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block, adding to the phase's total if it runs more than once
+        
+        Args:
+            name (str): Phase name
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def sleep(self, seconds):
+        """time.sleep(), not counted towards startup time"""
+        start = time.perf_counter()
+        time.sleep(seconds)
+        self.waiting += time.perf_counter() - start
+
+    def input(self, prompt=""):
+        """input(), not counted towards startup time"""
+        start = time.perf_counter()
+        try:
+            return input(prompt)
+        finally:
+            self.waiting += time.perf_counter() - start
+
+    def report(self):
+        """
+        Print the phase breakdown once, when the first menu is shown
+        
+        The total runs from when main.py started, so it includes its imports
+        and any work outside the named phases, but not interpreter start-up;
+        the pauses and prompts are reported so that a caller timing the
+        whole process can leave them out too.
+        """
+        if not self.enabled:
+            return
+        self.enabled = False
+        
+        print("\nStartup profile (pauses and waiting for input excluded):")
+        for name, seconds in self.phases.items():
+            print(f"  {name:<22}{seconds * 1000:>9.1f} ms")
+        total = time.perf_counter() - MAIN_STARTED - self.waiting
+        print(f"  {'other':<22}{(total - sum(self.phases.values())) * 1000:>9.1f} ms")
+        print(f"  {'time to first menu':<22}{total * 1000:>9.1f} ms")
+        print(f"  {'paused':<22}{self.waiting * 1000:>9.1f} ms", flush=True)
+
+# Enabled by --profile-startup
+startup = StartupProfiler()
 
 def clear_screen():
     """Clear the terminal screen based on OS"""
@@ -27,88 +106,132 @@ def display_welcome():
     print("  • Progress tracking")
     print("\nLet's start learning Spanish today!")
     print("\n" + "=" * 60)
-    time.sleep(1)
+    startup.sleep(1)
 
-def user_login():
-    """Handle user login or profile creation"""
-    user_profile = UserProfile()
+def user_login(storage=None):
+    """
+    Handle user login or profile creation
+    
+    Args:
+        storage (ProfileStorage, optional): Profile storage backend
+    """
+    with startup.phase("open profiles"):
+        from src.user_profile import UserProfile
+        user_profile = UserProfile(write_behind=True, journal=True, storage=storage)
+    page = 0
+    search = None
     
     while True:
         clear_screen()
         print("\n🇪🇸  USER PROFILE  🇪🇸\n")
         
-        profiles = user_profile.get_available_profiles()
+        # Only fetch the page being shown
+        with startup.phase("list profiles"):
+            total = user_profile.count_available_profiles(search)
+            pages = max(1, -(-total // PROFILES_PER_PAGE))
+            page = min(page, pages - 1)
+            profiles = user_profile.get_available_profiles(search, page * PROFILES_PER_PAGE, PROFILES_PER_PAGE)
         
-        if profiles:
-            print("Available profiles:")
+        if profiles or search:
+            if search:
+                print(f"Profiles starting with '{search}' ({total} found):")
+            else:
+                print("Available profiles:")
             for i, profile in enumerate(profiles, 1):
                 print(f"{i}. {profile['name']}")
             print(f"{len(profiles) + 1}. Create new profile")
             print(f"{len(profiles) + 2}. Continue without profile")
             
+            if pages > 1:
+                print(f"\nPage {page + 1}/{pages} - 'n' next page, 'p' previous page")
+            print("'s' search by name" + (", 'a' show all profiles" if search else ""))
+            
+            choice = startup.input("\nSelect a profile or create a new one: ").strip().lower()
+            
+            if choice == 'n':
+                page = min(page + 1, pages - 1)
+                continue
+            elif choice == 'p':
+                page = max(page - 1, 0)
+                continue
+            elif choice == 's':
+                search = startup.input("\nName starts with: ").strip() or None
+                page = 0
+                continue
+            elif choice == 'a':
+                search = None
+                page = 0
+                continue
+            
             try:
-                choice = int(input("\nSelect a profile or create a new one: "))
+                choice = int(choice)
                 
                 if 1 <= choice <= len(profiles):
                     # Load existing profile
-                    if user_profile.load_profile(profiles[choice-1]['id']):
+                    with startup.phase("load profile"):
+                        loaded = user_profile.load_profile(profiles[choice-1]['id'])
+                    if loaded:
                         print(f"\nWelcome back, {user_profile.current_profile['name']}!")
-                        time.sleep(1)
+                        startup.sleep(1)
                         return user_profile
                     else:
                         print("\nError loading profile. Please try again.")
-                        time.sleep(1)
+                        startup.sleep(1)
                 
                 elif choice == len(profiles) + 1:
                     # Create new profile
-                    name = input("\nEnter your name: ")
-                    if name and user_profile.create_profile(name):
+                    name = startup.input("\nEnter your name: ")
+                    with startup.phase("create profile"):
+                        created = name and user_profile.create_profile(name)
+                    if created:
                         print(f"\nWelcome, {name}! Your profile has been created.")
-                        time.sleep(1)
+                        startup.sleep(1)
                         return user_profile
                     else:
                         print("\nError creating profile. Please try again.")
-                        time.sleep(1)
+                        startup.sleep(1)
                 
                 elif choice == len(profiles) + 2:
                     # Continue without profile
                     print("\nContinuing without profile. Your progress will not be saved.")
-                    time.sleep(1)
+                    startup.sleep(1)
                     return None
                 
                 else:
                     print("\nInvalid choice. Please try again.")
-                    time.sleep(1)
+                    startup.sleep(1)
             
             except ValueError:
                 print("\nPlease enter a number.")
-                time.sleep(1)
+                startup.sleep(1)
         
         else:
             print("No profiles found.")
             print("1. Create new profile")
             print("2. Continue without profile")
             
-            choice = input("\nEnter your choice: ")
+            choice = startup.input("\nEnter your choice: ")
             
             if choice == "1":
-                name = input("\nEnter your name: ")
-                if name and user_profile.create_profile(name):
+                name = startup.input("\nEnter your name: ")
+                with startup.phase("create profile"):
+                    created = name and user_profile.create_profile(name)
+                if created:
                     print(f"\nWelcome, {name}! Your profile has been created.")
-                    time.sleep(1)
+                    startup.sleep(1)
                     return user_profile
                 else:
                     print("\nError creating profile. Please try again.")
-                    time.sleep(1)
+                    startup.sleep(1)
             
             elif choice == "2":
                 print("\nContinuing without profile. Your progress will not be saved.")
-                time.sleep(1)
+                startup.sleep(1)
                 return None
             
             else:
                 print("\nInvalid choice. Please try again.")
-                time.sleep(1)
+                startup.sleep(1)
 
 def display_user_stats(user_profile):
     """Display user statistics"""
@@ -148,6 +271,18 @@ def display_user_stats(user_profile):
     else:
         print("  • No words practiced yet")
     
+    # Show quiz averages from the rollups
+    rollups = stats.get('quiz_rollups')
+    if rollups and rollups['categories']:
+        year, week, _ = datetime.date.today().isocalendar()
+        this_week = rollups['weekly'].get(f"{year}-W{week:02d}")
+        print("\nQuiz Averages:")
+        if this_week:
+            print(f"  • This week: {this_week['count']} quizzes, "
+                  f"average {this_week['mean']}%, best {this_week['best']}%")
+        for category, rollup in sorted(rollups['categories'].items()):
+            print(f"  • {category}: {rollup['count']} quizzes, average {rollup['mean']}%, best {rollup['best']}%")
+    
     # Show recent quiz scores
     if stats['quiz_history']:
         print("\nRecent Quiz Scores:")
@@ -168,38 +303,48 @@ def display_user_stats(user_profile):
 
 def main_menu(user_profile=None):
     """Display the main menu and handle user input"""
-    chatbot = SpanishChatbot(user_profile)
+    with startup.phase("create chatbot"):
+        from src.chatbot import SpanishChatbot
+        chatbot = SpanishChatbot(user_profile)
+
+    # Today's word shows in the menu header. Picking it the first time each
+    # day loads the vocabulary; after that it is read from the profile.
+    if user_profile and user_profile.current_profile:
+        with startup.phase("word of the day"):
+            chatbot.engine.get_word_of_day()
 
     while True:
-        clear_screen()
+        with startup.phase("main menu"):
+            clear_screen()
         
-        # Show a header with user name if profile is loaded
-        if user_profile and user_profile.current_profile:
-            print(f"\n🇪🇸  SPANISH LEARNING CHATBOT - Welcome, {user_profile.current_profile['name']}!  🇪🇸\n")
-        else:
-            print("\n🇪🇸  SPANISH LEARNING CHATBOT - MAIN MENU  🇪🇸\n")
+            # Show a header with user name if profile is loaded
+            if user_profile and user_profile.current_profile:
+                print(f"\n🇪🇸  SPANISH LEARNING CHATBOT - Welcome, {user_profile.current_profile['name']}!  🇪🇸\n")
+            else:
+                print("\n🇪🇸  SPANISH LEARNING CHATBOT - MAIN MENU  🇪🇸\n")
         
-        # Show word of the day if available
-        if user_profile and user_profile.current_profile:
-            word_of_day = user_profile.get_word_of_day()
-            if word_of_day:
-                print(f"📖 Today's Word: {word_of_day['spanish']} - {word_of_day['english']}\n")
+            # Show word of the day if available
+            if user_profile and user_profile.current_profile:
+                word_of_day = user_profile.get_word_of_day()
+                if word_of_day:
+                    print(f"📖 Today's Word: {word_of_day['spanish']} - {word_of_day['english']}\n")
         
-        print("1. Learn Vocabulary")
-        print("2. Practice with Flashcards")
-        print("3. Take a Quiz")
-        print("4. Practice Conversations")
+            print("1. Learn Vocabulary")
+            print("2. Practice with Flashcards")
+            print("3. Take a Quiz")
+            print("4. Practice Conversations")
         
-        # Additional options for users with profiles
-        if user_profile and user_profile.current_profile:
-            print("5. View Your Statistics")
-            print("6. Manage Custom Vocabulary")
-            print("7. Language & Cultural Notes")
-            print("8. Exit")
-        else:
-            print("5. Exit")
+            # Additional options for users with profiles
+            if user_profile and user_profile.current_profile:
+                print("5. View Your Statistics")
+                print("6. Manage Custom Vocabulary")
+                print("7. Language & Cultural Notes")
+                print("8. Exit")
+            else:
+                print("5. Exit")
 
-        max_choice = 8 if user_profile and user_profile.current_profile else 5
+            max_choice = 8 if user_profile and user_profile.current_profile else 5
+        startup.report()
         
         choice = input(f"\nEnter your choice (1-{max_choice}): ")
 
@@ -226,10 +371,29 @@ def main_menu(user_profile=None):
             time.sleep(1)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spanish Learning Chatbot")
+    parser.add_argument("--profile-db", help="store profiles in this SQLite database instead of JSON files")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase takes when the main menu first shows")
+    parser.add_argument("--metrics", choices=("text", "prometheus"),
+                        help="collect timings of the hot paths and print them in this format on exit")
+    args = parser.parse_args()
+    startup.enabled = args.profile_startup
+    if args.metrics:
+        from src.metrics import metrics
+        metrics.enable()
+        atexit.register(lambda: print("\n" + (metrics.render_prometheus() if args.metrics == "prometheus"
+                                                else metrics.render_text()), end=""))
+    
     try:
         display_welcome()
-        input("\nPress Enter to continue...")
-        user_profile = user_login()
+        startup.input("\nPress Enter to continue...")
+        storage = None
+        if args.profile_db:
+            with startup.phase("open profiles"):
+                from src.profile_storage import SQLiteStorage
+                storage = SQLiteStorage(args.profile_db)
+        user_profile = user_login(storage)
         main_menu(user_profile)
     except KeyboardInterrupt:
         print("\n\nProgram interrupted. ¡Adiós!")
@@ -0,0 +1,35 @@
+"""
+Spanish Learning Chatbot - Profile Migration
+Run this file to import JSON user profiles into a SQLite profile database
+
+Usage:
+    python migrate_profiles.py [--source data/user_profiles] [--db data/user_profiles.db]
+"""
+
+import sys
+import time
+import argparse
+from src.profile_storage import JsonFileStorage, SQLiteStorage, migrate_profiles
+
+def main():
+    """Import every JSON profile (with its journal replayed) into SQLite"""
+    parser = argparse.ArgumentParser(description="Import JSON user profiles into a SQLite database")
+    parser.add_argument("--source", default="data/user_profiles", help="directory of JSON profiles")
+    parser.add_argument("--db", default="data/user_profiles.db", help="SQLite database to create or update")
+    args = parser.parse_args()
+    
+    source = JsonFileStorage(args.source)
+    target = SQLiteStorage(args.db)
+    
+    start = time.perf_counter()
+    migrated, failed = migrate_profiles(source, target)
+    elapsed = time.perf_counter() - start
+    target.close()
+    
+    print(f"Migrated {migrated} profiles to {args.db} in {elapsed:.2f}s")
+    if failed:
+        print(f"Failed to migrate {len(failed)} profiles: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Spanish Learning Chatbot - Server Entry Point
+Run this file to serve many learners from one process over TCP
+
+The protocol is line-oriented JSON. Each request is one line holding an
+object with a "command" and its arguments, and each response is one line,
+either {"ok": true, "result": ...} or {"ok": false, "error": "..."}:
+
+    {"command": "login", "name": "Ana"}
+    {"command": "quiz", "category": "greetings", "questions": 5}
+    {"command": "next"}
+    {"command": "answer", "option": 2}
+    {"command": "flashcards", "category": "food"}
+    {"command": "next"}
+    {"command": "answer", "text": "el pan"}
+    {"command": "finish"}
+    {"command": "metrics", "format": "prometheus"}
+
+Usage:
+    python cli/server.py [--host HOST] [--port PORT] [--profile-db PATH] [--vocabulary FILE] [--metrics]
+"""
+
+import os
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from src.engine import LearningEngine
+from src.user_profile import UserProfile
+from src.profile_storage import JsonFileStorage, SQLiteStorage, SynchronizedStorage
+from src.vocabulary_manager import VocabularyManager
+from src.cultural_notes import CulturalNotesManager
+from src.utils import load_json_cached
+from src.answer_checker import default_checker
+from src.word_view import json_default
+from src.metrics import metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class ProtocolError(Exception):
+    """A request that can't be served, reported back to the client"""
+
+
+class LearnerConnection:
+    """State of one connected learner: profile, engine and current session"""
+
+    def __init__(self, server):
+        """
+        Initialize a connection without a profile
+
+        Args:
+            server (ChatbotServer): The server holding the shared data
+        """
+        self.server = server
+        self.user_profile = None
+        self.engine = server.create_engine(None)
+        self.session = None
+        self.session_kind = None
+
+    @staticmethod
+    def _argument(request, name):
+        """Get a required request argument or raise ProtocolError"""
+        if name not in request:
+            raise ProtocolError(f"Missing argument: {name}")
+        return request[name]
+
+    def _require_session(self):
+        """Get the current session or raise ProtocolError"""
+        if self.session is None:
+            raise ProtocolError("No active session")
+        return self.session
+
+    def start_session(self, kind, session):
+        """Finish the current session, if any, and switch to a new one"""
+        self.finish_session()
+        if session is None:
+            return {"session": None}
+
+        self.session = session
+        self.session_kind = kind
+        return {"session": kind}
+
+    def finish_session(self):
+        """
+        End the current session and save its progress
+
+        Returns:
+            dict: Session summary, or None without an active session
+        """
+        if self.session is None:
+            return None
+
+        # Drop the session first, so a session that fails to finish isn't
+        # finished again by every later call (e.g. on logout)
+        session = self.session
+        self.session = None
+        self.session_kind = None
+        return session.finish()
+
+    def login(self, name):
+        """
+        Load a profile, creating it if it doesn't exist
+
+        Args:
+            name (str): Learner's name
+
+        Returns:
+            dict: Profile name and statistics
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ProtocolError("A name is required")
+
+        profile_id = name.lower().replace(" ", "_")
+        switching = self.user_profile is None or self.user_profile.profile_name != profile_id
+        if switching and profile_id in self.server.active_profiles:
+            raise ProtocolError(f"Profile '{name}' is already in use")
+
+        self.logout()
+
+        user_profile = UserProfile(storage=self.server.storage, journal=True)
+        if not user_profile.load_profile(profile_id) and not user_profile.create_profile(name):
+            raise ProtocolError(f"Could not load or create profile '{name}'")
+
+        self.server.active_profiles.add(profile_id)
+        self.user_profile = user_profile
+        self.engine = self.server.create_engine(user_profile)
+
+        return {
+            "name": user_profile.current_profile['name'],
+            "statistics": user_profile.get_statistics()
+        }
+
+    def logout(self):
+        """Save the current session and release the profile"""
+        try:
+            self.finish_session()
+        finally:
+            if self.user_profile:
+                # Release the profile even if saving fails, or it stays
+                # "in use" until the server restarts
+                user_profile = self.user_profile
+                self.user_profile = None
+                self.engine = self.server.create_engine(None)
+                try:
+                    user_profile.flush()
+                finally:
+                    self.server.active_profiles.discard(user_profile.profile_name)
+
+    def build_quiz(self, request):
+        """
+        Build a quiz session from a 'quiz' request, without switching to it
+
+        This only reads shared data and the profile, so the server can build
+        quizzes off the profile threads.
+
+        Returns:
+            QuizSession: The session, or None if no questions can be asked
+        """
+        num_questions = int(request.get('questions', 5))
+        if num_questions < 1:
+            raise ProtocolError("A quiz needs at least one question")
+        return self.engine.start_quiz(
+            self._argument(request, 'category'),
+            num_questions,
+            int(request.get('direction', 1)),
+            request.get('difficulty')
+        )
+
+    def next_item(self):
+        """Get the next card, question or exchange of the current session"""
+        session = self._require_session()
+
+        if self.session_kind == "quiz":
+            return session.next_question()
+        if self.session_kind == "dialogue":
+            return session.next_exchange()
+        return session.next_card()
+
+    def answer(self, request):
+        """Answer the current card or question"""
+        session = self._require_session()
+
+        if self.session_kind == "quiz":
+            return session.submit_answer(int(self._argument(request, 'option')))
+        if self.session_kind == "flashcards":
+            if 'text' in request:
+                if not isinstance(request['text'], str):
+                    raise ProtocolError("Answer text must be a string")
+                return session.submit_typed_answer(request['text'])
+            return session.submit_answer(bool(self._argument(request, 'correct')))
+        raise ProtocolError("Dialogues have no answers")
+
+    def handle(self, command, request):
+        """
+        Run a command
+
+        Args:
+            command (str): Command name
+            request (dict): The request with the command's arguments
+
+        Returns:
+            The command's JSON-serializable result
+        """
+        engine = self.engine
+
+        if command == "login":
+            return self.login(request.get('name'))
+        if command == "logout":
+            self.logout()
+            return None
+        if command == "categories":
+            return engine.list_categories()
+        if command == "words":
+            return engine.get_category_words(self._argument(request, 'category'), request.get('difficulty'))
+        if command == "flashcards":
+            return self.start_session("flashcards", engine.start_flashcards(self._argument(request, 'category')))
+        if command == "review":
+            return self.start_session("flashcards", engine.start_spaced_repetition(request.get('limit')))
+        if command == "quiz":
+            return self.start_session("quiz", self.build_quiz(request))
+        if command == "dialogues":
+            return engine.list_dialogues()
+        if command == "dialogue":
+            return self.start_session("dialogue", engine.start_dialogue(int(self._argument(request, 'index'))))
+        if command == "next":
+            return self.next_item()
+        if command == "answer":
+            return self.answer(request)
+        if command == "finish":
+            self._require_session()
+            return self.finish_session()
+        if command == "search_notes":
+            return engine.search_notes(self._argument(request, 'query'), int(request.get('limit', 10)), request.get('kind'))
+        if command == "word_of_day":
+            return engine.get_word_of_day()
+        if command == "stats":
+            return engine.get_statistics()
+        if command == "metrics":
+            if request.get('format', 'text') == "prometheus":
+                return metrics.render_prometheus()
+            return metrics.render_text()
+
+        raise ProtocolError(f"Unknown command: {command}")
+
+
+class ChatbotServer:
+    """
+    Serves learning sessions to many learners from one process
+
+    Vocabulary, dialogues and notes are loaded once and shared read-only by
+    every connection. Commands run off the event loop on two thread pools:
+    slow read-only work (note searches, building quizzes) on one, and
+    commands that can touch profile storage on the other, so a slow request
+    only holds up its own learner. Each connection runs its requests one at
+    a time and a profile belongs to one connection, which serializes work
+    per profile; calls into the shared storage backend are serialized by
+    SynchronizedStorage.
+    """
+
+    # Commands that only read shared data or in-memory profile state
+    IN_MEMORY_COMMANDS = {"categories", "words", "dialogues", "next", "stats", "metrics"}
+
+    # Commands that only read shared data, but may take a while
+    READ_ONLY_COMMANDS = {"search_notes"}
+
+    # Worker threads in each pool
+    WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+    def __init__(self, storage=None, vocabulary_manager=None):
+        """
+        Initialize the server and load the shared data
+
+        Args:
+            storage (ProfileStorage, optional): Profile storage backend
+                (defaults to JSON files in data/user_profiles)
+            vocabulary_manager (VocabularyManager, optional): Vocabulary to
+                serve (defaults to data/vocabulary.json)
+        """
+        self.storage = SynchronizedStorage(storage or JsonFileStorage())
+        self.vocabulary_manager = vocabulary_manager or VocabularyManager()
+        default_checker.precompile(word for category in self.vocabulary_manager.get_categories()
+                                   for word in category['words'])
+        self.dialogues = load_json_cached('data/dialogues.json')
+        self.cultural_notes = CulturalNotesManager()
+        self.active_profiles = set()
+        self.profile_executor = ThreadPoolExecutor(max_workers=self.WORKERS, thread_name_prefix="profile")
+        self.read_executor = ThreadPoolExecutor(max_workers=self.WORKERS, thread_name_prefix="read")
+
+    def create_engine(self, user_profile):
+        """Create a learning engine over the shared data"""
+        return LearningEngine(
+            user_profile,
+            vocabulary_manager=self.vocabulary_manager,
+            dialogues=self.dialogues,
+            cultural_notes=self.cultural_notes
+        )
+
+    async def _run(self, function, *args, executor=None):
+        """Run a function on a worker thread (a profile thread by default)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor or self.profile_executor, function, *args)
+
+    async def _dispatch(self, connection, line):
+        """Parse one request line and build its response (None for 'quit')"""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("Requests must be JSON objects")
+            command = request.get('command')
+
+            if command == "quit":
+                return None
+            if command in self.IN_MEMORY_COMMANDS:
+                result = connection.handle(command, request)
+            elif command in self.READ_ONLY_COMMANDS:
+                result = await self._run(connection.handle, command, request, executor=self.read_executor)
+            elif command == "quiz":
+                # Build the questions on a read thread; only switching
+                # sessions (which saves the previous one) needs a profile thread
+                session = await self._run(connection.build_quiz, request, executor=self.read_executor)
+                result = await self._run(connection.start_session, "quiz", session)
+            else:
+                result = await self._run(connection.handle, command, request)
+
+            return {"ok": True, "result": result}
+        except json.JSONDecodeError:
+            return {"ok": False, "error": "Invalid JSON"}
+        except ProtocolError as e:
+            return {"ok": False, "error": str(e)}
+        except KeyError as e:
+            return {"ok": False, "error": str(e.args[0])}
+        except (ValueError, TypeError, IndexError) as e:
+            return {"ok": False, "error": f"Invalid request: {e}"}
+        except Exception as e:
+            # A failing command must not drop the client (and its profile)
+            return {"ok": False, "error": f"Internal error: {type(e).__name__}: {e}"}
+
+    async def handle_client(self, reader, writer):
+        """Serve one client until it disconnects or sends 'quit'"""
+        connection = LearnerConnection(self)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                line = line.strip()
+                if not line:
+                    continue
+
+                response = await self._dispatch(connection, line)
+                if response is None:
+                    break
+
+                writer.write(json.dumps(response, ensure_ascii=False, default=json_default).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            await self._run(connection.logout)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Accept connections until cancelled
+
+        Args:
+            host (str, optional): Interface to listen on
+            port (int, optional): Port to listen on (0 picks a free port)
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving on {address[0]}:{address[1]}", flush=True)
+
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spanish Learning Chatbot server")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 picks a free port)")
+    parser.add_argument("--profiles-dir", default="data/user_profiles", help="directory holding profile JSON files")
+    parser.add_argument("--profile-db", help="store profiles in this SQLite database instead of JSON files")
+    parser.add_argument("--vocabulary", default="data/vocabulary.json",
+                        help="vocabulary file; '.jsonl' files are streamed")
+    parser.add_argument("--categories", nargs="+", help="only serve these categories ('.jsonl' vocabulary)")
+    parser.add_argument("--difficulties", nargs="+", help="only serve these difficulties ('.jsonl' vocabulary)")
+    parser.add_argument("--metrics", action="store_true", help="collect timings, served by the 'metrics' command")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+
+    storage = SQLiteStorage(args.profile_db) if args.profile_db else JsonFileStorage(args.profiles_dir)
+    vocabulary_manager = VocabularyManager(args.vocabulary, args.categories, args.difficulties)
+
+    try:
+        asyncio.run(ChatbotServer(storage, vocabulary_manager).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nServer stopped. ¡Adiós!")
@@ -0,0 +1,218 @@
+"""
+Spanish Learning Chatbot - Answer Checker
+This module grades typed answers against a word's accepted translations
+"""
+
+import re
+import itertools
+
+from src.vocabulary_search import (TOKEN_PATTERN, normalize_text, _pattern_masks,
+                                   _bounded_transposition_distance)
+
+# Grades for typed answers
+GRADE_EXACT = "exact"
+GRADE_NEAR = "near"
+GRADE_WRONG = "wrong"
+
+# Leading words ignored on both sides ("el libro" matches "libro")
+ARTICLES = frozenset([
+    "el", "la", "los", "las", "un", "una", "unos", "unas",
+    "the", "a", "an", "to"
+])
+
+# Notes in accepted answers, e.g. "the book (masculine)"
+NOTE_PATTERN = re.compile(r"\([^)]*\)")
+
+# Slashes between whole answers ("hello / hi") rather than between words
+ANSWER_SEPARATOR = re.compile(r"\s+/\s+")
+
+# Most word-level alternative combinations expanded from one answer
+MAX_FORMS = 32
+
+
+def typo_tolerance(length):
+    """
+    Get how many edits a typed answer may be off by and still count
+
+    An edit is inserting, deleting or replacing a character, or swapping
+    two adjacent ones ("gracais" is one edit from "gracias").
+
+    Args:
+        length (int): Length of the normalized accepted form
+
+    Returns:
+        int: 0 for short words, 1 up to 7 characters, 2 beyond
+    """
+    if length < 4:
+        return 0
+    return 1 if length <= 7 else 2
+
+
+def normalize_answer(text):
+    """
+    Normalize an answer for comparison
+
+    Accents, case, punctuation and apostrophes are ignored and a leading
+    article is dropped unless it is the whole answer.
+
+    Args:
+        text (str): Answer text
+
+    Returns:
+        str: Space-separated normalized words
+    """
+    words = TOKEN_PATTERN.findall(normalize_text(text.replace("'", "").replace("’", "")))
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+def answer_forms(answer):
+    """
+    Expand an accepted answer into every normalized form that counts
+
+    "Good evening/night" gives "good evening" and "good night", and
+    "hello / hi" gives "hello" and "hi". Notes in parentheses are dropped.
+
+    Args:
+        answer (str): Accepted answer as stored in the vocabulary
+
+    Returns:
+        list: Distinct normalized forms, in order
+    """
+    forms = []
+
+    for alternative in ANSWER_SEPARATOR.split(NOTE_PATTERN.sub(" ", answer)):
+        choices = [word.split("/") for word in alternative.split()]
+        for combination in itertools.islice(itertools.product(*choices), MAX_FORMS):
+            form = normalize_answer(" ".join(combination))
+            if form and form not in forms:
+                forms.append(form)
+
+    return forms
+
+
+class CompiledAnswer:
+    """The normalized forms of one accepted answer, ready for grading"""
+
+    __slots__ = ("answer", "forms", "exact", "patterns")
+
+    def __init__(self, answer):
+        """
+        Compile an accepted answer
+
+        Args:
+            answer (str): Accepted answer as stored in the vocabulary
+        """
+        self.answer = answer
+        self.forms = answer_forms(answer)
+        self.exact = frozenset(self.forms)
+        # (masks, length, tolerance) of each form for bit-vector distances
+        self.patterns = [(_pattern_masks(form), len(form), typo_tolerance(len(form)))
+                         for form in self.forms]
+
+    def grade(self, normalized):
+        """
+        Grade a normalized response
+
+        Args:
+            normalized (str): normalize_answer() of the response
+
+        Returns:
+            tuple: (grade, matched form or None, edit distance or None)
+        """
+        if normalized in self.exact:
+            return GRADE_EXACT, normalized, 0
+
+        best = None
+        for form, (masks, length, tolerance) in zip(self.forms, self.patterns):
+            if not tolerance:
+                continue
+            distance = _bounded_transposition_distance(masks, length, normalized, tolerance)
+            if distance <= tolerance and (best is None or distance < best[1]):
+                best = (form, distance)
+
+        if best:
+            return GRADE_NEAR, best[0], best[1]
+        return GRADE_WRONG, None, None
+
+
+class AnswerChecker:
+    """
+    Grades typed answers as exact, near (a small typo) or wrong
+
+    Accepted answers are compiled once into their normalized forms and
+    bit-vector patterns and cached by answer text, so checking an answer
+    only normalizes the response. Edited words get new answer texts and
+    so are compiled again on their next check.
+    """
+
+    def __init__(self):
+        """Initialize an empty checker"""
+        self._compiled = {}
+
+    def compile(self, answer):
+        """
+        Get the compiled form of an accepted answer
+
+        Args:
+            answer (str): Accepted answer as stored in the vocabulary
+
+        Returns:
+            CompiledAnswer: The cached compiled answer
+        """
+        compiled = self._compiled.get(answer)
+        if compiled is None:
+            compiled = CompiledAnswer(answer)
+            self._compiled[answer] = compiled
+        return compiled
+
+    def precompile(self, words):
+        """
+        Compile both directions' answers of many words ahead of time
+
+        Args:
+            words (iterable): Word dicts with 'spanish' and 'english'
+        """
+        for word in words:
+            self.compile(word['spanish'])
+            self.compile(word['english'])
+
+    def check(self, response, answer):
+        """
+        Grade a typed response
+
+        Args:
+            response (str): What the learner typed
+            answer (str): Accepted answer as stored in the vocabulary
+
+        Returns:
+            dict: Result with 'grade', 'correct' (exact or near), the
+                'expected' answer, the 'matched' form and its 'distance'
+        """
+        grade, matched, distance = self.compile(answer).grade(normalize_answer(response))
+        return {
+            "grade": grade,
+            "correct": grade != GRADE_WRONG,
+            "expected": answer,
+            "matched": matched,
+            "distance": distance
+        }
+
+
+# Checker shared by sessions; its cache only grows with distinct answers
+default_checker = AnswerChecker()
+
+
+def check_answer(response, answer):
+    """
+    Grade a typed response with the shared checker
+
+    Args:
+        response (str): What the learner typed
+        answer (str): Accepted answer as stored in the vocabulary
+
+    Returns:
+        dict: See AnswerChecker.check()
+    """
+    return default_checker.check(response, answer)
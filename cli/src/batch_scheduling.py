@@ -0,0 +1,157 @@
+"""
+Spanish Learning Chatbot - Batch Scheduling
+This module computes spaced repetition schedules for many words at once
+using NumPy, for analytics and nightly jobs
+"""
+
+import datetime
+from src.spaced_repetition import REVIEW_INTERVALS, MASTERED_INTERVAL
+
+# Try to import NumPy for vectorized scheduling
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# Ordinal of 1970-01-01, the datetime64 epoch
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# Last-practiced ordinal used for words that were never (or unreadably) practiced
+NEVER_PRACTICED = 0
+
+
+def _require_numpy():
+    """Raise a helpful error if NumPy isn't installed"""
+    if not numpy_available:
+        raise ImportError("Batch scheduling requires NumPy (pip install numpy)")
+
+
+def load_review_columns(profiles):
+    """
+    Load every practiced word of every profile into columnar arrays
+
+    Args:
+        profiles (iterable): Profile data dicts
+
+    Returns:
+        dict: Arrays of equal length, one row per practiced word:
+            'profile_index' (int32) - position of the profile in `profiles`
+            'mastery_level' (int8) - mastery level
+            'last_practiced' (int32) - date ordinal of the last review, or
+                NEVER_PRACTICED when missing or unreadable
+            plus 'num_profiles' (int)
+    """
+    _require_numpy()
+
+    profile_index = []
+    mastery_level = []
+    last_practiced = []
+    num_profiles = 0
+
+    for index, profile_data in enumerate(profiles):
+        num_profiles = index + 1
+
+        for words in profile_data['mastered_words'].values():
+            for word_data in words.values():
+                try:
+                    ordinal = datetime.datetime.fromisoformat(word_data['last_practiced']).date().toordinal()
+                except (ValueError, TypeError):
+                    ordinal = NEVER_PRACTICED
+
+                profile_index.append(index)
+                mastery_level.append(word_data['mastery_level'])
+                last_practiced.append(ordinal)
+
+    return {
+        'profile_index': np.array(profile_index, dtype=np.int32),
+        'mastery_level': np.array(mastery_level, dtype=np.int8),
+        'last_practiced': np.array(last_practiced, dtype=np.int32),
+        'num_profiles': num_profiles
+    }
+
+
+def review_intervals(mastery_levels):
+    """
+    Look up the review interval in days for each mastery level
+
+    Args:
+        mastery_levels (numpy.ndarray): Mastery levels
+
+    Returns:
+        numpy.ndarray: Intervals (int32), matching REVIEW_INTERVALS with
+            MASTERED_INTERVAL for every other level
+    """
+    _require_numpy()
+
+    table = np.array([REVIEW_INTERVALS[level] for level in range(len(REVIEW_INTERVALS))], dtype=np.int32)
+    known = (mastery_levels >= 0) & (mastery_levels < len(table))
+    return np.where(known, table[np.clip(mastery_levels, 0, len(table) - 1)], np.int32(MASTERED_INTERVAL))
+
+
+def schedule_batch(mastery_levels, last_practiced, profile_index=None, num_profiles=None, today=None):
+    """
+    Compute review schedules for many words in one vectorized pass
+
+    Results match SpacedRepetitionSystem.get_next_review_date(level, last, True)
+    row for row.
+
+    Args:
+        mastery_levels (numpy.ndarray): Mastery level per word
+        last_practiced (numpy.ndarray): Last review date ordinal per word
+            (NEVER_PRACTICED for words without a readable date)
+        profile_index (numpy.ndarray, optional): Owning profile per word, to
+            compute per-profile due counts
+        num_profiles (int, optional): Number of profiles for the due counts
+        today (datetime.date, optional): Date to schedule against (defaults to today)
+
+    Returns:
+        dict: 'next_review' (datetime64[D]) - next review date per word
+              'overdue_days' (int32) - days past the unclamped due date, 0 if not overdue
+              'is_due' (bool) - whether the word is due on `today`
+              'due_count' (int) - number of due words
+              'due_counts' (int64, only with profile_index) - due words per profile
+    """
+    _require_numpy()
+
+    today_ordinal = (today or datetime.datetime.now().date()).toordinal()
+
+    never = last_practiced == NEVER_PRACTICED
+    due_ordinal = last_practiced + review_intervals(mastery_levels)
+    next_ordinal = np.where(never, today_ordinal, np.maximum(due_ordinal, today_ordinal))
+    overdue_days = np.where(never, 0, np.maximum(today_ordinal - due_ordinal, 0)).astype(np.int32)
+    is_due = next_ordinal <= today_ordinal
+
+    result = {
+        'next_review': (next_ordinal - EPOCH_ORDINAL).astype('datetime64[D]'),
+        'overdue_days': overdue_days,
+        'is_due': is_due,
+        'due_count': int(np.count_nonzero(is_due))
+    }
+
+    if profile_index is not None:
+        result['due_counts'] = np.bincount(profile_index[is_due], minlength=num_profiles or 0)
+
+    return result
+
+
+def schedule_profiles(profiles, today=None):
+    """
+    Load profiles into columns and schedule every practiced word
+
+    Args:
+        profiles (iterable): Profile data dicts
+        today (datetime.date, optional): Date to schedule against (defaults to today)
+
+    Returns:
+        dict: The loaded columns merged with the schedule_batch() results
+    """
+    columns = load_review_columns(profiles)
+    columns.update(schedule_batch(
+        columns['mastery_level'],
+        columns['last_practiced'],
+        columns['profile_index'],
+        columns['num_profiles'],
+        today
+    ))
+    return columns
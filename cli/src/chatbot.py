@@ -7,35 +7,49 @@ import json
 import os
 import random
 import time
-from src.quiz import QuizSystem
-from src.utils import clear_screen, load_json_data
-from src.vocabulary_manager import VocabularyManager
-from src.spaced_repetition import SpacedRepetitionSystem
-from src.cultural_notes import CulturalNotesManager
+from src.utils import clear_screen
+from src.engine import LearningEngine
+from src.sessions import DialogueSession
 
 class SpanishChatbot:
     """Main chatbot class that handles user interactions and learning activities"""
 
     def __init__(self, user_profile=None):
         """
-        Initialize the chatbot with vocabulary and dialogue data
+        Initialize the chatbot; vocabulary, dialogues and notes load on first use
         
         Args:
             user_profile (UserProfile, optional): User profile for tracking progress
         """
-        self.vocabulary_manager = VocabularyManager()
-        self.vocabulary = self.vocabulary_manager.vocabulary
-        self.dialogues = load_json_data('data/dialogues.json')
+        self.engine = LearningEngine(user_profile)
         self.user_profile = user_profile
-        self.quiz_system = QuizSystem(self.vocabulary, self.user_profile)
-        self.spaced_repetition = SpacedRepetitionSystem(self.user_profile)
-        self.cultural_notes = CulturalNotesManager()
-        
-        # Check for word of the day if user profile exists
-        if self.user_profile and self.user_profile.current_profile:
-            # Set word of day if not already set today
-            if not self.user_profile.get_word_of_day():
-                self.vocabulary_manager.get_word_of_day(self.user_profile)
+
+    # The engine builds each subsystem on first use, so the main menu shows
+    # without loading data that the chosen activity doesn't need
+
+    @property
+    def vocabulary_manager(self):
+        return self.engine.vocabulary_manager
+
+    @property
+    def vocabulary(self):
+        return self.engine.vocabulary
+
+    @property
+    def dialogues(self):
+        return self.engine.dialogues
+
+    @property
+    def quiz_system(self):
+        return self.engine.quiz_system
+
+    @property
+    def spaced_repetition(self):
+        return self.engine.spaced_repetition
+
+    @property
+    def cultural_notes(self):
+        return self.engine.cultural_notes
 
     def learn_vocabulary(self):
         """Show vocabulary by category for learning"""
@@ -47,14 +61,17 @@ class SpanishChatbot:
             print("Choose a category to learn:")
             for i, category in enumerate(self.vocabulary['categories'], 1):
                 print(f"{i}. {category['display_name']}")
-            print(f"{len(self.vocabulary['categories']) + 1}. Return to Main Menu")
+            print(f"{len(self.vocabulary['categories']) + 1}. Search vocabulary")
+            print(f"{len(self.vocabulary['categories']) + 2}. Return to Main Menu")
 
             try:
                 choice = int(input("\nEnter your choice: "))
-                if choice == len(self.vocabulary['categories']) + 1:
+                if choice == len(self.vocabulary['categories']) + 2:
                     return
                 
-                if 1 <= choice <= len(self.vocabulary['categories']):
+                if choice == len(self.vocabulary['categories']) + 1:
+                    self._search_vocabulary()
+                elif 1 <= choice <= len(self.vocabulary['categories']):
                     self._display_category_words(self.vocabulary['categories'][choice - 1])
                 else:
                     print("\nInvalid choice. Please try again.")
@@ -63,6 +80,30 @@ class SpanishChatbot:
                 print("\nPlease enter a number.")
                 time.sleep(1)
 
+    def _search_vocabulary(self):
+        """Search words by Spanish or English text"""
+        while True:
+            clear_screen()
+            print("\n🇪🇸  SEARCH VOCABULARY  🇪🇸\n")
+            
+            query = input("Search for a Spanish or English word (leave blank to return): ").strip()
+            if not query:
+                return
+            
+            results = self.engine.search_vocabulary(query)
+            print()
+            
+            if not results:
+                print(f"No words found for '{query}'.")
+            
+            for i, result in enumerate(results, 1):
+                line = f"{i}. {result['spanish']} - {result['english']} ({result['category_display']})"
+                if result.get('distance'):
+                    line += " - did you mean this?"
+                print(line)
+            
+            input("\nPress Enter to search again...")
+
     def _display_category_words(self, category):
         """Display all words in a specific category"""
         # Check if filtering by difficulty is possible
@@ -182,26 +223,24 @@ class SpanishChatbot:
 
     def _run_flashcards(self, category):
         """Run flashcard practice for a specific category"""
-        words = category['words'].copy()
-        random.shuffle(words)
-        
-        # Track number of cards practiced
-        cards_practiced = 0
+        session = self.engine.start_flashcards(category['name'])
 
-        for word in words:
+        while True:
+            card = session.next_card()
+            if card is None:
+                break
+
+            word = card['word']
             clear_screen()
             print(f"\n🇪🇸  FLASHCARD: {category['display_name'].upper()}  🇪🇸\n")
             
             # Show mastery level if user profile exists
-            if self.user_profile and self.user_profile.current_profile:
-                mastery = self.user_profile.get_mastery_level(word['spanish'], category['name'])
+            if card['mastery_level'] is not None:
+                mastery = card['mastery_level']
                 mastery_display = "★" * mastery + "☆" * (5 - mastery)
                 print(f"Mastery: {mastery_display}\n")
             
-            # Randomly choose direction (Spanish to English or English to Spanish)
-            direction = random.choice([1, 2])
-            
-            if direction == 1:  # Spanish to English
+            if card['direction'] == 1:  # Spanish to English
                 print(f"Spanish: {word['spanish']}")
                 
                 # Show pronunciation tip if available
@@ -229,23 +268,14 @@ class SpanishChatbot:
                     break
                 print("Please enter 'y' or 'n'")
             
-            # Update user profile if available
-            if self.user_profile and self.user_profile.current_profile:
-                self.user_profile.update_word_mastery(
-                    word['spanish'],
-                    category['name'],
-                    got_it == 'y'
-                )
-            
-            cards_practiced += 1
+            session.submit_answer(got_it == 'y')
 
             # continue to the next card or return to category selection
             if input("\nPress Enter for next word or 'q' to quit: ").lower() == 'q':
                 break
         
         # Update flashcard practice count in user profile
-        if self.user_profile and self.user_profile.current_profile:
-            self.user_profile.update_flashcard_practice(cards_practiced)
+        session.finish()
 
         input("\nFlashcard session complete! Press Enter to return to categories...")
 
@@ -288,12 +318,14 @@ class SpanishChatbot:
         print("Press Enter to see the correct response.")
         print("\nLet's begin!\n")
         
-        # Track if dialogue was completed
-        completed = True
-        exchanges_practiced = 0
+        session = DialogueSession(dialogue, self.user_profile)
 
-        for i, exchange in enumerate(dialogue['exchanges'], 1):
-            print(f"\nExchange {i}:")
+        while True:
+            exchange = session.next_exchange()
+            if exchange is None:
+                break
+
+            print(f"\nExchange {exchange['number']}:")
             print(f"Person A: {exchange['speaker_a']}")
             print(f"Translation: {exchange['translation_a']}")
             
@@ -302,19 +334,15 @@ class SpanishChatbot:
             print(f"\nCorrect response: {exchange['speaker_b']}")
             print(f"Translation: {exchange['translation_b']}")
             
-            exchanges_practiced += 1
-            
             # continue to next exchange or return to dialogue selection
-            if i < len(dialogue['exchanges']):
+            if not session.completed:
                 if input("\nPress Enter for next exchange or 'q' to quit: ").lower() == 'q':
-                    completed = False
                     break
             else:
                 print("\nDialogue complete!")
         
         # Update user profile if available
-        if self.user_profile and self.user_profile.current_profile:
-            self.user_profile.update_conversation_practice(1 if completed else 0)
+        session.finish()
         
         input("\nPress Enter to return to conversations...")
     
@@ -456,6 +484,31 @@ class SpanishChatbot:
         
         input("\nPress Enter to return...")
     
+    def _search_notes(self):
+        """Search cultural notes and grammar explanations"""
+        while True:
+            clear_screen()
+            print("\n🇪🇸  SEARCH NOTES  🇪🇸\n")
+            
+            query = input("Search cultural and grammar notes (leave blank to return): ").strip()
+            if not query:
+                return
+            
+            results = self.engine.search_notes(query)
+            print()
+            
+            if not results:
+                print(f"No notes found for '{query}'.")
+            
+            for i, result in enumerate(results, 1):
+                if result['title'] == result['source']:
+                    print(f"{i}. {result['source']} ({result['section']})")
+                else:
+                    print(f"{i}. {result['source']}: {result['title']}")
+                print(f"   {result['snippet']}")
+            
+            input("\nPress Enter to search again...")
+    
     def browse_cultural_notes(self):
         """Browse cultural and grammar notes"""
         while True:
@@ -464,7 +517,8 @@ class SpanishChatbot:
             
             print("1. Cultural Notes")
             print("2. Grammar Explanations")
-            print("3. Return to Main Menu")
+            print("3. Search Notes")
+            print("4. Return to Main Menu")
             
             choice = input("\nEnter your choice: ")
             
@@ -473,6 +527,8 @@ class SpanishChatbot:
             elif choice == "2":
                 self.cultural_notes.browse_grammar_notes()
             elif choice == "3":
+                self._search_notes()
+            elif choice == "4":
                 return
             else:
                 print("\nInvalid choice. Please try again.")
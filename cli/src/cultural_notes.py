@@ -3,172 +3,184 @@ Spanish Learning Chatbot - Cultural Notes
 This module provides cultural context and information about Spanish-speaking countries
 """
 
-import json
 import os
 import random
-from src.utils import load_json_data, save_json_data, clear_screen, create_directory_if_not_exists
+from src.utils import clear_screen, create_directory_if_not_exists
+from src.note_shards import ShardedNotes
+from src.notes_search import NotesSearchIndex, describe_result, country_documents, topic_documents
 
-class CulturalNotesManager:
-    """Manages cultural notes and grammar explanations"""
-    
-    def __init__(self, notes_file='data/cultural_notes.json', grammar_file='data/grammar_notes.json'):
-        """
-        Initialize with notes file paths
-        
-        Args:
-            notes_file (str): Path to cultural notes JSON file
-            grammar_file (str): Path to grammar notes JSON file
-        """
-        # Create the data directory if it doesn't exist
-        create_directory_if_not_exists('data')
-        
-        # Default cultural notes data
-        self.default_cultural_notes = {
-            "countries": [
+# Default cultural notes data, written when data/cultural_notes.json is missing
+DEFAULT_CULTURAL_NOTES = {
+    "countries": [
+        {
+            "name": "Spain",
+            "capital": "Madrid",
+            "language": "Spanish (Castilian)",
+            "dialects": ["Castilian", "Andalusian", "Canarian"],
+            "population": "47 million",
+            "notes": [
                 {
-                    "name": "Spain",
-                    "capital": "Madrid",
-                    "language": "Spanish (Castilian)",
-                    "dialects": ["Castilian", "Andalusian", "Canarian"],
-                    "population": "47 million",
-                    "notes": [
-                        {
-                            "title": "Siesta Tradition",
-                            "content": "The siesta is a short nap taken in the early afternoon, usually after lunch. Traditionally, this break allowed workers to rest during the hottest part of the day. While less common in big cities today, some businesses in smaller towns still close for a few hours in the afternoon."
-                        },
-                        {
-                            "title": "Regional Languages",
-                            "content": "Besides Castilian Spanish, Spain has several co-official regional languages: Catalan, Basque (Euskara), Galician, and Valencian. Each has its own unique history and cultural significance."
-                        },
-                        {
-                            "title": "Tapas Culture",
-                            "content": "Tapas are small portions of food often served with drinks. This dining style encourages socializing and trying many different dishes. The word 'tapa' means 'cover' or 'lid' - one theory suggests they originated as small plates of food used to cover drinks to keep flies away."
-                        }
-                    ],
-                    "pronunciation_differences": "Castilian Spanish is known for its distinctive 'th' sound (the 'z' and soft 'c' are pronounced like the 'th' in 'think')."
+                    "title": "Siesta Tradition",
+                    "content": "The siesta is a short nap taken in the early afternoon, usually after lunch. Traditionally, this break allowed workers to rest during the hottest part of the day. While less common in big cities today, some businesses in smaller towns still close for a few hours in the afternoon."
                 },
                 {
-                    "name": "Mexico",
-                    "capital": "Mexico City",
-                    "language": "Spanish",
-                    "dialects": ["Mexican Spanish"],
-                    "population": "126 million",
-                    "notes": [
-                        {
-                            "title": "Día de los Muertos",
-                            "content": "The Day of the Dead is a celebration held on November 1-2 where families welcome back the souls of deceased relatives. It includes creating colorful altars (ofrendas) with photos, food, and marigold flowers to guide spirits home."
-                        },
-                        {
-                            "title": "Indigenous Influence",
-                            "content": "Mexican Spanish includes many words from indigenous languages, especially Nahuatl. Words like chocolate, tomate, and aguacate (avocado) originated from native languages and were later adopted into global Spanish and English."
-                        },
-                        {
-                            "title": "Regional Cuisine",
-                            "content": "Mexican cuisine varies greatly by region and has been recognized by UNESCO as an Intangible Cultural Heritage of Humanity. From Oaxacan mole to Yucatecan cochinita pibil, each area has distinctive dishes and techniques."
-                        }
-                    ],
-                    "pronunciation_differences": "Mexican Spanish tends to be clear and evenly paced, without the 'th' sound used in Spain. The letter 's' is always pronounced as 's' rather than dropped."
+                    "title": "Regional Languages",
+                    "content": "Besides Castilian Spanish, Spain has several co-official regional languages: Catalan, Basque (Euskara), Galician, and Valencian. Each has its own unique history and cultural significance."
                 },
                 {
-                    "name": "Colombia",
-                    "capital": "Bogotá",
-                    "language": "Spanish",
-                    "dialects": ["Colombian Andean", "Coastal/Caribbean", "Paisa"],
-                    "population": "50 million",
-                    "notes": [
-                        {
-                            "title": "Coffee Culture",
-                            "content": "Colombia is world-famous for its coffee production. The Coffee Growing Axis (Eje Cafetero) is a UNESCO World Heritage site where much of the country's coffee is grown in ideal mountainous conditions."
-                        },
-                        {
-                            "title": "Language Pride",
-                            "content": "Colombian Spanish, particularly from Bogotá, is often considered one of the clearest and most 'neutral' forms of Spanish. Many call centers and Spanish dubbing studios employ Colombian speakers for their clarity and pronunciation."
-                        },
-                        {
-                            "title": "Literary Heritage",
-                            "content": "Colombia has a rich literary tradition, most famously represented by Gabriel García Márquez, who won the Nobel Prize for Literature in 1982. His novel 'One Hundred Years of Solitude' is considered a masterpiece of magical realism."
-                        }
-                    ],
-                    "pronunciation_differences": "Colombian Spanish is known for its clear pronunciation and melodic intonation. The letter 's' is clearly pronounced rather than aspirated."
+                    "title": "Tapas Culture",
+                    "content": "Tapas are small portions of food often served with drinks. This dining style encourages socializing and trying many different dishes. The word 'tapa' means 'cover' or 'lid' - one theory suggests they originated as small plates of food used to cover drinks to keep flies away."
                 }
-            ]
-        }
-        
-        # Default grammar notes data
-        self.default_grammar_notes = {
-            "topics": [
+            ],
+            "pronunciation_differences": "Castilian Spanish is known for its distinctive 'th' sound (the 'z' and soft 'c' are pronounced like the 'th' in 'think')."
+        },
+        {
+            "name": "Mexico",
+            "capital": "Mexico City",
+            "language": "Spanish",
+            "dialects": ["Mexican Spanish"],
+            "population": "126 million",
+            "notes": [
                 {
-                    "name": "Gender and Articles",
-                    "difficulty": "beginner",
-                    "explanation": "In Spanish, all nouns have a gender (masculine or feminine). The definite articles are 'el' (masculine singular), 'la' (feminine singular), 'los' (masculine plural), and 'las' (feminine plural).",
-                    "examples": [
-                        {"spanish": "el libro", "english": "the book (masculine)"},
-                        {"spanish": "la mesa", "english": "the table (feminine)"},
-                        {"spanish": "los libros", "english": "the books (masculine plural)"},
-                        {"spanish": "las mesas", "english": "the tables (feminine plural)"}
-                    ],
-                    "tips": [
-                        "Most nouns ending in -o are masculine (el libro, el plato).",
-                        "Most nouns ending in -a are feminine (la casa, la silla).",
-                        "There are exceptions! For example: 'el día' (day) is masculine despite ending in -a.",
-                        "Some words use 'el' even when feminine if they start with a stressed 'a' sound: 'el agua' (water) is feminine."
-                    ]
+                    "title": "Día de los Muertos",
+                    "content": "The Day of the Dead is a celebration held on November 1-2 where families welcome back the souls of deceased relatives. It includes creating colorful altars (ofrendas) with photos, food, and marigold flowers to guide spirits home."
                 },
                 {
-                    "name": "Present Tense Conjugation",
-                    "difficulty": "beginner",
-                    "explanation": "Spanish verbs change their endings depending on who is performing the action. This is called conjugation. In the present tense, regular verbs follow predictable patterns based on whether they end in -ar, -er, or -ir.",
-                    "examples": [
-                        {"spanish": "Yo hablo español", "english": "I speak Spanish"},
-                        {"spanish": "Tú hablas español", "english": "You speak Spanish"},
-                        {"spanish": "Él/Ella habla español", "english": "He/She speaks Spanish"},
-                        {"spanish": "Nosotros hablamos español", "english": "We speak Spanish"},
-                        {"spanish": "Vosotros habláis español", "english": "You all speak Spanish (Spain)"},
-                        {"spanish": "Ellos/Ellas hablan español", "english": "They speak Spanish"}
-                    ],
-                    "tips": [
-                        "-AR verbs end with: -o, -as, -a, -amos, -áis, -an",
-                        "-ER verbs end with: -o, -es, -e, -emos, -éis, -en",
-                        "-IR verbs end with: -o, -es, -e, -imos, -ís, -en",
-                        "Many common verbs are irregular and don't follow these patterns (ser, estar, ir, tener)."
-                    ]
+                    "title": "Indigenous Influence",
+                    "content": "Mexican Spanish includes many words from indigenous languages, especially Nahuatl. Words like chocolate, tomate, and aguacate (avocado) originated from native languages and were later adopted into global Spanish and English."
                 },
                 {
-                    "name": "Ser vs. Estar",
-                    "difficulty": "intermediate",
-                    "explanation": "Spanish has two verbs for 'to be': ser and estar. Ser is used for permanent characteristics, identity, origin, and time. Estar is used for temporary conditions, locations, and certain feelings or states.",
-                    "examples": [
-                        {"spanish": "Yo soy estudiante", "english": "I am a student (permanent identity - ser)"},
-                        {"spanish": "Yo estoy cansado", "english": "I am tired (temporary condition - estar)"},
-                        {"spanish": "La casa es grande", "english": "The house is big (permanent characteristic - ser)"},
-                        {"spanish": "La casa está limpia", "english": "The house is clean (state/condition - estar)"}
-                    ],
-                    "tips": [
-                        "Use SER for: Identity, Characteristics, Origin, Time, Relationships, Possession",
-                        "Use ESTAR for: Location, Temporary Conditions, Ongoing Actions (with present participle)",
-                        "Some adjectives change meaning depending on whether they're used with ser or estar!",
-                        "Example: 'Ser aburrido' = to be boring (personality), 'Estar aburrido' = to be bored (feeling)"
-                    ]
+                    "title": "Regional Cuisine",
+                    "content": "Mexican cuisine varies greatly by region and has been recognized by UNESCO as an Intangible Cultural Heritage of Humanity. From Oaxacan mole to Yucatecan cochinita pibil, each area has distinctive dishes and techniques."
                 }
+            ],
+            "pronunciation_differences": "Mexican Spanish tends to be clear and evenly paced, without the 'th' sound used in Spain. The letter 's' is always pronounced as 's' rather than dropped."
+        },
+        {
+            "name": "Colombia",
+            "capital": "Bogotá",
+            "language": "Spanish",
+            "dialects": ["Colombian Andean", "Coastal/Caribbean", "Paisa"],
+            "population": "50 million",
+            "notes": [
+                {
+                    "title": "Coffee Culture",
+                    "content": "Colombia is world-famous for its coffee production. The Coffee Growing Axis (Eje Cafetero) is a UNESCO World Heritage site where much of the country's coffee is grown in ideal mountainous conditions."
+                },
+                {
+                    "title": "Language Pride",
+                    "content": "Colombian Spanish, particularly from Bogotá, is often considered one of the clearest and most 'neutral' forms of Spanish. Many call centers and Spanish dubbing studios employ Colombian speakers for their clarity and pronunciation."
+                },
+                {
+                    "title": "Literary Heritage",
+                    "content": "Colombia has a rich literary tradition, most famously represented by Gabriel García Márquez, who won the Nobel Prize for Literature in 1982. His novel 'One Hundred Years of Solitude' is considered a masterpiece of magical realism."
+                }
+            ],
+            "pronunciation_differences": "Colombian Spanish is known for its clear pronunciation and melodic intonation. The letter 's' is clearly pronounced rather than aspirated."
+        }
+    ]
+}
+
+# Default grammar notes data, written when data/grammar_notes.json is missing
+DEFAULT_GRAMMAR_NOTES = {
+    "topics": [
+        {
+            "name": "Gender and Articles",
+            "difficulty": "beginner",
+            "explanation": "In Spanish, all nouns have a gender (masculine or feminine). The definite articles are 'el' (masculine singular), 'la' (feminine singular), 'los' (masculine plural), and 'las' (feminine plural).",
+            "examples": [
+                {"spanish": "el libro", "english": "the book (masculine)"},
+                {"spanish": "la mesa", "english": "the table (feminine)"},
+                {"spanish": "los libros", "english": "the books (masculine plural)"},
+                {"spanish": "las mesas", "english": "the tables (feminine plural)"}
+            ],
+            "tips": [
+                "Most nouns ending in -o are masculine (el libro, el plato).",
+                "Most nouns ending in -a are feminine (la casa, la silla).",
+                "There are exceptions! For example: 'el día' (day) is masculine despite ending in -a.",
+                "Some words use 'el' even when feminine if they start with a stressed 'a' sound: 'el agua' (water) is feminine."
+            ]
+        },
+        {
+            "name": "Present Tense Conjugation",
+            "difficulty": "beginner",
+            "explanation": "Spanish verbs change their endings depending on who is performing the action. This is called conjugation. In the present tense, regular verbs follow predictable patterns based on whether they end in -ar, -er, or -ir.",
+            "examples": [
+                {"spanish": "Yo hablo español", "english": "I speak Spanish"},
+                {"spanish": "Tú hablas español", "english": "You speak Spanish"},
+                {"spanish": "Él/Ella habla español", "english": "He/She speaks Spanish"},
+                {"spanish": "Nosotros hablamos español", "english": "We speak Spanish"},
+                {"spanish": "Vosotros habláis español", "english": "You all speak Spanish (Spain)"},
+                {"spanish": "Ellos/Ellas hablan español", "english": "They speak Spanish"}
+            ],
+            "tips": [
+                "-AR verbs end with: -o, -as, -a, -amos, -áis, -an",
+                "-ER verbs end with: -o, -es, -e, -emos, -éis, -en",
+                "-IR verbs end with: -o, -es, -e, -imos, -ís, -en",
+                "Many common verbs are irregular and don't follow these patterns (ser, estar, ir, tener)."
+            ]
+        },
+        {
+            "name": "Ser vs. Estar",
+            "difficulty": "intermediate",
+            "explanation": "Spanish has two verbs for 'to be': ser and estar. Ser is used for permanent characteristics, identity, origin, and time. Estar is used for temporary conditions, locations, and certain feelings or states.",
+            "examples": [
+                {"spanish": "Yo soy estudiante", "english": "I am a student (permanent identity - ser)"},
+                {"spanish": "Yo estoy cansado", "english": "I am tired (temporary condition - estar)"},
+                {"spanish": "La casa es grande", "english": "The house is big (permanent characteristic - ser)"},
+                {"spanish": "La casa está limpia", "english": "The house is clean (state/condition - estar)"}
+            ],
+            "tips": [
+                "Use SER for: Identity, Characteristics, Origin, Time, Relationships, Possession",
+                "Use ESTAR for: Location, Temporary Conditions, Ongoing Actions (with present participle)",
+                "Some adjectives change meaning depending on whether they're used with ser or estar!",
+                "Example: 'Ser aburrido' = to be boring (personality), 'Estar aburrido' = to be bored (feeling)"
             ]
         }
+    ]
+}
+
+class CulturalNotesManager:
+    """
+    Manages cultural notes and grammar explanations
+
+    Nothing is read when the manager is created. Menus and lookups by name
+    go through per-country and per-topic shards (see ShardedNotes), so
+    opening one country reads one small file; the `cultural_notes` and
+    `grammar_notes` documents are parsed only when something needs them
+    whole.
+    """
+    
+    def __init__(self, notes_file='data/cultural_notes.json', grammar_file='data/grammar_notes.json'):
+        """
+        Initialize with notes file paths
         
-        # Load cultural notes
-        if os.path.exists(notes_file):
-            self.cultural_notes = load_json_data(notes_file)
-        else:
-            self.cultural_notes = self.default_cultural_notes
-            save_json_data(self.cultural_notes, notes_file)
-        
-        # Load grammar notes
-        if os.path.exists(grammar_file):
-            self.grammar_notes = load_json_data(grammar_file)
-        else:
-            self.grammar_notes = self.default_grammar_notes
-            save_json_data(self.grammar_notes, grammar_file)
+        Args:
+            notes_file (str): Path to cultural notes JSON file
+            grammar_file (str): Path to grammar notes JSON file
+        """
+        # Create the data directory if it doesn't exist
+        create_directory_if_not_exists(os.path.dirname(notes_file) or '.')
         
+        self.default_cultural_notes = DEFAULT_CULTURAL_NOTES
+        self.default_grammar_notes = DEFAULT_GRAMMAR_NOTES
         self.notes_file = notes_file
         self.grammar_file = grammar_file
+        
+        self._countries = ShardedNotes(notes_file, 'countries', DEFAULT_CULTURAL_NOTES)
+        self._topics = ShardedNotes(grammar_file, 'topics', DEFAULT_GRAMMAR_NOTES, summary_fields=('difficulty',))
+        self.search_index_file = os.path.join(os.path.dirname(notes_file), '.notes_search_index.json')
+        self._search_index = None
+    
+    @property
+    def cultural_notes(self):
+        """The whole cultural notes document, loaded on first use"""
+        return self._countries.document()
+    
+    @property
+    def grammar_notes(self):
+        """The whole grammar notes document, loaded on first use"""
+        return self._topics.document()
     
     def get_countries(self):
         """Get list of all countries"""
@@ -178,27 +190,71 @@ class CulturalNotesManager:
         """Get list of all grammar topics"""
         return self.grammar_notes['topics']
     
+    def get_country_names(self):
+        """Get the names of all countries without loading their notes"""
+        return [entry['name'] for entry in self._countries.entries()]
+    
+    def get_grammar_topic_summaries(self):
+        """Get the name and difficulty of each grammar topic without loading them"""
+        return self._topics.entries()
+    
     def get_country_by_name(self, name):
-        """Get a country by name"""
-        for country in self.cultural_notes['countries']:
-            if country['name'].lower() == name.lower():
-                return country
-        return None
+        """Get a country by name, ignoring accents and case"""
+        return self._countries.get(name)
     
     def get_grammar_by_name(self, name):
-        """Get a grammar topic by name"""
-        for topic in self.grammar_notes['topics']:
-            if topic['name'].lower() == name.lower():
-                return topic
-        return None
+        """Get a grammar topic by name, ignoring accents and case"""
+        return self._topics.get(name)
+    
+    def get_search_index(self):
+        """
+        Get the notes search index, loading it on first use and re-indexing
+        the countries or topics that changed since it was saved
+        
+        Returns:
+            NotesSearchIndex: The up-to-date index
+        """
+        if self._search_index is None:
+            self._search_index = NotesSearchIndex.load(self.search_index_file)
+        
+        index = self._search_index
+        for notes, kind, split in ((self._countries, 'cultural', country_documents),
+                                   (self._topics, 'grammar', topic_documents)):
+            if not index.is_current(notes.source_file):
+                index.update_source(notes.source_file, kind, notes.all(), split)
+        index.save()
+        
+        return index
+    
+    def search_notes(self, query, limit=10, kind=None):
+        """
+        Search cultural notes and grammar explanations, examples and tips
+        
+        Args:
+            query (str): Words to search for; accents and case are ignored
+            limit (int, optional): Maximum number of results
+            kind (str, optional): Only 'cultural' or 'grammar' results
+            
+        Returns:
+            list: Best matches first, each with 'kind', 'source' (country or
+                topic name), 'title', 'section', 'snippet' and 'score'
+        """
+        results = []
+        for result in self.get_search_index().search(query, limit, kind):
+            if result['kind'] == 'cultural':
+                item, split = self._countries.get(result['source']), country_documents
+            else:
+                item, split = self._topics.get(result['source']), topic_documents
+            result = describe_result(result, item, split) if item else None
+            if result:
+                results.append(result)
+        
+        return results
     
     def get_random_cultural_note(self):
         """Get a random cultural note"""
-        if not self.cultural_notes['countries']:
-            return None
-        
-        country = random.choice(self.cultural_notes['countries'])
-        if not country['notes']:
+        country = self._countries.random()
+        if not country or not country['notes']:
             return None
         
         note = random.choice(country['notes'])
@@ -210,11 +266,8 @@ class CulturalNotesManager:
     
     def get_random_grammar_tip(self):
         """Get a random grammar tip"""
-        if not self.grammar_notes['topics']:
-            return None
-        
-        topic = random.choice(self.grammar_notes['topics'])
-        if not topic['tips']:
+        topic = self._topics.random()
+        if not topic or not topic['tips']:
             return None
         
         tip = random.choice(topic['tips'])
@@ -277,20 +330,21 @@ class CulturalNotesManager:
             print("\n🇪🇸  CULTURAL NOTES  🇪🇸\n")
             print("Learn about Spanish-speaking countries and cultures:\n")
             
+            countries = self.get_country_names()
             print("Countries:")
-            for i, country in enumerate(self.cultural_notes['countries'], 1):
-                print(f"{i}. {country['name']}")
+            for i, country_name in enumerate(countries, 1):
+                print(f"{i}. {country_name}")
             
-            print(f"\n{len(self.cultural_notes['countries']) + 1}. Return to Main Menu")
+            print(f"\n{len(countries) + 1}. Return to Main Menu")
             
             try:
                 choice = int(input("\nEnter your choice: "))
                 
-                if choice == len(self.cultural_notes['countries']) + 1:
+                if choice == len(countries) + 1:
                     return
                 
-                if 1 <= choice <= len(self.cultural_notes['countries']):
-                    self.display_country_notes(self.cultural_notes['countries'][choice - 1]['name'])
+                if 1 <= choice <= len(countries):
+                    self.display_country_notes(countries[choice - 1])
                 else:
                     print("\nInvalid choice. Please try again.")
                     input("\nPress Enter to continue...")
@@ -301,24 +355,24 @@ class CulturalNotesManager:
     
     def browse_grammar_notes(self):
         """Interactive browser for grammar notes"""
+        # Group topics by difficulty once; the menu shows them on every pass
+        beginner_topics = []
+        intermediate_topics = []
+        advanced_topics = []
+        
+        for topic in self.get_grammar_topic_summaries():
+            if topic['difficulty'] == 'beginner':
+                beginner_topics.append(topic)
+            elif topic['difficulty'] == 'intermediate':
+                intermediate_topics.append(topic)
+            else:
+                advanced_topics.append(topic)
+        
         while True:
             clear_screen()
             print("\n🇪🇸  GRAMMAR NOTES  🇪🇸\n")
             print("Learn about Spanish grammar:\n")
             
-            # Group topics by difficulty
-            beginner_topics = []
-            intermediate_topics = []
-            advanced_topics = []
-            
-            for topic in self.grammar_notes['topics']:
-                if topic['difficulty'] == 'beginner':
-                    beginner_topics.append(topic)
-                elif topic['difficulty'] == 'intermediate':
-                    intermediate_topics.append(topic)
-                else:
-                    advanced_topics.append(topic)
-            
             print("Beginner Topics:")
             for i, topic in enumerate(beginner_topics, 1):
                 print(f"{i}. {topic['name']}")
@@ -0,0 +1,189 @@
+"""
+Spanish Learning Chatbot - Distractor Engine
+This module picks the wrong answers shown alongside quiz questions
+"""
+
+import random
+
+# Placeholder wrong answers for categories with fewer than four distinct answers
+PLACEHOLDER_ENGLISH = ["apple", "house", "car", "book", "tree", "dog", "cat"]
+PLACEHOLDER_SPANISH = ["manzana", "casa", "coche", "libro", "árbol", "perro", "gato"]
+
+# Random draws per distractor before falling back to scanning the pool
+MAX_SAMPLE_TRIES = 16
+
+# Share of distractors taken from confusable words when preferred
+CONFUSABLE_SHARE = 2 / 3
+
+
+class DistractorEngine:
+    """
+    Samples distinct wrong answers for quiz questions
+
+    Candidate pools (a category's words, optionally of one difficulty) are
+    built once and reused, and distractors are drawn from them by random
+    index with rejection of repeats, so a question costs O(1) expected time
+    whatever the category size. Pools are rebuilt when a category gains or
+    loses words; answers are read from the word dicts at sampling time, so
+    edited words are picked up as they are.
+
+    With `prefer_confusables`, most distractors come from words that look
+    like the correct answer: the same part of speech (when words have a
+    'part_of_speech'), the same first two letters or the same ending.
+    """
+
+    def __init__(self, prefer_confusables=False):
+        """
+        Initialize an empty engine
+
+        Args:
+            prefer_confusables (bool, optional): Prefer distractors similar
+                to the correct answer
+        """
+        self.prefer_confusables = prefer_confusables
+        self._pools = {}
+        self._confusables = {}
+
+    @staticmethod
+    def _answer_key(direction):
+        """Get the word field that holds answers for a quiz direction"""
+        return 'english' if direction == 1 else 'spanish'
+
+    @staticmethod
+    def _similarity_keys(word, answer_key):
+        """Get the confusable buckets a word belongs to"""
+        text = word[answer_key].lower()
+        keys = []
+
+        if word.get('part_of_speech'):
+            keys.append(("pos", word['part_of_speech']))
+        if len(text) >= 3:
+            keys.append(("start", text[:2]))
+            keys.append(("end", text[-2:]))
+
+        return keys
+
+    def _pool(self, category, difficulty=None):
+        """Get the cached candidate list for a category and difficulty"""
+        key = (category['name'], difficulty)
+        entry = self._pools.get(key)
+
+        if entry is None or entry[0] is not category or entry[1] != len(category['words']):
+            if difficulty is None:
+                words = list(category['words'])
+            else:
+                words = [w for w in category['words'] if w.get('difficulty') == difficulty]
+            entry = (category, len(category['words']), words)
+            self._pools[key] = entry
+            self._confusables.pop(key + ('english',), None)
+            self._confusables.pop(key + ('spanish',), None)
+
+        return entry[2]
+
+    def _confusable_index(self, category, difficulty, answer_key):
+        """Get the similarity buckets of a pool, building them on first use"""
+        pool = self._pool(category, difficulty)
+        key = (category['name'], difficulty, answer_key)
+        index = self._confusables.get(key)
+
+        if index is None:
+            index = {}
+            for word in pool:
+                for bucket in self._similarity_keys(word, answer_key):
+                    index.setdefault(bucket, []).append(word)
+            self._confusables[key] = index
+
+        return index
+
+    def invalidate(self, category_name=None):
+        """
+        Drop cached pools, e.g. after words were edited in place
+
+        Args:
+            category_name (str, optional): Only drop this category's pools
+        """
+        if category_name is None:
+            self._pools.clear()
+            self._confusables.clear()
+            return
+
+        for cache in (self._pools, self._confusables):
+            for key in [key for key in cache if key[0] == category_name]:
+                del cache[key]
+
+    @staticmethod
+    def _draw(pick, answer_key, taken, count):
+        """Draw up to `count` answers from pick() that aren't taken yet"""
+        drawn = []
+        tries = 0
+
+        while len(drawn) < count and tries < MAX_SAMPLE_TRIES * count:
+            tries += 1
+            answer = pick()[answer_key]
+            if answer not in taken:
+                taken.add(answer)
+                drawn.append(answer)
+
+        return drawn
+
+    def sample(self, category, word, direction, count=3, difficulty=None, rng=random):
+        """
+        Pick distinct wrong answers for a question
+
+        Args:
+            category (dict): The category the word is quizzed from
+            word (dict): The word being asked about
+            direction (int): 1 for Spanish->English, 2 for English->Spanish
+            count (int, optional): Number of wrong answers
+            difficulty (str, optional): Prefer words of this difficulty
+            rng (random.Random, optional): Random source
+
+        Returns:
+            list: `count` answers, none equal to the correct one
+        """
+        answer_key = self._answer_key(direction)
+        taken = {word[answer_key]}
+        options = []
+
+        pool = self._pool(category, difficulty) if difficulty is not None else []
+        if len(pool) <= count:
+            difficulty = None
+            pool = self._pool(category)
+
+        if not pool:
+            pool = [word]
+            difficulty = None
+
+        if self.prefer_confusables:
+            index = self._confusable_index(category, difficulty, answer_key)
+            buckets = [index[key] for key in self._similarity_keys(word, answer_key) if key in index]
+            if buckets:
+                def pick_similar():
+                    bucket = buckets[rng.randrange(len(buckets))]
+                    return bucket[rng.randrange(len(bucket))]
+                options.extend(self._draw(pick_similar, answer_key, taken, round(count * CONFUSABLE_SHARE)))
+
+        options.extend(self._draw(lambda: pool[rng.randrange(len(pool))], answer_key, taken, count - len(options)))
+
+        # Few distinct answers left: scan the pool (then the whole category)
+        # from a random point
+        fallback_pools = [pool] if difficulty is None else [pool, self._pool(category)]
+        for candidates in fallback_pools:
+            if len(options) == count:
+                break
+            start = rng.randrange(len(candidates))
+            for i in range(len(candidates)):
+                answer = candidates[(start + i) % len(candidates)][answer_key]
+                if answer not in taken:
+                    taken.add(answer)
+                    options.append(answer)
+                    if len(options) == count:
+                        break
+
+        # Not enough words in this category: use placeholders
+        if len(options) < count:
+            placeholders = PLACEHOLDER_ENGLISH if direction == 1 else PLACEHOLDER_SPANISH
+            unused = [p for p in placeholders if p not in taken]
+            options.extend(rng.sample(unused, min(count - len(options), len(unused))))
+
+        return options
@@ -0,0 +1,309 @@
+"""
+Spanish Learning Chatbot - Learning Engine
+This module contains the headless learning engine behind the chatbot.
+It owns the vocabulary, dialogues and learning subsystems and hands out
+sessions that never read input or print, so the CLI, a server or a test
+harness can all drive the same learning logic.
+"""
+
+import random
+from src.utils import load_json_cached
+from src.sessions import FlashcardSession, QuizSession, DialogueSession
+from src.vocabulary_search import VocabularySearch
+from src.word_view import WordView
+
+
+class LearningEngine:
+    """Non-interactive API for all learning activities"""
+
+    def __init__(self, user_profile=None, vocabulary_manager=None, dialogues=None,
+                 cultural_notes=None, rng=None):
+        """
+        Initialize the engine
+
+        Subsystems that aren't passed in are built on first use, so creating
+        an engine reads no data files. The word of the day is picked once
+        the vocabulary is loaded.
+
+        Args:
+            user_profile (UserProfile, optional): User profile for tracking progress
+            vocabulary_manager (VocabularyManager, optional): Vocabulary to use
+                (defaults to loading data/vocabulary.json)
+            dialogues (dict, optional): Dialogue data (defaults to loading data/dialogues.json)
+            cultural_notes (CulturalNotesManager, optional): Cultural and grammar notes
+            rng (random.Random, optional): Random source for sessions, e.g. a
+                seeded one for reproducible runs
+        """
+        self.user_profile = user_profile
+        self.random = rng or random
+        self._vocabulary_manager = None
+        self._dialogues = dialogues
+        self._quiz_system = None
+        self._spaced_repetition = None
+        self._cultural_notes = cultural_notes
+        self._custom_index = None
+        self._custom_index_size = None
+
+        if vocabulary_manager is not None:
+            self._set_vocabulary_manager(vocabulary_manager)
+
+    def _set_vocabulary_manager(self, vocabulary_manager):
+        """Use a loaded vocabulary and set the word of the day if needed"""
+        self._vocabulary_manager = vocabulary_manager
+
+        # Check for word of the day if user profile exists
+        if self.user_profile and self.user_profile.current_profile:
+            # Set word of day if not already set today
+            if not self.user_profile.get_word_of_day():
+                vocabulary_manager.get_word_of_day(self.user_profile)
+
+    @property
+    def vocabulary_manager(self):
+        """VocabularyManager, loading data/vocabulary.json on first use"""
+        if self._vocabulary_manager is None:
+            from src.vocabulary_manager import VocabularyManager
+            self._set_vocabulary_manager(VocabularyManager())
+        return self._vocabulary_manager
+
+    @property
+    def vocabulary(self):
+        """Vocabulary data with a 'categories' list"""
+        return self.vocabulary_manager.vocabulary
+
+    @property
+    def dialogues(self):
+        """Dialogue data, loading data/dialogues.json on first use"""
+        if self._dialogues is None:
+            self._dialogues = load_json_cached('data/dialogues.json')
+        return self._dialogues
+
+    @property
+    def quiz_system(self):
+        """QuizSystem over the vocabulary, built on first use"""
+        if self._quiz_system is None:
+            from src.quiz import QuizSystem
+            self._quiz_system = QuizSystem(self.vocabulary_manager, self.user_profile)
+        return self._quiz_system
+
+    @property
+    def spaced_repetition(self):
+        """SpacedRepetitionSystem for the user, built on first use"""
+        if self._spaced_repetition is None:
+            from src.spaced_repetition import SpacedRepetitionSystem
+            self._spaced_repetition = SpacedRepetitionSystem(self.user_profile)
+        return self._spaced_repetition
+
+    @property
+    def cultural_notes(self):
+        """CulturalNotesManager, built on first use"""
+        if self._cultural_notes is None:
+            from src.cultural_notes import CulturalNotesManager
+            self._cultural_notes = CulturalNotesManager()
+        return self._cultural_notes
+
+    def _require_category(self, category_name):
+        """Get a category by name or raise KeyError"""
+        category = self.vocabulary_manager.get_category_by_name(category_name)
+        if category is None:
+            raise KeyError(f"Unknown category: {category_name}")
+        return category
+
+    def list_categories(self):
+        """
+        List vocabulary categories
+
+        Returns:
+            list: Dicts with 'name', 'display_name' and 'word_count'
+        """
+        return [
+            {
+                "name": category['name'],
+                "display_name": category['display_name'],
+                "word_count": len(category['words'])
+            }
+            for category in self.vocabulary_manager.get_categories()
+        ]
+
+    def get_category_words(self, category_name, difficulty=None):
+        """
+        Get the words of a category with the user's mastery levels
+
+        Args:
+            category_name (str): Category name
+            difficulty (str, optional): Only include words of this difficulty
+
+        Returns:
+            list: WordViews of the words, each with a 'mastery_level'
+                (None without a profile)
+        """
+        category = self._require_category(category_name)
+        has_profile = self.user_profile and self.user_profile.current_profile
+
+        words = []
+        for word in self.quiz_system.filter_words(category, difficulty):
+            if has_profile:
+                mastery = self.user_profile.get_mastery_level(word['spanish'], category['name'])
+            else:
+                mastery = None
+            words.append(WordView(word, extra={"mastery_level": mastery}))
+
+        return words
+
+    def search_vocabulary(self, query, limit=10):
+        """
+        Search the vocabulary and the user's custom words
+
+        Args:
+            query (str): Spanish or English text; accents and case are
+                ignored and typos tolerated
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching words with 'spanish', 'english', 'category_name',
+                'category_display' and 'source' ('vocabulary' or 'custom')
+        """
+        results = self.vocabulary_manager.search_words(query, limit)
+
+        if self.user_profile and self.user_profile.current_profile:
+            custom_words = self.user_profile.get_custom_words()
+
+            # Custom words are few; rebuild their index when one is added
+            if self._custom_index is None or self._custom_index_size != len(custom_words):
+                self._custom_index = VocabularySearch.from_vocabulary({"categories": []}, custom_words)
+                self._custom_index_size = len(custom_words)
+
+            seen = {(result['spanish'], result['english']) for result in results}
+            for result in self._custom_index.search(query, limit):
+                if (result['spanish'], result['english']) not in seen and len(results) < limit:
+                    seen.add((result['spanish'], result['english']))
+                    results.append(result)
+
+        return results
+
+    def search_notes(self, query, limit=10, kind=None):
+        """
+        Search cultural notes and grammar explanations, examples and tips
+
+        Args:
+            query (str): Words to search for; accents and case are ignored
+            limit (int, optional): Maximum number of results
+            kind (str, optional): Only 'cultural' or 'grammar' results
+
+        Returns:
+            list: Best matches first, each with 'kind', 'source', 'title',
+                'section', 'snippet' and 'score'
+        """
+        return self.cultural_notes.search_notes(query, limit, kind)
+
+    def start_flashcards(self, category_name):
+        """
+        Start a flashcard session over a whole category in random order
+
+        Args:
+            category_name (str): Category name
+
+        Returns:
+            FlashcardSession: The session
+        """
+        category = self._require_category(category_name)
+        words = category['words'].copy()
+        self.random.shuffle(words)
+        return FlashcardSession(words, self.user_profile, category, self.random)
+
+    def start_spaced_repetition(self, limit=None):
+        """
+        Start a flashcard session over the words due for review
+
+        Args:
+            limit (int, optional): Maximum number of due words to include
+
+        Returns:
+            FlashcardSession: The session, or None if no words are available
+        """
+        return self.spaced_repetition.create_session(self.vocabulary_manager, limit, self.random)
+
+    def start_quiz(self, category_name, num_questions=5, direction=1, difficulty=None):
+        """
+        Start a multiple-choice quiz
+
+        If no words match `difficulty`, the quiz uses all words of the
+        category, like the CLI does.
+
+        Args:
+            category_name (str): Category name
+            num_questions (int): Number of questions, capped at the number of words
+            direction (int): 1 for Spanish->English, 2 for English->Spanish
+            difficulty (str, optional): Only quiz words of this difficulty
+
+        Returns:
+            QuizSession: The session, or None if there are no questions to ask
+        """
+        category = self._require_category(category_name)
+
+        category_words = self.quiz_system.filter_words(category, difficulty)
+        if not category_words:
+            category_words = category['words']
+            difficulty = None
+        num_questions = min(num_questions, len(category_words))
+        if num_questions < 1:
+            return None
+
+        return QuizSession(self.quiz_system, category, category_words, num_questions, direction,
+                           self.random, difficulty)
+
+    def list_dialogues(self):
+        """
+        List available dialogues
+
+        Returns:
+            list: Dicts with 'index', 'title' and 'difficulty'
+        """
+        return [
+            {"index": i, "title": dialogue['title'], "difficulty": dialogue['difficulty']}
+            for i, dialogue in enumerate(self.dialogues['dialogues'])
+        ]
+
+    def start_dialogue(self, index):
+        """
+        Start practicing a dialogue
+
+        Args:
+            index (int): Position of the dialogue in list_dialogues()
+
+        Returns:
+            DialogueSession: The session
+
+        Raises:
+            IndexError: If there is no dialogue at that position
+        """
+        if index < 0:
+            raise IndexError(f"No dialogue at position {index}")
+        return DialogueSession(self.dialogues['dialogues'][index], self.user_profile)
+
+    def get_word_of_day(self):
+        """
+        Get the word of the day
+
+        Today's word, once picked, is read from the profile without loading
+        the vocabulary.
+
+        Returns:
+            dict: Word of the day data, or None if there is no vocabulary
+        """
+        if self.user_profile and self.user_profile.current_profile:
+            word_of_day = self.user_profile.get_word_of_day()
+            if word_of_day:
+                return word_of_day
+        return self.vocabulary_manager.get_word_of_day(self.user_profile)
+
+    def get_statistics(self):
+        """
+        Get the user's statistics
+
+        Returns:
+            dict: Statistics, or None if no profile is loaded
+        """
+        if not self.user_profile:
+            return None
+
+        return self.user_profile.get_statistics()
@@ -0,0 +1,355 @@
+"""
+Spanish Learning Chatbot - Metrics
+This module provides lightweight counters, histograms and timers for the
+hot paths, exportable as a text snapshot or in Prometheus exposition format
+
+Metrics are registered once, at import time, and cost a single flag check
+per use while collection is disabled, which is the default:
+
+    @metrics.timer("profile_save_seconds", "Time spent saving profiles")
+    def save_current_profile(self): ...
+
+    with metrics.timer("quiz_build_seconds").time():
+        ...
+
+    metrics.enable()
+    print(metrics.render_text())
+"""
+
+import time
+import bisect
+import functools
+import threading
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "chatbot_"
+
+# Upper bounds, in seconds, of the default timer buckets
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Counter:
+    """A count that only goes up"""
+
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text):
+        """
+        Initialize a counter at zero
+
+        Args:
+            registry (MetricsRegistry): Registry whose switch it follows
+            name (str): Metric name
+            help_text (str): One-line description
+        """
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Set the count back to zero"""
+        self.value = 0
+
+    def inc(self, amount=1):
+        """
+        Add to the count while collection is enabled
+
+        Args:
+            amount (int, optional): How much to add
+        """
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram
+
+        Args:
+            registry (MetricsRegistry): Registry whose switch it follows
+            name (str): Metric name
+            help_text (str): One-line description
+            buckets (tuple, optional): Ascending bucket upper bounds
+        """
+        self.registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every observation"""
+        self.counts = [0] * (len(self.buckets) + 1)  # The last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """
+        Record a value while collection is enabled
+
+        Args:
+            value (float): The observed value
+        """
+        if not self.registry.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile from the buckets
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Upper bound of the bucket holding the quantile (the
+                largest value seen for the +Inf bucket), or 0.0 if empty
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Timing:
+    """Times one `with` block into a timer"""
+
+    __slots__ = ("timer", "start")
+
+    def __init__(self, timer):
+        self.timer = timer
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timer.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NoTiming:
+    """Stands in for _Timing while collection is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_TIMING = _NoTiming()
+
+
+class Timer(Histogram):
+    """
+    Histogram of durations in seconds
+
+    Use time() as a context manager, or the timer itself as a function
+    decorator.
+    """
+
+    def time(self):
+        """
+        Time a `with` block
+
+        Returns:
+            A context manager that records the block's duration
+        """
+        return _Timing(self) if self.registry.enabled else _NO_TIMING
+
+    def __call__(self, function):
+        """Decorate a function so every call is timed"""
+        registry = self.registry
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - start)
+
+        return wrapper
+
+
+class MetricsRegistry:
+    """Named metrics, switched on and off together"""
+
+    def __init__(self, enabled=False):
+        """
+        Initialize an empty registry
+
+        Args:
+            enabled (bool, optional): Start collecting right away
+        """
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, help_text, *args):
+        """Get a metric by name, creating it on first use"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(self, name, help_text, *args)
+                self._metrics[name] = metric
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text=""):
+        """
+        Get or create a counter
+
+        Args:
+            name (str): Metric name, e.g. 'profile_saves_total'
+            help_text (str, optional): One-line description
+
+        Returns:
+            Counter: The counter
+        """
+        return self._register(Counter, name, help_text)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        """
+        Get or create a histogram
+
+        Args:
+            name (str): Metric name
+            help_text (str, optional): One-line description
+            buckets (tuple, optional): Ascending bucket upper bounds
+
+        Returns:
+            Histogram: The histogram
+        """
+        return self._register(Histogram, name, help_text, buckets)
+
+    def timer(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        """
+        Get or create a timer
+
+        Args:
+            name (str): Metric name, e.g. 'json_load_seconds'
+            help_text (str, optional): One-line description
+            buckets (tuple, optional): Ascending bucket upper bounds in seconds
+
+        Returns:
+            Timer: The timer
+        """
+        return self._register(Timer, name, help_text, buckets)
+
+    def enable(self):
+        """Start collecting"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting, keeping what was collected so far"""
+        self.enabled = False
+
+    def reset(self):
+        """Zero every metric"""
+        for metric in list(self._metrics.values()):
+            with metric._lock:
+                metric.reset()
+
+    def snapshot(self):
+        """
+        Get the current values
+
+        Returns:
+            dict: Metric name -> {'kind': 'counter', 'value'} or
+                {'kind': 'histogram'/'timer', 'count', 'sum', 'max', 'p50', 'p95'}
+        """
+        result = {}
+        for name, metric in sorted(self._metrics.items()):
+            if isinstance(metric, Counter):
+                result[name] = {"kind": metric.kind, "value": metric.value}
+            else:
+                result[name] = {
+                    "kind": "timer" if isinstance(metric, Timer) else metric.kind,
+                    "count": metric.count,
+                    "sum": metric.sum,
+                    "max": metric.max,
+                    "p50": metric.quantile(0.5),
+                    "p95": metric.quantile(0.95)
+                }
+        return result
+
+    def render_text(self):
+        """
+        Render a human-readable snapshot, one metric per line
+
+        Returns:
+            str: The snapshot
+        """
+        lines = []
+        for name, values in self.snapshot().items():
+            if values["kind"] == "counter":
+                lines.append(f"{name:<40} {values['value']}")
+            elif values["kind"] == "timer":
+                mean = values["sum"] / values["count"] if values["count"] else 0.0
+                lines.append(f"{name:<40} count={values['count']} total={values['sum']:.3f}s "
+                             f"mean={mean * 1000:.2f}ms p95<={values['p95'] * 1000:.2f}ms "
+                             f"max={values['max'] * 1000:.2f}ms")
+            else:
+                lines.append(f"{name:<40} count={values['count']} sum={values['sum']:g} "
+                             f"p50<={values['p50']:g} p95<={values['p95']:g} max={values['max']:g}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def render_prometheus(self):
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: The exposition
+        """
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            full_name = METRIC_PREFIX + name
+            if metric.help_text:
+                lines.append(f"# HELP {full_name} {metric.help_text}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+
+            if isinstance(metric, Counter):
+                lines.append(f"{full_name} {metric.value}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip(metric.buckets, metric.counts):
+                cumulative += count
+                lines.append(f'{full_name}_bucket{{le="{bound:g}"}} {cumulative}')
+            lines.append(f'{full_name}_bucket{{le="+Inf"}} {metric.count}')
+            lines.append(f"{full_name}_sum {metric.sum!r}")
+            lines.append(f"{full_name}_count {metric.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+# Process-wide registry used by the instrumented modules
+metrics = MetricsRegistry()
@@ -0,0 +1,172 @@
+"""
+Spanish Learning Chatbot - Note Shards
+This module splits a notes document (countries or grammar topics) into one
+small file per entry, so a single entry can be read without parsing them all
+"""
+
+import os
+import json
+import random
+from src.utils import load_json_cached, save_json_data
+from src.vocabulary_search import normalize_text
+
+
+class ShardedNotes:
+    """
+    Lazily loaded list of named note entries backed by per-entry shards
+
+    The source document (e.g. data/cultural_notes.json with a 'countries'
+    list) stays the file people edit. Next to it, a hidden directory holds
+    one compact JSON file per entry plus `index.json`, which lists each
+    entry's name, shard file and a few summary fields, and records the
+    source's mtime and size. When those no longer match, the shards are
+    rebuilt from the source on first use.
+
+    Nothing is read until first use: listing names reads only the index,
+    get() reads one shard, and all() parses the whole source document.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, source_file, list_key, default_data, summary_fields=()):
+        """
+        Initialize without reading anything
+
+        Args:
+            source_file (str): Path to the source JSON document
+            list_key (str): Key of the entry list in the document
+            default_data (dict): Document written when the source is missing
+            summary_fields (tuple, optional): Entry fields copied into the
+                index, for listings that need more than names
+        """
+        self.source_file = source_file
+        self.list_key = list_key
+        self.default_data = default_data
+        self.summary_fields = tuple(summary_fields)
+
+        directory, filename = os.path.split(source_file)
+        self.shard_dir = os.path.join(directory, f".{os.path.splitext(filename)[0]}_shards")
+        self._entries = None
+        self._by_name = None
+        self._signature = None
+
+    def _ensure_source(self):
+        """Write the default document if the source file is missing"""
+        if not os.path.exists(self.source_file):
+            save_json_data(self.default_data, self.source_file)
+
+    def _load_index(self):
+        """Get the index entries, rebuilding the shards if the source changed"""
+        self._ensure_source()
+        stat = os.stat(self.source_file)
+        signature = [stat.st_mtime_ns, stat.st_size]
+
+        if self._entries is not None and signature == self._signature:
+            return self._entries
+
+        index = None
+        try:
+            with open(os.path.join(self.shard_dir, self.INDEX_FILENAME), 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+        if index is None or index.get("source") != signature:
+            index = self._build_shards(signature)
+
+        # Name lookups ignore accents and case; the first entry with a name wins
+        self._by_name = {}
+        for entry in index["entries"]:
+            self._by_name.setdefault(normalize_text(entry["name"]), entry)
+
+        self._entries = index["entries"]
+        self._signature = signature
+        return self._entries
+
+    def _build_shards(self, signature):
+        """
+        Split the source document into shard files and write their index
+
+        If the shard directory can't be created the index is only kept in
+        memory and entries are read from the source document.
+        """
+        entries = []
+        items = load_json_cached(self.source_file)[self.list_key]
+        try:
+            os.makedirs(self.shard_dir, exist_ok=True)
+            writable = True
+        except OSError:
+            writable = False
+
+        for position, item in enumerate(items):
+            entry = {"name": item["name"], "file": f"{position:04d}.json", "position": position}
+            for field in self.summary_fields:
+                entry[field] = item.get(field)
+            entries.append(entry)
+            if writable:
+                save_json_data(item, os.path.join(self.shard_dir, entry["file"]), compact=True)
+
+        index = {"source": signature, "entries": entries}
+        if writable:
+            save_json_data(index, os.path.join(self.shard_dir, self.INDEX_FILENAME), compact=True)
+        return index
+
+    def _load_shard(self, entry):
+        """Read one entry from its shard, or from the source if it's missing"""
+        shard_path = os.path.join(self.shard_dir, entry["file"])
+        if os.path.exists(shard_path):
+            return load_json_cached(shard_path)
+        return self.all()[entry["position"]]
+
+    def entries(self):
+        """
+        Get the index entries without reading any shard
+
+        Returns:
+            list: Dicts with each entry's 'name' and summary fields
+        """
+        return self._load_index()
+
+    def get(self, name):
+        """
+        Get one entry by name, ignoring accents and case
+
+        Args:
+            name (str): Entry name
+
+        Returns:
+            dict: The entry, or None if there is none with that name
+        """
+        self._load_index()
+        entry = self._by_name.get(normalize_text(name))
+        return self._load_shard(entry) if entry else None
+
+    def random(self):
+        """
+        Get a random entry
+
+        Returns:
+            dict: The entry, or None if there are none
+        """
+        entries = self._load_index()
+        return self._load_shard(random.choice(entries)) if entries else None
+
+    def all(self):
+        """
+        Get every entry, parsing the whole source document
+
+        Returns:
+            list: The source document's entry list
+        """
+        self._ensure_source()
+        return load_json_cached(self.source_file)[self.list_key]
+
+    def document(self):
+        """
+        Get the whole source document
+
+        Returns:
+            dict: The parsed source document
+        """
+        self._ensure_source()
+        return load_json_cached(self.source_file)
@@ -0,0 +1,367 @@
+"""
+Spanish Learning Chatbot - Notes Search
+This module provides a persistent full-text index over cultural and grammar
+notes, ranked with BM25
+"""
+
+import os
+import json
+import math
+import heapq
+import bisect
+import hashlib
+from collections import Counter
+from src.utils import save_json_data
+from src.vocabulary_search import TOKEN_PATTERN, normalize_text
+
+# BM25 term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Title words count this many times, so a match in a title ranks higher
+TITLE_WEIGHT = 2
+
+# Longest text snippet stored with each document for showing results
+SNIPPET_LENGTH = 160
+
+# Bumped whenever the saved index layout or tokenization changes
+INDEX_VERSION = 2
+
+
+def tokenize(text):
+    """
+    Split text into accent-folded, casefolded words
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: The words, in order
+    """
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def _snippet(text):
+    """Shorten text for a result listing"""
+    return text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH - 3].rstrip() + "..."
+
+
+def describe_result(result, item, split):
+    """
+    Add a search result's title, section and text snippet
+
+    Args:
+        result (dict): A result from NotesSearchIndex.search()
+        item (dict): The country or topic it points into
+        split (callable): country_documents or topic_documents
+
+    Returns:
+        dict: The result with 'title', 'section' and 'snippet', or None if
+            the item no longer has that document
+    """
+    documents = split(item)
+    if result['position'] >= len(documents):
+        return None
+
+    title, text, section = documents[result['position']]
+    return dict(result, title=title, section=section, snippet=_snippet(text))
+
+
+def country_documents(country):
+    """
+    Split a country's notes into searchable documents
+
+    Args:
+        country (dict): A country from cultural_notes.json
+
+    Returns:
+        list: (title, text, section) tuples
+    """
+    documents = []
+    overview = [f"Capital: {country.get('capital', '')}", f"Language: {country.get('language', '')}",
+                f"Dialects: {', '.join(country.get('dialects', []))}"]
+    if country.get('pronunciation_differences'):
+        overview.append(country['pronunciation_differences'])
+    documents.append((country['name'], " ".join(overview), "overview"))
+
+    for note in country.get('notes', []):
+        documents.append((note['title'], note['content'], "note"))
+    return documents
+
+
+def topic_documents(topic):
+    """
+    Split a grammar topic into searchable documents
+
+    Args:
+        topic (dict): A topic from grammar_notes.json
+
+    Returns:
+        list: (title, text, section) tuples
+    """
+    documents = [(topic['name'], topic.get('explanation', ''), "explanation")]
+    for example in topic.get('examples', []):
+        documents.append((topic['name'], f"{example['spanish']} - {example['english']}", "example"))
+    for tip in topic.get('tips', []):
+        documents.append((topic['name'], tip, "tip"))
+    return documents
+
+
+class NotesSearchIndex:
+    """
+    BM25-ranked inverted index over note documents, saved to disk
+
+    Each country and grammar topic is split into small documents (a note,
+    an explanation, an example, a tip), indexed under their accent-folded
+    words. The index is saved as one compact JSON file together with the
+    mtime and size of the source files it was built from, so a later run
+    with unchanged notes loads it without parsing them. When a source file
+    changes, only countries or topics whose content hash changed are
+    re-indexed.
+
+    To keep the saved file small and quick to parse, documents store only
+    where they come from (country or topic, and position in it) and their
+    length, and each term's postings are two parallel lists of ascending
+    document ids and frequencies; texts for results are read back from the
+    notes. A country's or topic's documents get consecutive ids, so
+    removing it cuts one slice out of the postings of each of its words.
+
+    Queries are scored term by term, rarest first (MaxScore): once the
+    top results can no longer be overtaken by documents matching only the
+    remaining, more common terms, those terms just add to the existing
+    candidates instead of scanning their long postings.
+    """
+
+    def __init__(self, index_file):
+        """
+        Initialize an empty index
+
+        Args:
+            index_file (str): Path the index is saved to and loaded from
+        """
+        self.index_file = index_file
+        self.sources = {}    # source file -> [mtime_ns, size]
+        self.entries = {}    # "kind:name" -> {"hash", "first" doc id, "count", "terms"}
+        self.docs = {}       # str(doc id) -> ["kind:name", position, length]
+        self.postings = {}   # term -> [ascending doc ids, term frequencies]
+        self.total_length = 0
+        self.next_id = 0
+        self.dirty = False
+        self._norms = None   # doc id -> BM25 length normalization, built on search
+        self._kinds = None   # doc id -> 'cultural' or 'grammar', built on search
+
+    @classmethod
+    def load(cls, index_file):
+        """
+        Load a saved index, or start an empty one
+
+        Args:
+            index_file (str): Path of the saved index
+
+        Returns:
+            NotesSearchIndex: The index
+        """
+        index = cls(index_file)
+        try:
+            with open(index_file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+
+        if data.get("version") != INDEX_VERSION:
+            return index
+
+        index.sources = data["sources"]
+        index.entries = data["entries"]
+        index.docs = data["docs"]
+        index.postings = data["postings"]
+        index.total_length = data["total_length"]
+        index.next_id = data["next_id"]
+        return index
+
+    def save(self):
+        """
+        Save the index if it changed
+
+        Returns:
+            bool: True if the saved index is up to date
+        """
+        if not self.dirty:
+            return True
+
+        data = {
+            "version": INDEX_VERSION,
+            "sources": self.sources,
+            "entries": self.entries,
+            "docs": self.docs,
+            "postings": self.postings,
+            "total_length": self.total_length,
+            "next_id": self.next_id
+        }
+        if save_json_data(data, self.index_file, compact=True):
+            self.dirty = False
+        return not self.dirty
+
+    def is_current(self, source_file):
+        """
+        Check whether a source file is unchanged since it was indexed
+
+        Args:
+            source_file (str): Path of a notes document
+
+        Returns:
+            bool: True if its mtime and size match the indexed ones
+        """
+        try:
+            stat = os.stat(source_file)
+        except OSError:
+            return False
+        return self.sources.get(source_file) == [stat.st_mtime_ns, stat.st_size]
+
+    def update_source(self, source_file, kind, items, split):
+        """
+        Bring the documents of one notes document up to date
+
+        Args:
+            source_file (str): Path of the notes document
+            kind (str): 'cultural' or 'grammar'
+            items (list): Its countries or topics
+            split (callable): country_documents or topic_documents
+
+        Returns:
+            int: Number of countries or topics re-indexed
+        """
+        stat = os.stat(source_file)
+        seen = set()
+        changed = 0
+
+        for item in items:
+            key = f"{kind}:{item['name']}"
+            if key in seen:
+                continue  # Only the first entry with a name is reachable
+            seen.add(key)
+
+            digest = hashlib.sha1(json.dumps(item, ensure_ascii=False).encode("utf-8")).hexdigest()
+            entry = self.entries.get(key)
+            if entry and entry["hash"] == digest:
+                continue
+
+            if entry:
+                self._remove_entry(key)
+            self._add_entry(key, digest, split(item))
+            changed += 1
+
+        prefix = f"{kind}:"
+        for key in [key for key in self.entries if key.startswith(prefix) and key not in seen]:
+            self._remove_entry(key)
+            changed += 1
+
+        self.sources[source_file] = [stat.st_mtime_ns, stat.st_size]
+        self.dirty = True
+        return changed
+
+    def _add_entry(self, key, digest, documents):
+        """Index the documents of a country or topic under consecutive ids"""
+        first = self.next_id
+        terms = set()
+
+        for position, (title, text, _section) in enumerate(documents):
+            doc_id = self.next_id
+            self.next_id += 1
+
+            counts = Counter(tokenize(text))
+            for term in tokenize(title):
+                counts[term] += TITLE_WEIGHT
+            length = sum(counts.values())
+
+            # Ids only grow, so appending keeps each postings list sorted
+            for term, count in counts.items():
+                ids, frequencies = self.postings.setdefault(term, [[], []])
+                ids.append(doc_id)
+                frequencies.append(count)
+            terms.update(counts)
+
+            self.docs[str(doc_id)] = [key, position, length]
+            self.total_length += length
+
+        self.entries[key] = {"hash": digest, "first": first, "count": len(documents), "terms": sorted(terms)}
+        self._norms = None
+
+    def _remove_entry(self, key):
+        """Drop every document of a country or topic"""
+        entry = self.entries.pop(key)
+        first, stop = entry["first"], entry["first"] + entry["count"]
+
+        for doc_id in range(first, stop):
+            self.total_length -= self.docs.pop(str(doc_id))[2]
+        for term in entry["terms"]:
+            ids, frequencies = self.postings[term]
+            start, end = bisect.bisect_left(ids, first), bisect.bisect_left(ids, stop)
+            del ids[start:end]
+            del frequencies[start:end]
+            if not ids:
+                del self.postings[term]
+        self._norms = None
+
+    def search(self, query, limit=10, kind=None):
+        """
+        Find the documents that best match a query
+
+        Args:
+            query (str): Words to search for (accents and case are ignored)
+            limit (int, optional): Maximum number of results
+            kind (str, optional): Only 'cultural' or 'grammar' documents
+
+        Returns:
+            list: Results, best first, each with 'kind', 'source' (country
+                or topic name), the document's 'position' in it and 'score'
+                (see describe_result() for its text)
+        """
+        count = len(self.docs)
+        if not count or limit <= 0:
+            return []
+
+        if self._norms is None:
+            average_length = self.total_length / count
+            self._norms = {}
+            self._kinds = {}
+            for doc_id, (key, _position, length) in self.docs.items():
+                self._norms[int(doc_id)] = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                self._kinds[int(doc_id)] = key.split(":", 1)[0]
+        norms = self._norms
+        kinds = self._kinds if kind else None
+
+        # A term adds less than weight = idf * (k1 + 1) to a document's
+        # score; score the rarest (highest weight) terms first
+        terms = []
+        for term in set(tokenize(query)):
+            if term in self.postings:
+                ids, frequencies = self.postings[term]
+                idf = math.log(1 + (count - len(ids) + 0.5) / (len(ids) + 0.5))
+                terms.append((idf * (BM25_K1 + 1), ids, frequencies))
+        terms.sort(key=lambda term: term[0], reverse=True)
+
+        scores = {}
+        remaining = sum(term[0] for term in terms)
+        for weight, ids, frequencies in terms:
+            if len(scores) >= limit and heapq.nlargest(limit, scores.values())[-1] >= remaining:
+                # Documents not scored yet can't reach the top any more
+                for doc_id in scores:
+                    i = bisect.bisect_left(ids, doc_id)
+                    if i < len(ids) and ids[i] == doc_id:
+                        frequency = frequencies[i]
+                        scores[doc_id] += weight * frequency / (frequency + norms[doc_id])
+            else:
+                for doc_id, frequency in zip(ids, frequencies):
+                    if kinds and kinds[doc_id] != kind:
+                        continue
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * frequency / (frequency + norms[doc_id])
+            remaining -= weight
+
+        results = []
+        for doc_id, score in heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0])):
+            key, position, _length = self.docs[str(doc_id)]
+            doc_kind, source = key.split(":", 1)
+            results.append({"kind": doc_kind, "source": source, "position": position, "score": round(score, 4)})
+
+        return results
@@ -0,0 +1,812 @@
+"""
+Spanish Learning Chatbot - Profile Storage
+This module provides the storage backends used by UserProfile
+"""
+
+import os
+import json
+import time
+import bisect
+import sqlite3
+import datetime
+import threading
+from src.utils import (save_json_data, load_json_data, append_json_lines, load_json_lines,
+                       create_directory_if_not_exists, FSYNC_NONE)
+
+
+# Fields kept for each word of the day in a profile's history: its date and
+# position in the vocabulary's word index, or its category and Spanish text
+# where it has no such id. The full word is only kept for the current day
+WORD_OF_DAY_HISTORY_FIELDS = ("date", "word_id")
+WORD_OF_DAY_FALLBACK_FIELDS = ("date", "category_name", "spanish")
+
+
+def word_of_day_history_entry(word_of_day):
+    """
+    Get the compact history entry of a word of the day
+
+    Args:
+        word_of_day (dict): The full word with its 'date'
+
+    Returns:
+        dict: Entry for the profile's word_of_day_history
+    """
+    fields = WORD_OF_DAY_HISTORY_FIELDS if word_of_day.get("word_id") is not None else WORD_OF_DAY_FALLBACK_FIELDS
+    return {field: word_of_day.get(field) for field in fields}
+
+# Raw quiz records kept in a profile's quiz_history; older quizzes only
+# live on in the rollups
+QUIZ_HISTORY_LIMIT = 50
+
+# Days and ISO weeks kept in the daily and weekly quiz rollups
+QUIZ_ROLLUP_DAYS = 90
+QUIZ_ROLLUP_WEEKS = 104
+
+
+def new_quiz_rollups():
+    """
+    Create empty quiz rollups
+
+    Each rollup maps a day ('2024-05-01'), an ISO week ('2024-W18') or a
+    category name to {'count', 'sum', 'mean', 'best'} of quiz percentages.
+
+    Returns:
+        dict: {'daily': {}, 'weekly': {}, 'categories': {}}
+    """
+    return {"daily": {}, "weekly": {}, "categories": {}}
+
+
+def _add_to_rollup(rollup, key, percentage, limit=None):
+    """Add a quiz percentage to one bucket, dropping the oldest past `limit`"""
+    bucket = rollup.get(key)
+    if bucket is None:
+        bucket = rollup[key] = {"count": 0, "sum": 0.0, "mean": 0.0, "best": percentage}
+        if limit and len(rollup) > limit:
+            del rollup[min(rollup)]
+
+    bucket["count"] += 1
+    bucket["sum"] = round(bucket["sum"] + percentage, 1)
+    bucket["mean"] = round(bucket["sum"] / bucket["count"], 1)
+    bucket["best"] = max(bucket["best"], percentage)
+
+
+def add_quiz_to_rollups(rollups, record):
+    """
+    Add a quiz record to the daily, weekly and per-category rollups
+
+    Args:
+        rollups (dict): Rollups to update in place (see new_quiz_rollups)
+        record (dict): Quiz record with 'date', 'category' and 'percentage'
+    """
+    day = record["date"][:10]
+    year, week, _ = datetime.date.fromisoformat(day).isocalendar()
+    percentage = record["percentage"]
+
+    _add_to_rollup(rollups["daily"], day, percentage, QUIZ_ROLLUP_DAYS)
+    _add_to_rollup(rollups["weekly"], f"{year}-W{week:02d}", percentage, QUIZ_ROLLUP_WEEKS)
+    _add_to_rollup(rollups["categories"], record["category"], percentage)
+
+
+def rollup_quiz_history(statistics):
+    """
+    Give profile statistics from before rollups their quiz rollups
+
+    The rollups are built from the full quiz history, which is then cut
+    down to the last QUIZ_HISTORY_LIMIT records.
+
+    Args:
+        statistics (dict): Profile statistics to update in place
+
+    Returns:
+        bool: True if the statistics were changed, False if they already
+            had rollups
+    """
+    if "quiz_rollups" in statistics:
+        return False
+
+    rollups = new_quiz_rollups()
+    for record in statistics["quiz_history"]:
+        add_quiz_to_rollups(rollups, record)
+    statistics["quiz_rollups"] = rollups
+    del statistics["quiz_history"][:-QUIZ_HISTORY_LIMIT]
+    return True
+
+
+def apply_profile_event(profile_data, event):
+    """
+    Apply a recorded change to profile data
+
+    Every profile mutation is expressed as one of these events, so the same
+    code updates the in-memory profile and replays a journal onto a snapshot.
+
+    Args:
+        profile_data (dict): Profile data to update in place
+        event (dict): Event with a 'type' and type-specific fields
+    """
+    event_type = event.get("type")
+    statistics = profile_data["statistics"]
+
+    if event_type == "word_mastery":
+        profile_data["mastered_words"].setdefault(event["category"], {})[event["word"]] = event["data"]
+    elif event_type == "quiz":
+        statistics["quizzes_taken"] += 1
+        statistics["total_score"] += event["record"]["score"]
+        statistics["quiz_history"].append(event["record"])
+        # Profiles from before rollups keep their full history until
+        # rollup_quiz_history() has summarized it
+        if "quiz_rollups" in statistics:
+            add_quiz_to_rollups(statistics["quiz_rollups"], event["record"])
+            del statistics["quiz_history"][:-QUIZ_HISTORY_LIMIT]
+    elif event_type == "statistic":
+        statistics[event["name"]] += event["count"]
+    elif event_type == "word_of_day":
+        entry = event["entry"]
+        profile_data["last_word_of_day"] = entry["date"]
+        profile_data["word_of_day"] = entry
+        profile_data["word_of_day_history"].append(word_of_day_history_entry(entry))
+    elif event_type == "custom_word":
+        profile_data["custom_vocabulary"].append(event["word"])
+    elif event_type == "login":
+        profile_data["last_login"] = event["at"]
+
+
+class ProfileStorage:
+    """
+    Interface for profile storage backends
+
+    Profiles are plain dicts. Backends persist either a full snapshot with
+    save() or individual change events (see apply_profile_event) with
+    append_events(); load() always returns the profile with every persisted
+    event applied.
+    """
+
+    # Whether append_events() is the preferred way to persist changes
+    prefers_events = False
+
+    def exists(self, profile_id):
+        """Check whether a profile exists"""
+        raise NotImplementedError
+
+    def load(self, profile_id):
+        """
+        Load a profile
+
+        Args:
+            profile_id (str): Profile ID
+
+        Returns:
+            dict: Profile data, or None if the profile doesn't exist
+        """
+        raise NotImplementedError
+
+    def save(self, profile_id, profile_data):
+        """
+        Save a full profile snapshot, superseding any recorded events
+
+        Args:
+            profile_id (str): Profile ID
+            profile_data (dict): Profile data
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        raise NotImplementedError
+
+    def append_events(self, profile_id, events):
+        """
+        Persist change events for a profile
+
+        Args:
+            profile_id (str): Profile ID
+            events (list): Events already applied to the in-memory profile
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        raise NotImplementedError
+
+    def journal_length(self, profile_id):
+        """Get the number of events not yet folded into the snapshot"""
+        return 0
+
+    def delete(self, profile_id):
+        """
+        Delete a profile
+
+        Returns:
+            bool: True if the profile existed and was deleted, False otherwise
+        """
+        raise NotImplementedError
+
+    def list_profiles(self, prefix=None, offset=0, limit=None):
+        """
+        List stored profiles ordered by name
+
+        Args:
+            prefix (str, optional): Only list names starting with this (case-insensitive)
+            offset (int, optional): Number of matching profiles to skip
+            limit (int, optional): Maximum number of profiles to return
+
+        Returns:
+            list: Dicts with 'id', 'name' and 'last_login' for each profile
+        """
+        raise NotImplementedError
+
+    def count_profiles(self, prefix=None):
+        """Count stored profiles, optionally only names starting with `prefix`"""
+        raise NotImplementedError
+
+
+class JsonFileStorage(ProfileStorage):
+    """
+    Stores each profile as `<id>.json` plus an append-only `<id>.journal.jsonl`
+
+    Events are numbered by the caller ('seq') and the snapshot records the
+    last number it includes ('journal_seq'), so a crash between writing the
+    snapshot and removing the journal never applies an event twice.
+
+    Listing is served from `.profile_index.json`, which caches each profile's
+    name, last login, size and mtime. This process updates the in-memory
+    index on create, save, login and delete and writes it out on the next
+    listing. A stat-only directory scan (at most once per
+    `INDEX_SCAN_INTERVAL` seconds) re-reads just the profiles whose size or
+    mtime no longer match, which also picks up changes by other processes.
+    """
+
+    INDEX_FILENAME = ".profile_index.json"
+    INDEX_SCAN_INTERVAL = 1.0
+
+    def __init__(self, profiles_dir="data/user_profiles", fsync=FSYNC_NONE, compact=False):
+        """
+        Initialize with the profiles directory
+
+        Args:
+            profiles_dir (str): Directory holding profile files
+            fsync (str, optional): fsync policy for snapshot and journal
+                writes (see save_json_data)
+            compact (bool, optional): Write snapshots without indentation
+        """
+        self.profiles_dir = profiles_dir
+        self.fsync = fsync
+        self.compact = compact
+        self._journal_lengths = {}
+        self._index = None
+        self._index_dirty = False
+        self._sorted_names = None
+        self._last_scan = None
+
+        # Ensure profiles directory exists
+        create_directory_if_not_exists(self.profiles_dir)
+
+    def _profile_path(self, profile_id):
+        """Get the snapshot file path for a profile"""
+        return os.path.join(self.profiles_dir, f"{profile_id}.json")
+
+    def _journal_path(self, profile_id):
+        """Get the journal file path for a profile"""
+        return os.path.join(self.profiles_dir, f"{profile_id}.journal.jsonl")
+
+    def exists(self, profile_id):
+        """Check whether a profile exists"""
+        return os.path.exists(self._profile_path(profile_id))
+
+    def _load_index(self):
+        """Get the in-memory profile index, reading it from disk on first use"""
+        if self._index is None:
+            try:
+                with open(os.path.join(self.profiles_dir, self.INDEX_FILENAME), 'r', encoding='utf-8') as file:
+                    self._index = json.load(file)["profiles"]
+            except (OSError, ValueError, KeyError):
+                self._index = {}
+        return self._index
+
+    def _set_index_entry(self, profile_id, entry):
+        """Change one index entry (None removes it) and schedule a write"""
+        index = self._load_index()
+        previous = index.pop(profile_id, None)
+        if entry is not None:
+            index[profile_id] = entry
+
+        # The sort order only depends on names
+        if previous is None or entry is None or previous["name"] != entry["name"]:
+            self._sorted_names = None
+        self._index_dirty = True
+
+    def _index_entry(self, profile_id, profile_data):
+        """Build an index entry from profile data and the snapshot's stat"""
+        stat = os.stat(self._profile_path(profile_id))
+        return {
+            "name": profile_data.get("name", profile_id),
+            "last_login": profile_data.get("last_login"),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns
+        }
+
+    def _refresh_index(self):
+        """Bring the index up to date with the directory using a stat-only scan"""
+        index = self._load_index()
+
+        if self._last_scan is None or time.monotonic() - self._last_scan >= self.INDEX_SCAN_INTERVAL:
+            seen = set()
+
+            with os.scandir(self.profiles_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or entry.name.startswith("."):
+                        continue
+
+                    profile_id = entry.name[:-5]  # Remove .json extension
+                    seen.add(profile_id)
+                    stat = entry.stat()
+                    cached = index.get(profile_id)
+
+                    if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+                        continue
+
+                    try:
+                        profile_data = load_json_data(entry.path)
+                        self._set_index_entry(profile_id, self._index_entry(profile_id, profile_data))
+                    except:
+                        self._set_index_entry(profile_id, None)
+
+            for profile_id in set(index) - seen:
+                self._set_index_entry(profile_id, None)
+
+            self._last_scan = time.monotonic()
+
+        if self._index_dirty:
+            save_json_data({"profiles": index}, os.path.join(self.profiles_dir, self.INDEX_FILENAME), compact=True)
+            self._index_dirty = False
+
+    def _matching_range(self, prefix):
+        """Get the (start, end) slice of the sorted names that match a prefix"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(
+                (entry["name"].casefold(), profile_id) for profile_id, entry in self._index.items()
+            )
+
+        if not prefix:
+            return 0, len(self._sorted_names)
+
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(self._sorted_names, (prefix,))
+        end = bisect.bisect_left(self._sorted_names, (prefix + "\U0010ffff",))
+        return start, end
+
+    def load(self, profile_id):
+        """Load a profile snapshot and replay its journal"""
+        if not self.exists(profile_id):
+            return None
+
+        profile_data = load_json_data(self._profile_path(profile_id))
+        events = load_json_lines(self._journal_path(profile_id))
+
+        # Apply events newer than the snapshot
+        journal_seq = profile_data.get("journal_seq", 0)
+        for event in events:
+            if event.get("seq", 0) > journal_seq:
+                apply_profile_event(profile_data, event)
+                journal_seq = event["seq"]
+
+        if journal_seq:
+            profile_data["journal_seq"] = journal_seq
+
+        self._journal_lengths[profile_id] = len(events)
+        return profile_data
+
+    def save(self, profile_id, profile_data):
+        """Save a profile snapshot and discard the journal it supersedes"""
+        if not save_json_data(profile_data, self._profile_path(profile_id), self.fsync, self.compact):
+            return False
+
+        try:
+            os.remove(self._journal_path(profile_id))
+        except OSError:
+            pass
+
+        self._journal_lengths[profile_id] = 0
+        self._set_index_entry(profile_id, self._index_entry(profile_id, profile_data))
+        return True
+
+    def append_events(self, profile_id, events):
+        """Append events to the profile's journal"""
+        if not append_json_lines(events, self._journal_path(profile_id), self.fsync):
+            return False
+
+        self._journal_lengths[profile_id] = self._journal_lengths.get(profile_id, 0) + len(events)
+
+        # Keep the listed last login current without touching the snapshot
+        logins = [event["at"] for event in events if event.get("type") == "login"]
+        entry = self._load_index().get(profile_id)
+        if logins and entry:
+            self._set_index_entry(profile_id, dict(entry, last_login=logins[-1]))
+
+        return True
+
+    def journal_length(self, profile_id):
+        """Get the number of journal events not yet folded into the snapshot"""
+        return self._journal_lengths.get(profile_id, 0)
+
+    def delete(self, profile_id):
+        """Delete a profile snapshot and its journal"""
+        if not self.exists(profile_id):
+            return False
+
+        for path in (self._profile_path(profile_id), self._journal_path(profile_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+        self._journal_lengths.pop(profile_id, None)
+        self._set_index_entry(profile_id, None)
+        return True
+
+    def list_profiles(self, prefix=None, offset=0, limit=None):
+        """List profiles from the index, re-reading only changed files"""
+        self._refresh_index()
+        start, end = self._matching_range(prefix)
+        start += offset
+        if limit is not None:
+            end = min(end, start + limit)
+
+        profiles = []
+        for _, profile_id in self._sorted_names[start:end]:
+            entry = self._index[profile_id]
+            profiles.append({"id": profile_id, "name": entry["name"], "last_login": entry["last_login"]})
+        return profiles
+
+    def count_profiles(self, prefix=None):
+        """Count profiles from the index"""
+        self._refresh_index()
+        start, end = self._matching_range(prefix)
+        return end - start
+
+
+class SQLiteStorage(ProfileStorage):
+    """
+    Stores profiles in a SQLite database
+
+    The profile row holds the scalar fields plus a JSON 'data' column for the
+    remaining small sections; word mastery, quiz history and word-of-day
+    history live in their own indexed tables. Events are applied directly to
+    those tables, so recording an answer is a single-row upsert regardless of
+    profile size.
+    """
+
+    prefers_events = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL COLLATE NOCASE,
+            created_at TEXT,
+            last_login TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles (name);
+
+        CREATE TABLE IF NOT EXISTS word_mastery (
+            profile_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            word TEXT NOT NULL,
+            correct_count INTEGER NOT NULL,
+            incorrect_count INTEGER NOT NULL,
+            last_practiced TEXT,
+            mastery_level INTEGER NOT NULL,
+            PRIMARY KEY (profile_id, category, word)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_word_mastery_practiced ON word_mastery (profile_id, last_practiced);
+
+        CREATE TABLE IF NOT EXISTS quiz_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            max_score INTEGER NOT NULL,
+            percentage REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_quiz_history_profile ON quiz_history (profile_id, date);
+
+        CREATE TABLE IF NOT EXISTS word_of_day_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_word_of_day_profile ON word_of_day_history (profile_id, date);
+    """
+
+    def __init__(self, db_path="data/user_profiles.db"):
+        """
+        Open (and create if needed) the profile database
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        self.db_path = db_path
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            create_directory_if_not_exists(directory)
+
+        # check_same_thread=False lets the server hand profile I/O to worker threads
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def exists(self, profile_id):
+        """Check whether a profile exists"""
+        row = self.connection.execute("SELECT 1 FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def _split_profile(profile_data):
+        """
+        Split profile data into the profile row and its child collections
+
+        Returns:
+            tuple: (data dict for the JSON column, mastered_words, quiz_history,
+                word_of_day_history)
+        """
+        data = {key: value for key, value in profile_data.items()
+                if key not in ("name", "created_at", "last_login", "mastered_words", "word_of_day_history")}
+        data["statistics"] = {key: value for key, value in profile_data["statistics"].items()
+                              if key != "quiz_history"}
+        return (data, profile_data["mastered_words"], profile_data["statistics"]["quiz_history"],
+                profile_data["word_of_day_history"])
+
+    def load(self, profile_id):
+        """Load a profile and its history tables"""
+        row = self.connection.execute(
+            "SELECT name, created_at, last_login, data FROM profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        name, created_at, last_login, data = row
+        profile_data = json.loads(data)
+        profile_data["name"] = name
+        profile_data["created_at"] = created_at
+        profile_data["last_login"] = last_login
+
+        mastered_words = {}
+        for category, word, correct_count, incorrect_count, last_practiced, mastery_level in self.connection.execute(
+            "SELECT category, word, correct_count, incorrect_count, last_practiced, mastery_level "
+            "FROM word_mastery WHERE profile_id = ?", (profile_id,)
+        ):
+            mastered_words.setdefault(category, {})[word] = {
+                "correct_count": correct_count,
+                "incorrect_count": incorrect_count,
+                "last_practiced": last_practiced,
+                "mastery_level": mastery_level
+            }
+        profile_data["mastered_words"] = mastered_words
+
+        # Once the profile has rollups only the latest quizzes are kept;
+        # before that the full history is needed to build them
+        quiz_limit = QUIZ_HISTORY_LIMIT if "quiz_rollups" in profile_data["statistics"] else -1
+        profile_data["statistics"]["quiz_history"] = [
+            {"date": date, "category": category, "score": score, "max_score": max_score, "percentage": percentage}
+            for date, category, score, max_score, percentage in reversed(self.connection.execute(
+                "SELECT date, category, score, max_score, percentage FROM quiz_history "
+                "WHERE profile_id = ? ORDER BY id DESC LIMIT ?", (profile_id, quiz_limit)
+            ).fetchall())
+        ]
+
+        profile_data["word_of_day_history"] = [
+            json.loads(entry) for (entry,) in self.connection.execute(
+                "SELECT entry FROM word_of_day_history WHERE profile_id = ? ORDER BY id", (profile_id,)
+            )
+        ]
+
+        return profile_data
+
+    def _write_row(self, profile_id, profile_data, data):
+        """Insert or update the profile row"""
+        self.connection.execute(
+            "INSERT INTO profiles (id, name, created_at, last_login, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET name = excluded.name, created_at = excluded.created_at, "
+            "last_login = excluded.last_login, data = excluded.data",
+            (profile_id, profile_data["name"], profile_data.get("created_at"), profile_data.get("last_login"),
+             json.dumps(data, ensure_ascii=False))
+        )
+
+    def _insert_children(self, profile_id, mastered_words, quiz_history, word_of_day_history):
+        """Insert or replace child rows for a profile"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO word_mastery VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((profile_id, category, word, word_data["correct_count"], word_data["incorrect_count"],
+              word_data["last_practiced"], word_data["mastery_level"])
+             for category, words in mastered_words.items() for word, word_data in words.items())
+        )
+        self.connection.executemany(
+            "INSERT INTO quiz_history (profile_id, date, category, score, max_score, percentage) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((profile_id, quiz["date"], quiz["category"], quiz["score"], quiz["max_score"], quiz["percentage"])
+             for quiz in quiz_history)
+        )
+        self.connection.executemany(
+            "INSERT INTO word_of_day_history (profile_id, date, entry) VALUES (?, ?, ?)",
+            ((profile_id, entry["date"], json.dumps(entry, ensure_ascii=False)) for entry in word_of_day_history)
+        )
+
+    def _delete_children(self, profile_id):
+        """Delete all child rows for a profile"""
+        for table in ("word_mastery", "quiz_history", "word_of_day_history"):
+            self.connection.execute(f"DELETE FROM {table} WHERE profile_id = ?", (profile_id,))
+
+    def save(self, profile_id, profile_data):
+        """Replace a profile and all of its history rows"""
+        try:
+            with self.connection:
+                data, mastered_words, quiz_history, word_of_day_history = self._split_profile(profile_data)
+                self._write_row(profile_id, profile_data, data)
+                self._delete_children(profile_id)
+                self._insert_children(profile_id, mastered_words, quiz_history, word_of_day_history)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving profile: {e}")
+            return False
+
+    def append_events(self, profile_id, events):
+        """Apply events to the profile's rows in a single transaction"""
+        try:
+            with self.connection:
+                for event in events:
+                    self._apply_event(profile_id, event)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving profile: {e}")
+            return False
+
+    def _apply_event(self, profile_id, event):
+        """Apply one event to the database"""
+        if event["type"] == "word_mastery":
+            self._insert_children(profile_id, {event["category"]: {event["word"]: event["data"]}}, [], [])
+            return
+
+        if event["type"] == "login":
+            self.connection.execute("UPDATE profiles SET last_login = ? WHERE id = ?", (event["at"], profile_id))
+            return
+
+        # Apply anything else to the profile row with empty child collections,
+        # then store whatever the event added to them
+        name, created_at, last_login, data = self.connection.execute(
+            "SELECT name, created_at, last_login, data FROM profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+
+        skeleton = json.loads(data)
+        skeleton.update(name=name, created_at=created_at, last_login=last_login,
+                        mastered_words={}, word_of_day_history=[])
+        skeleton["statistics"]["quiz_history"] = []
+        apply_profile_event(skeleton, event)
+
+        data, mastered_words, quiz_history, word_of_day_history = self._split_profile(skeleton)
+        self._write_row(profile_id, skeleton, data)
+        self._insert_children(profile_id, mastered_words, quiz_history, word_of_day_history)
+
+        if quiz_history and "quiz_rollups" in skeleton["statistics"]:
+            self._trim_quiz_history(profile_id)
+
+    def _trim_quiz_history(self, profile_id):
+        """Delete all but the last QUIZ_HISTORY_LIMIT quiz rows of a profile"""
+        self.connection.execute(
+            "DELETE FROM quiz_history WHERE profile_id = ? AND id <= ("
+            "SELECT id FROM quiz_history WHERE profile_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (profile_id, profile_id, QUIZ_HISTORY_LIMIT)
+        )
+
+    def delete(self, profile_id):
+        """Delete a profile and its history rows"""
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
+            self._delete_children(profile_id)
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _prefix_pattern(prefix):
+        """Build a LIKE pattern matching names that start with `prefix`"""
+        escaped = (prefix or "").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return escaped + "%"
+
+    def list_profiles(self, prefix=None, offset=0, limit=None):
+        """List profiles from the name-indexed profile table"""
+        return [
+            {"id": profile_id, "name": name, "last_login": last_login}
+            for profile_id, name, last_login in self.connection.execute(
+                "SELECT id, name, last_login FROM profiles WHERE name LIKE ? ESCAPE '\\' "
+                "ORDER BY name LIMIT ? OFFSET ?",
+                (self._prefix_pattern(prefix), -1 if limit is None else limit, offset)
+            )
+        ]
+
+    def count_profiles(self, prefix=None):
+        """Count profiles in the profile table"""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM profiles WHERE name LIKE ? ESCAPE '\\'", (self._prefix_pattern(prefix),)
+        ).fetchone()[0]
+
+
+def migrate_profiles(source, target):
+    """
+    Copy every profile from one storage backend to another
+
+    Args:
+        source (ProfileStorage): Storage to read from
+        target (ProfileStorage): Storage to write to
+
+    Returns:
+        tuple: (number of profiles migrated, list of profile IDs that failed)
+    """
+    migrated = 0
+    failed = []
+
+    for profile in source.list_profiles():
+        profile_data = source.load(profile["id"])
+
+        if profile_data is not None and target.save(profile["id"], profile_data):
+            migrated += 1
+        else:
+            failed.append(profile["id"])
+
+    return migrated, failed
+
+
+class SynchronizedStorage(ProfileStorage):
+    """
+    Wraps a storage backend so threads can share it
+
+    Calls run one at a time under a lock. Backends keep shared state (the
+    JSON profile index, the SQLite connection and its transactions), so
+    this is what lets profiles be handled on several threads at once.
+    """
+
+    def __init__(self, storage):
+        """
+        Wrap a backend
+
+        Args:
+            storage (ProfileStorage): Backend to serialize calls to
+        """
+        self.storage = storage
+        self.prefers_events = storage.prefers_events
+        self._lock = threading.Lock()
+
+    def exists(self, profile_id):
+        with self._lock:
+            return self.storage.exists(profile_id)
+
+    def load(self, profile_id):
+        with self._lock:
+            return self.storage.load(profile_id)
+
+    def save(self, profile_id, profile_data):
+        with self._lock:
+            return self.storage.save(profile_id, profile_data)
+
+    def append_events(self, profile_id, events):
+        with self._lock:
+            return self.storage.append_events(profile_id, events)
+
+    def journal_length(self, profile_id):
+        with self._lock:
+            return self.storage.journal_length(profile_id)
+
+    def delete(self, profile_id):
+        with self._lock:
+            return self.storage.delete(profile_id)
+
+    def list_profiles(self, prefix=None, offset=0, limit=None):
+        with self._lock:
+            return self.storage.list_profiles(prefix, offset, limit)
+
+    def count_profiles(self, prefix=None):
+        with self._lock:
+            return self.storage.count_profiles(prefix)
@@ -6,20 +6,44 @@ This module handles the quiz functionality of the chatbot
 import random
 import time
 from src.utils import clear_screen
+from src.sessions import QuizSession
+from src.distractors import DistractorEngine
+from src.metrics import metrics
+
+# Difficulty choices offered when setting up a quiz
+DIFFICULTY_MAP = {1: "beginner", 2: "intermediate", 3: "advanced"}
+
+# Shards per worker process in generate_quizzes(), to even out their load
+SHARDS_PER_PROCESS = 4
+
+def _generate_quiz_range(category, start, stop, num_questions, direction, difficulty, seed, prefer_confusables):
+    """Generate quizzes start..stop-1 of a batch (runs in worker processes)"""
+    quiz_system = QuizSystem({"categories": [category]}, prefer_confusables=prefer_confusables)
+    return quiz_system._generate_range(category, start, stop, num_questions, direction, difficulty, seed)
 
 class QuizSystem:
     """Handles quiz creation and scoring for vocabulary practice"""
 
-    def __init__(self, vocabulary_data, user_profile=None):
+    def __init__(self, vocabulary_data, user_profile=None, prefer_confusables=False):
         """
         Initialize with vocabulary data and user profile
         
         Args:
-            vocabulary_data (dict): The vocabulary data
+            vocabulary_data (dict or VocabularyManager): The vocabulary data,
+                or a manager to read it through, so words and categories
+                added later show up in quizzes
             user_profile (UserProfile, optional): User profile for tracking progress
+            prefer_confusables (bool, optional): Prefer wrong answers that
+                look like the correct one
         """
-        self.vocabulary = vocabulary_data
+        self._vocabulary_source = vocabulary_data
         self.user_profile = user_profile
+        self.distractors = DistractorEngine(prefer_confusables)
+
+    @property
+    def vocabulary(self):
+        """Vocabulary data with a 'categories' list"""
+        return getattr(self._vocabulary_source, 'vocabulary', self._vocabulary_source)
 
     def start_quiz(self):
         """Start a vocabulary quiz based on user preferences"""
@@ -58,34 +82,185 @@ class QuizSystem:
                     direction = int(direction) if direction in ['1', '2'] else 1
 
                     # Filter by difficulty if user wants
+                    category_words = category['words']
+                    chosen_difficulty = None
                     if 'difficulty' in category['words'][0]:
                         difficulty = input("\nChoose difficulty:\n1. Beginner\n2. Intermediate\n3. Advanced\n4. All levels\nYour choice (default: 4): ")
                         difficulty = int(difficulty) if difficulty in ['1', '2', '3', '4'] else 4
                         
-                        difficulty_map = {1: "beginner", 2: "intermediate", 3: "advanced"}
-                        if difficulty in difficulty_map:
-                            filtered_words = [w for w in category['words'] if w.get('difficulty') == difficulty_map[difficulty]]
+                        if difficulty in DIFFICULTY_MAP:
+                            filtered_words = self.filter_words(category, DIFFICULTY_MAP[difficulty])
                             if filtered_words:
                                 category_words = filtered_words
+                                chosen_difficulty = DIFFICULTY_MAP[difficulty]
                                 max_questions = min(max_questions, len(filtered_words))
                                 num_questions = min(num_questions, max_questions)
                             else:
-                                print(f"\nNo words found with {difficulty_map[difficulty]} difficulty. Using all words.")
-                                category_words = category['words']
-                        else:
-                            category_words = category['words']
-                    else:
-                        category_words = category['words']
+                                print(f"\nNo words found with {DIFFICULTY_MAP[difficulty]} difficulty. Using all words.")
 
                     # run the quiz
-                    self._run_quiz(category, category_words, num_questions, direction)
+                    self._run_quiz(category, category_words, num_questions, direction, chosen_difficulty)
                 else:
                     print("\nInvalid choice. Please try again.")
             except ValueError:
                 print("\nPlease enter a number.")
                 time.sleep(1)
 
-    def _run_quiz(self, category, category_words, num_questions, direction):
+    def filter_words(self, category, difficulty=None):
+        """
+        Get the words of a category, optionally only one difficulty
+        
+        Args:
+            category (dict): The category data
+            difficulty (str, optional): Difficulty level to keep
+            
+        Returns:
+            list: Matching words
+        """
+        if difficulty is None:
+            return category['words']
+        return [w for w in category['words'] if w.get('difficulty') == difficulty]
+
+    @metrics.timer("quiz_question_build_seconds", "Time spent building quiz questions")
+    def build_question(self, category, word, direction, rng=random, difficulty=None):
+        """
+        Build a multiple choice question for a word
+        
+        Args:
+            category (dict): The category data
+            word (dict): The word being asked about
+            direction (int): 1 for Spanish->English, 2 for English->Spanish
+            rng (random.Random, optional): Random source
+            difficulty (str, optional): Prefer wrong answers of this difficulty
+            
+        Returns:
+            dict: Question with 'prompt', 'question', 'options',
+                'correct_index', 'correct_answer' and the 'word'
+        """
+        # create multiple choice options (1 correct, 3 incorrect)
+        if direction == 1:  # Spanish to English
+            question = word['spanish']
+            correct_answer = word['english']
+            question_prompt = "What is the English translation of this Spanish word?"
+        else:   # English to Spanish
+            question = word['english']
+            correct_answer = word['spanish']
+            question_prompt = "What is the Spanish translation of this English word?"
+
+        # get incorrect options from other words
+        incorrect_options = self.distractors.sample(category, word, direction, 3, difficulty, rng)
+
+        # create answer choices
+        all_options = [correct_answer] + incorrect_options
+        rng.shuffle(all_options)
+
+        return {
+            "prompt": question_prompt,
+            "question": question,
+            "options": all_options,
+            "correct_index": all_options.index(correct_answer),
+            "correct_answer": correct_answer,
+            "word": word
+        }
+
+    def get_category(self, category_name):
+        """
+        Get a category by name
+        
+        Args:
+            category_name (str): Category name
+            
+        Returns:
+            dict: The first category with that name, or None
+        """
+        for category in self.vocabulary['categories']:
+            if category['name'] == category_name:
+                return category
+        return None
+
+    def _generate_range(self, category, start, stop, num_questions, direction, difficulty, seed):
+        """Generate quizzes start..stop-1 of a batch as plain data"""
+        category_words = self.filter_words(category, difficulty)
+        if not category_words:
+            category_words = category['words']
+            difficulty = None
+        num_questions = min(num_questions, len(category_words))
+
+        quizzes = []
+        for index in range(start, stop):
+            # Each quiz has its own seed, so any shard can be built on its own
+            rng = random.Random(f"{seed}-{index}")
+            questions = []
+
+            for word in rng.sample(category_words, num_questions):
+                question = self.build_question(category, word, direction, rng, difficulty)
+                del question['word']
+                question['spanish'] = word['spanish']
+                questions.append(question)
+
+            quizzes.append({
+                "index": index,
+                "category": category['name'],
+                "direction": direction,
+                "questions": questions
+            })
+
+        return quizzes
+
+    @metrics.timer("quiz_batch_generate_seconds", "Time spent generating quiz batches")
+    def generate_quizzes(self, category_name, count, num_questions=5, direction=1, difficulty=None,
+                         seed=0, processes=None):
+        """
+        Build many quizzes at once, e.g. to hand out to a whole class
+        
+        The output depends only on the arguments: the same seed always gives
+        the same quizzes, with or without worker processes.
+        
+        Args:
+            category_name (str): Category to quiz
+            count (int): Number of quizzes
+            num_questions (int, optional): Questions per quiz, capped at the
+                number of words
+            direction (int, optional): 1 for Spanish->English, 2 for English->Spanish
+            difficulty (str, optional): Only quiz words of this difficulty
+                (all words if none match)
+            seed (int, optional): Seed for the whole batch
+            processes (int, optional): Worker processes to shard the batch
+                across (default: generate in this process)
+            
+        Returns:
+            list: Quizzes as plain dicts with 'index', 'category', 'direction'
+                and 'questions', each question holding 'spanish', 'prompt',
+                'question', 'options', 'correct_index' and 'correct_answer'
+            
+        Raises:
+            KeyError: If the category doesn't exist
+        """
+        category = self.get_category(category_name)
+        if category is None:
+            raise KeyError(f"Unknown category: {category_name}")
+
+        if not processes or processes <= 1 or count < 2:
+            return self._generate_range(category, 0, count, num_questions, direction, difficulty, seed)
+
+        shards = min(count, processes * SHARDS_PER_PROCESS)
+        bounds = [count * i // shards for i in range(shards + 1)]
+        quizzes = []
+
+        # Imported here: multiprocessing is slow to import and only batches need it
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [
+                executor.submit(_generate_quiz_range, category, bounds[i], bounds[i + 1], num_questions,
+                                direction, difficulty, seed, self.distractors.prefer_confusables)
+                for i in range(shards)
+            ]
+            for future in futures:
+                quizzes.extend(future.result())
+
+        return quizzes
+
+    def _run_quiz(self, category, category_words, num_questions, direction, difficulty=None):
         """
         Run a quiz with the specified parameters
         
@@ -94,62 +269,29 @@ class QuizSystem:
             category_words (list): The words to quiz on
             num_questions (int): Number of questions
             direction (int): 1 for Spanish->English, 2 for English->Spanish
+            difficulty (str, optional): Difficulty the words were filtered by
         """
-        words = random.sample(category_words, num_questions)
-        score = 0
-        word_results = []  # Track individual word results
+        session = QuizSession(self, category, category_words, num_questions, direction, difficulty=difficulty)
+
+        while True:
+            question = session.next_question()
+            if question is None:
+                break
 
-        for i, word in enumerate(words, 1):
             clear_screen()
-            print(f"\n🇪🇸 QUESTION {i}/{num_questions} 🇪🇸\n")
+            print(f"\n🇪🇸 QUESTION {question['number']}/{question['total']} 🇪🇸\n")
 
             # Display mastery level if a user profile is loaded
-            if self.user_profile and self.user_profile.current_profile:
-                mastery = self.user_profile.get_mastery_level(word['spanish'], category['name'])
+            if question['mastery_level'] is not None:
+                mastery = question['mastery_level']
                 mastery_display = "★" * mastery + "☆" * (5 - mastery)
                 print(f"Mastery: {mastery_display}\n")
 
-            # create multiple choice options (1 correct, 3 incorrect)
-            if direction == 1:  # Spanish to English
-                question = word['spanish']
-                correct_answer = word['english']
-                question_prompt = "What is the English translation of this Spanish word?"
-            else:   # English to Spanish
-                question = word['english']
-                correct_answer = word['spanish']
-                question_prompt = "What is the Spanish translation of this English word?"
-
-            # get incorrect options from other words
-            incorrect_options = []
-            other_words = [w for w in category['words'] if w != word]
-
-            if len(other_words) >= 3:
-                random_words = random.sample(other_words, 3)
-                for wrong_word in random_words:
-                    if direction == 1:  # Spanish to English
-                        incorrect_options.append(wrong_word['english'])
-                    else:   # English to Spanish
-                        incorrect_options.append(wrong_word['spanish'])
-            else:
-                # if not enough words in this category, use placeholders
-                for _ in range(3 - len(incorrect_options)):
-                    if direction == 1:  # Use placeholder English words
-                        placeholders = ["apple", "house", "car", "book", "tree", "dog", "cat"]
-                        incorrect_options.append(random.choice(placeholders))
-                    else:   # Use placeholder Spanish words
-                        placeholders = ["manzana", "casa", "coche", "libro", "árbol", "perro", "gato"]
-                        incorrect_options.append(random.choice(placeholders))
-
-            # create answer choices
-            all_options = [correct_answer] + incorrect_options
-            random.shuffle(all_options)
-            correct_index = all_options.index(correct_answer)
-
             # display question
-            print(f"{question_prompt}\n")
-            print(f"Word: {question}\n")
+            print(f"{question['prompt']}\n")
+            print(f"Word: {question['question']}\n")
 
-            for j, option in enumerate(all_options, 1):
+            for j, option in enumerate(question['options'], 1):
                 print(f"{j}. {option}")
 
             # get user answer
@@ -163,20 +305,14 @@ class QuizSystem:
                     print("Please enter a number.")
 
             # check answer
-            is_correct = (user_answer - 1 == correct_index)
-            if is_correct:
+            result = session.submit_answer(user_answer - 1)
+            if result['correct']:
                 print("\n✓ Correct! ¡Muy bien!")
-                score += 1
             else:
-                print(f"\n✗ Incorrect. The correct answer is: {correct_answer}")
-
-            # Track results for this word
-            word_results.append({
-                "word": word['spanish'],
-                "is_correct": is_correct
-            })
+                print(f"\n✗ Incorrect. The correct answer is: {result['correct_answer']}")
 
             # if there's an example, show it
+            word = result['word']
             if 'example' in word:
                 print(f"\nExample: {word['example']}")
                 print(f"\nTranslation: {word['example_translation']}")
@@ -187,10 +323,13 @@ class QuizSystem:
 
             input("\nPress Enter to continue...")
 
+        summary = session.finish()
+        score = summary['score']
+
         # show final score
         clear_screen()
         print("\n🇪🇸  QUIZ RESULTS  🇪🇸\n")
-        print(f"Your score: {score}/{num_questions} ({int(score/num_questions*100)}%)")
+        print(f"Your score: {score}/{num_questions} ({summary['percentage']}%)")
 
         if score == num_questions:
             print("\n¡Perfecto! You got all questions right!")
@@ -201,14 +340,7 @@ class QuizSystem:
         else:
             print("\nKeep practicing! You'll improve with time.")
         
-        # Save quiz results to user profile if available
-        if self.user_profile and self.user_profile.current_profile:
-            self.user_profile.update_quiz_score(category['name'], score, num_questions)
-            
-            # Update word mastery for each word
-            for result in word_results:
-                self.user_profile.update_word_mastery(result['word'], category['name'], result['is_correct'])
-            
+        if summary['saved']:
             print("\nYour progress has been saved!")
         
         input("\nPress Enter to return to the Quiz menu...")
\ No newline at end of file
@@ -0,0 +1,332 @@
+"""
+Spanish Learning Chatbot - Learning Sessions
+This module contains UI-independent flashcard, quiz and dialogue sessions.
+Sessions return plain data structures and never read input or print, so
+the CLI, a server or a test harness can all drive them.
+"""
+
+import random
+
+from src.answer_checker import check_answer
+
+
+class FlashcardSession:
+    """A run through a list of flashcards with self-graded answers"""
+
+    def __init__(self, words, user_profile=None, category=None, rng=None):
+        """
+        Initialize a flashcard session
+
+        Args:
+            words (list): Word dicts to practice, in order. Without `category`,
+                each word must carry 'category_name' and 'category_display'
+            user_profile (UserProfile, optional): User profile for tracking progress
+            category (dict, optional): Category all the words belong to
+            rng (random.Random, optional): Random source for card directions
+        """
+        self.words = words
+        self.user_profile = user_profile
+        self.category = category
+        self.random = rng or random
+        self.position = 0
+        self.cards_reviewed = 0
+        self.current = None
+        self.finished = False
+
+    def _has_profile(self):
+        """Check whether progress should be recorded"""
+        return self.user_profile is not None and self.user_profile.current_profile is not None
+
+    def _category_of(self, word):
+        """Get (name, display name) of a word's category"""
+        if self.category:
+            return self.category['name'], self.category['display_name']
+        return word['category_name'], word['category_display']
+
+    @property
+    def remaining(self):
+        """Number of cards not shown yet"""
+        return len(self.words) - self.position
+
+    def next_card(self):
+        """
+        Show the next card
+
+        Returns:
+            dict: Card data, or None when the session is out of cards. The
+                'direction' is 1 (Spanish prompt) or 2 (English prompt).
+        """
+        if self.finished or self.position >= len(self.words):
+            return None
+
+        word = self.words[self.position]
+        self.position += 1
+        category_name, category_display = self._category_of(word)
+
+        if 'mastery_level' in word:
+            mastery = word['mastery_level']
+        elif self._has_profile():
+            mastery = self.user_profile.get_mastery_level(word['spanish'], category_name)
+        else:
+            mastery = None
+
+        # Randomly choose direction (Spanish to English or English to Spanish)
+        direction = self.random.choice([1, 2])
+
+        self.current = {
+            "number": self.position,
+            "total": len(self.words),
+            "direction": direction,
+            "prompt": word['spanish'] if direction == 1 else word['english'],
+            "answer": word['english'] if direction == 1 else word['spanish'],
+            "category_name": category_name,
+            "category_display": category_display,
+            "mastery_level": mastery,
+            "word": word
+        }
+        return self.current
+
+    def submit_answer(self, correct):
+        """
+        Record whether the learner knew the current card
+
+        Args:
+            correct (bool): Whether the learner got it right
+
+        Returns:
+            dict: Result with 'correct' and the word's new 'mastery_level'
+                (None without a profile)
+        """
+        if self.current is None:
+            raise ValueError("No card to answer")
+
+        card = self.current
+        self.current = None
+        self.cards_reviewed += 1
+        mastery = None
+
+        # Update user profile if available
+        if self._has_profile():
+            self.user_profile.update_word_mastery(card['word']['spanish'], card['category_name'], correct)
+            mastery = self.user_profile.get_mastery_level(card['word']['spanish'], card['category_name'])
+
+        return {"correct": correct, "mastery_level": mastery}
+
+    def submit_typed_answer(self, response):
+        """
+        Grade a typed answer to the current card and record the result
+
+        Args:
+            response (str): What the learner typed
+
+        Returns:
+            dict: The grading from check_answer() ('grade' is exact, near or
+                wrong) plus the word's new 'mastery_level'
+        """
+        if self.current is None:
+            raise ValueError("No card to answer")
+
+        result = check_answer(response, self.current['answer'])
+        result.update(self.submit_answer(result['correct']))
+        return result
+
+    def finish(self):
+        """
+        End the session and save progress
+
+        Returns:
+            dict: Summary with 'cards_reviewed' and the profile's total
+                'flashcards_practiced' (None without a profile)
+        """
+        total = None
+
+        if not self.finished and self._has_profile():
+            self.user_profile.update_flashcard_practice(self.cards_reviewed)
+            self.user_profile.flush()
+
+        if self._has_profile():
+            total = self.user_profile.get_statistics()['flashcards_practiced']
+
+        self.finished = True
+        return {"cards_reviewed": self.cards_reviewed, "flashcards_practiced": total}
+
+
+class QuizSession:
+    """A multiple-choice vocabulary quiz"""
+
+    def __init__(self, quiz_system, category, category_words, num_questions, direction, rng=None,
+                 difficulty=None):
+        """
+        Initialize a quiz session and build its questions
+
+        Args:
+            quiz_system (QuizSystem): Quiz system used to build questions
+            category (dict): The category data
+            category_words (list): The words to quiz on
+            num_questions (int): Number of questions
+            direction (int): 1 for Spanish->English, 2 for English->Spanish
+            rng (random.Random, optional): Random source
+            difficulty (str, optional): Difficulty the words were filtered by,
+                to draw wrong answers from the same level
+        """
+        self.category = category
+        self.user_profile = quiz_system.user_profile
+        self.direction = direction
+        self.random = rng or random
+
+        words = self.random.sample(category_words, num_questions)
+        self.questions = [quiz_system.build_question(category, word, direction, self.random, difficulty)
+                          for word in words]
+        self.position = 0
+        self.score = 0
+        self.word_results = []  # Track individual word results
+        self.answered = True
+        self.finished = False
+
+    def _has_profile(self):
+        """Check whether progress should be recorded"""
+        return self.user_profile is not None and self.user_profile.current_profile is not None
+
+    def next_question(self):
+        """
+        Show the next question
+
+        Returns:
+            dict: Question data without the answer, or None when all
+                questions have been asked
+        """
+        if self.finished or self.position >= len(self.questions):
+            return None
+
+        question = self.questions[self.position]
+        self.position += 1
+        self.answered = False
+
+        mastery = None
+        if self._has_profile():
+            mastery = self.user_profile.get_mastery_level(question['word']['spanish'], self.category['name'])
+
+        return {
+            "number": self.position,
+            "total": len(self.questions),
+            "prompt": question['prompt'],
+            "question": question['question'],
+            "options": question['options'],
+            "mastery_level": mastery
+        }
+
+    def submit_answer(self, option_index):
+        """
+        Answer the current question
+
+        Args:
+            option_index (int): Index of the chosen option (0-based)
+
+        Returns:
+            dict: Result with 'correct', 'correct_answer', 'correct_index'
+                and the quizzed 'word'
+        """
+        if self.answered:
+            raise ValueError("No question to answer")
+
+        question = self.questions[self.position - 1]
+        self.answered = True
+
+        # check answer
+        is_correct = option_index == question['correct_index']
+        if is_correct:
+            self.score += 1
+
+        self.word_results.append({
+            "word": question['word']['spanish'],
+            "is_correct": is_correct
+        })
+
+        return {
+            "correct": is_correct,
+            "correct_answer": question['correct_answer'],
+            "correct_index": question['correct_index'],
+            "word": question['word']
+        }
+
+    def finish(self):
+        """
+        End the quiz and save results
+
+        Returns:
+            dict: Summary with 'score', 'num_questions', 'percentage' and
+                whether progress was 'saved'
+        """
+        num_questions = len(self.questions)
+        saved = False
+
+        # Save quiz results to user profile if available (an empty quiz has no score)
+        if not self.finished and num_questions and self._has_profile():
+            self.user_profile.update_quiz_score(self.category['name'], self.score, num_questions)
+
+            # Update word mastery for each word
+            for result in self.word_results:
+                self.user_profile.update_word_mastery(result['word'], self.category['name'], result['is_correct'])
+
+            self.user_profile.flush()
+            saved = True
+
+        self.finished = True
+        return {
+            "score": self.score,
+            "num_questions": num_questions,
+            "percentage": int(self.score / num_questions * 100) if num_questions else 0,
+            "saved": saved
+        }
+
+
+class DialogueSession:
+    """A walk through a pre-written dialogue, playing Person B"""
+
+    def __init__(self, dialogue, user_profile=None):
+        """
+        Initialize a dialogue session
+
+        Args:
+            dialogue (dict): Dialogue data with 'title' and 'exchanges'
+            user_profile (UserProfile, optional): User profile for tracking progress
+        """
+        self.dialogue = dialogue
+        self.user_profile = user_profile
+        self.position = 0
+        self.finished = False
+
+    @property
+    def completed(self):
+        """Whether every exchange has been shown"""
+        return self.position >= len(self.dialogue['exchanges'])
+
+    def next_exchange(self):
+        """
+        Show the next exchange
+
+        Returns:
+            dict: Exchange data with its 'number' and 'total', or None when
+                the dialogue is over
+        """
+        if self.finished or self.completed:
+            return None
+
+        exchange = self.dialogue['exchanges'][self.position]
+        self.position += 1
+
+        return dict(exchange, number=self.position, total=len(self.dialogue['exchanges']))
+
+    def finish(self):
+        """
+        End the dialogue and save progress
+
+        Returns:
+            dict: Summary with 'completed' and 'exchanges_practiced'
+        """
+        if not self.finished and self.user_profile and self.user_profile.current_profile:
+            self.user_profile.update_conversation_practice(1 if self.completed else 0)
+            self.user_profile.flush()
+
+        self.finished = True
+        return {"completed": self.completed, "exchanges_practiced": self.position}
@@ -6,12 +6,34 @@ This module implements the spaced repetition algorithm for optimized learning
 import datetime
 import random
 import math
+import heapq
 from src.utils import clear_screen
+from src.sessions import FlashcardSession
+from src.word_view import WordView
+from src.metrics import metrics
+
+# Days until the next review for each mastery level (0-5 scale)
+REVIEW_INTERVALS = {
+    0: 1,   # New word - review the next day
+    1: 2,   # Review after 2 days
+    2: 4,   # Review after 4 days
+    3: 7,   # Review after a week
+    4: 14,  # Review after two weeks
+}
+MASTERED_INTERVAL = 30  # Review after a month
+
+# Extra fields of never-practiced words offered for review (shared, read-only)
+NEW_WORD_FIELDS = {"mastery_level": 0}
 
 class SpacedRepetitionSystem:
     """
     Implements a spaced repetition system for flashcards
     Uses a simplified SuperMemo-2 algorithm to schedule reviews
+
+    Due dates are kept per word in a min-heap keyed on the date ordinal, so
+    finding the k due cards costs O(k log n). The heap is built once per
+    loaded profile and updated from the profile's change events; superseded
+    heap entries are skipped when popped and purged when they pile up.
     """
     
     def __init__(self, user_profile=None):
@@ -22,6 +44,104 @@ class SpacedRepetitionSystem:
             user_profile (UserProfile, optional): User profile for tracking progress
         """
         self.user_profile = user_profile
+        
+        # Review queue state
+        self._queue = []
+        self._due = {}
+        self._queue_profile = None
+        
+        if self.user_profile:
+            self.user_profile.add_listener(self._on_profile_event)
+    
+    @staticmethod
+    def _due_ordinal(word_data):
+        """
+        Get the date ordinal a practiced word becomes due
+        
+        Matches get_next_review_date with correct=True: words that were never
+        practiced or have an unreadable date are always due.
+        """
+        try:
+            last_date = datetime.datetime.fromisoformat(word_data['last_practiced']).date()
+        except (ValueError, TypeError):
+            return 0
+        
+        return last_date.toordinal() + REVIEW_INTERVALS.get(word_data['mastery_level'], MASTERED_INTERVAL)
+    
+    def _ensure_queue(self):
+        """Build the review queue if it doesn't belong to the loaded profile"""
+        profile_data = self.user_profile.current_profile
+        
+        if profile_data is self._queue_profile:
+            return
+        
+        self._due = {
+            (category_name, word_spanish): self._due_ordinal(word_data)
+            for category_name, words in profile_data['mastered_words'].items()
+            for word_spanish, word_data in words.items()
+        }
+        self._rebuild_heap()
+        self._queue_profile = profile_data
+    
+    def _rebuild_heap(self):
+        """Rebuild the heap from the current due dates, dropping stale entries"""
+        self._queue = [(due, key) for key, due in self._due.items()]
+        heapq.heapify(self._queue)
+    
+    def _on_profile_event(self, event):
+        """Reschedule a word when the profile records a review"""
+        if event['type'] != 'word_mastery' or self._queue_profile is not self.user_profile.current_profile:
+            return
+        
+        key = (event['category'], event['word'])
+        due = self._due_ordinal(event['data'])
+        self._due[key] = due
+        heapq.heappush(self._queue, (due, key))
+        
+        if len(self._queue) > 2 * len(self._due) + 64:
+            self._rebuild_heap()
+    
+    def get_due_words(self, limit=None, today=None, available=None):
+        """
+        Get practiced words that are due for review, most overdue first
+        
+        Args:
+            limit (int, optional): Maximum number of words to return
+            today (datetime.date, optional): Date to check against (defaults to today)
+            available (callable, optional): Called with (category name, spanish
+                word); due words it returns False for are skipped and don't
+                count toward `limit`
+            
+        Returns:
+            list: (category name, spanish word) tuples
+        """
+        if not self.user_profile or not self.user_profile.current_profile:
+            return []
+        
+        self._ensure_queue()
+        today_ordinal = (today or datetime.datetime.now().date()).toordinal()
+        due_words = []
+        popped = []
+        seen = set()
+        
+        while self._queue and self._queue[0][0] <= today_ordinal and (limit is None or len(due_words) < limit):
+            entry = heapq.heappop(self._queue)
+            
+            # Skip entries superseded by a later review (or duplicating one
+            # that rescheduled the word to the same day)
+            if self._due.get(entry[1]) != entry[0] or entry[1] in seen:
+                continue
+            
+            seen.add(entry[1])
+            popped.append(entry)
+            if available is None or available(*entry[1]):
+                due_words.append(entry[1])
+        
+        # Due words stay queued until they are reviewed
+        for entry in popped:
+            heapq.heappush(self._queue, entry)
+        
+        return due_words
     
     def get_next_review_date(self, mastery_level, last_reviewed=None, correct=True):
         """
@@ -50,18 +170,7 @@ class SpacedRepetitionSystem:
             return today
         
         # Calculate interval based on mastery level
-        if mastery_level == 0:
-            interval = 1  # New word - review the next day
-        elif mastery_level == 1:
-            interval = 2  # Review after 2 days
-        elif mastery_level == 2:
-            interval = 4  # Review after 4 days
-        elif mastery_level == 3:
-            interval = 7  # Review after a week
-        elif mastery_level == 4:
-            interval = 14  # Review after two weeks
-        else:  # mastery_level == 5
-            interval = 30  # Review after a month
+        interval = REVIEW_INTERVALS.get(mastery_level, MASTERED_INTERVAL)
         
         next_date = last_date + datetime.timedelta(days=interval)
         
@@ -71,143 +180,125 @@ class SpacedRepetitionSystem:
         
         return next_date
     
-    def get_words_due_for_review(self, vocabulary_manager):
+    @metrics.timer("due_words_seconds", "Time spent finding words due for review")
+    def get_words_due_for_review(self, vocabulary_manager, limit=None):
         """
         Get words that are due for review
         
         Args:
             vocabulary_manager (VocabularyManager): Vocabulary manager
+            limit (int, optional): Maximum number of due words to return
             
         Returns:
-            list: Words due for review with their category info
+            list: WordViews of the words due for review with their category
+                info and 'mastery_level'
         """
         if not self.user_profile or not self.user_profile.current_profile:
             # If no profile, return random words from all categories
-            all_words = []
-            for category in vocabulary_manager.get_categories():
-                for word in category['words']:
-                    word_with_category = word.copy()
-                    word_with_category['category_name'] = category['name']
-                    word_with_category['category_display'] = category['display_name']
-                    all_words.append(word_with_category)
-            
-            # Return a random subset
-            random.shuffle(all_words)
-            return all_words[:10]
+            return [WordView(word, category) for category, word in vocabulary_manager.sample_words(10)]
         
-        # Get words due for review from user profile
+        # Get words due for review from the review queue
         due_words = []
-        today = datetime.datetime.now().date()
+        mastered_words = self.user_profile.current_profile['mastered_words']
+        
+        # Words no longer in the vocabulary (e.g. from a removed category)
+        # are skipped before they count toward the limit
+        def in_vocabulary(category_name, word_spanish):
+            return vocabulary_manager.get_word(category_name, word_spanish) is not None
         
-        for category_name, words in self.user_profile.current_profile['mastered_words'].items():
+        for category_name, word_spanish in self.get_due_words(limit, available=in_vocabulary):
             category = vocabulary_manager.get_category_by_name(category_name)
             
-            if not category:
-                continue
-                
-            for word_spanish, word_data in words.items():
-                # Calculate next review date
-                next_review = self.get_next_review_date(
-                    word_data['mastery_level'],
-                    word_data['last_practiced'],
-                    True
-                )
-                
-                # If word is due for review
-                if next_review <= today:
-                    # Find full word data in vocabulary
-                    for vocab_word in category['words']:
-                        if vocab_word['spanish'] == word_spanish:
-                            # Add category info to word
-                            word_with_info = vocab_word.copy()
-                            word_with_info['category_name'] = category['name']
-                            word_with_info['category_display'] = category['display_name']
-                            word_with_info['mastery_level'] = word_data['mastery_level']
-                            due_words.append(word_with_info)
-                            break
-        
-        # If no words are due, get some words that haven't been reviewed yet
-        if not due_words:
-            # Find words not in mastered_words
-            new_words = []
-            for category in vocabulary_manager.get_categories():
-                mastered_words_in_category = self.user_profile.current_profile['mastered_words'].get(category['name'], {})
-                
-                for word in category['words']:
-                    if word['spanish'] not in mastered_words_in_category:
-                        word_with_category = word.copy()
-                        word_with_category['category_name'] = category['name']
-                        word_with_category['category_display'] = category['display_name']
-                        word_with_category['mastery_level'] = 0
-                        new_words.append(word_with_category)
-            
-            # Return a subset of new words
-            random.shuffle(new_words)
-            return new_words[:min(10, len(new_words))]
+            # Find full word data in vocabulary and add category info to it
+            vocab_word = vocabulary_manager.get_word(category_name, word_spanish)
+            mastery = mastered_words[category_name][word_spanish]['mastery_level']
+            due_words.append(WordView(vocab_word, category, {"mastery_level": mastery}))
         
-        # Mix in some new words with due words
+        # Fill up to 10 words with ones that haven't been reviewed yet (all
+        # 10 if none are due)
         if len(due_words) < 10:
-            # Find words not in mastered_words
-            new_words = []
-            for category in vocabulary_manager.get_categories():
-                mastered_words_in_category = self.user_profile.current_profile['mastered_words'].get(category['name'], {})
-                
-                for word in category['words']:
-                    if word['spanish'] not in mastered_words_in_category:
-                        word_with_category = word.copy()
-                        word_with_category['category_name'] = category['name']
-                        word_with_category['category_display'] = category['display_name']
-                        word_with_category['mastery_level'] = 0
-                        new_words.append(word_with_category)
-            
-            # Add some new words
-            random.shuffle(new_words)
-            due_words.extend(new_words[:min(10 - len(due_words), len(new_words))])
+            due_words.extend(self._sample_new_words(vocabulary_manager, 10 - len(due_words)))
         
         return due_words
     
-    def run_spaced_repetition_session(self, vocabulary_manager):
+    def _sample_new_words(self, vocabulary_manager, count):
         """
-        Run a spaced repetition flashcard session
+        Pick random words that aren't in the profile's mastered words
+        
+        Draws from a lazily shuffled word order and skips practiced words,
+        so it only goes through the whole vocabulary when few words are new.
+        """
+        mastered_words = self.user_profile.current_profile['mastered_words']
+        new_words = []
+        
+        for category, word in vocabulary_manager.iter_random_words():
+            if len(new_words) >= count:
+                break
+            if word['spanish'] not in mastered_words.get(category['name'], ()):
+                new_words.append(WordView(word, category, NEW_WORD_FIELDS))
+        
+        return new_words
+    
+    def create_session(self, vocabulary_manager, limit=None, rng=None):
+        """
+        Create a flashcard session over the words due for review
         
         Args:
             vocabulary_manager (VocabularyManager): Vocabulary manager
+            limit (int, optional): Maximum number of due words to include
+            rng (random.Random, optional): Random source for card order and directions
+            
+        Returns:
+            FlashcardSession: The session, or None if no words are available
         """
         # Get words due for review
-        due_words = self.get_words_due_for_review(vocabulary_manager)
+        due_words = self.get_words_due_for_review(vocabulary_manager, limit)
         
         if not due_words:
+            return None
+        
+        # Shuffle words
+        (rng or random).shuffle(due_words)
+        
+        return FlashcardSession(due_words, self.user_profile, rng=rng)
+    
+    def run_spaced_repetition_session(self, vocabulary_manager):
+        """
+        Run a spaced repetition flashcard session
+        
+        Args:
+            vocabulary_manager (VocabularyManager): Vocabulary manager
+        """
+        session = self.create_session(vocabulary_manager)
+        
+        if session is None:
             clear_screen()
             print("\n🇪🇸  SPACED REPETITION  🇪🇸\n")
             print("No words available for review.")
             input("\nPress Enter to return to menu...")
             return
         
-        # Shuffle words
-        random.shuffle(due_words)
-        
-        # Track number of cards reviewed
-        cards_reviewed = 0
-        
-        for word in due_words:
+        while True:
+            card = session.next_card()
+            if card is None:
+                break
+            
+            word = card['word']
             clear_screen()
             print("\n🇪🇸  SPACED REPETITION FLASHCARD  🇪🇸\n")
             
             # Show category and difficulty
-            print(f"Category: {word['category_display']}")
+            print(f"Category: {card['category_display']}")
             if 'difficulty' in word:
                 print(f"Difficulty: {word['difficulty'].capitalize()}")
             
             # Show mastery level if available
-            if 'mastery_level' in word:
-                mastery = word['mastery_level']
+            if card['mastery_level'] is not None:
+                mastery = card['mastery_level']
                 mastery_display = "★" * mastery + "☆" * (5 - mastery)
                 print(f"Mastery: {mastery_display}")
             
-            # Randomly choose direction (Spanish to English or English to Spanish)
-            direction = random.choice([1, 2])
-            
-            if direction == 1:  # Spanish to English
+            if card['direction'] == 1:  # Spanish to English
                 print(f"\nSpanish word: {word['spanish']}")
                 
                 # If pronunciation tip is available, show it
@@ -237,36 +328,26 @@ class SpacedRepetitionSystem:
                     break
                 print("Please enter 'y' or 'n'")
             
-            # Update user profile if available
-            if self.user_profile and self.user_profile.current_profile:
-                self.user_profile.update_word_mastery(
-                    word['spanish'],
-                    word['category_name'],
-                    got_it == 'y'
-                )
-            
-            cards_reviewed += 1
+            session.submit_answer(got_it == 'y')
             
             # Ask if they want to continue
-            if cards_reviewed < len(due_words):
+            if session.remaining > 0:
                 continue_choice = input("\nPress Enter for next word or 'q' to quit: ").lower()
                 if continue_choice == 'q':
                     break
         
         # Update flashcard practice count in user profile
-        if self.user_profile and self.user_profile.current_profile:
-            self.user_profile.update_flashcard_practice(cards_reviewed)
+        summary = session.finish()
         
         # Show session summary
         clear_screen()
         print("\n🇪🇸  SPACED REPETITION SESSION COMPLETE  🇪🇸\n")
-        print(f"You reviewed {cards_reviewed} cards in this session.")
+        print(f"You reviewed {summary['cards_reviewed']} cards in this session.")
         
-        if self.user_profile and self.user_profile.current_profile:
+        if summary['flashcards_practiced'] is not None:
             print("\nYour progress has been saved!")
             
             # Show total flashcards practiced
-            stats = self.user_profile.get_statistics()
-            print(f"Total flashcards practiced: {stats['flashcards_practiced']}")
+            print(f"Total flashcards practiced: {summary['flashcards_practiced']}")
         
-        input("\nPress Enter to return to menu...")
\ No newline at end of file
+        input("\nPress Enter to return to menu...")
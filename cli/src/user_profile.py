@@ -3,22 +3,91 @@ Spanish Learning Chatbot - User Profile Management
 This module handles user profiles, progress tracking, and statistics
 """
 
-import os
-import json
+import time
+import atexit
+import weakref
 import datetime
-from src.utils import save_json_data, load_json_data, create_directory_if_not_exists
+from src.profile_storage import JsonFileStorage, apply_profile_event, new_quiz_rollups, rollup_quiz_history
+from src.metrics import metrics
+
+# Counts every recorded profile change (answers, quiz scores, logins...)
+PROFILE_EVENTS = metrics.counter("profile_events_total", "Profile changes recorded")
+
+# Write-behind profiles to flush at exit; held weakly, so the exit hook
+# doesn't keep discarded profiles alive (flush() one before dropping it)
+_write_behind_profiles = weakref.WeakSet()
+
+@atexit.register
+def _flush_write_behind_profiles():
+    """Flush every live write-behind profile at interpreter exit"""
+    for user_profile in list(_write_behind_profiles):
+        user_profile.flush()
 
 class UserProfile:
-    """Handles user profile creation, loading, and progress tracking"""
+    """
+    Handles user profile creation, loading, and progress tracking
+
+    In write-behind mode, mutations only mark the profile dirty and the file
+    is rewritten by flush(): at the end of a session, after `flush_every`
+    mutations, once `flush_interval` seconds have passed since the last
+    flush, and at interpreter exit. Every flush atomically replaces the
+    file with a complete snapshot, so a hard crash loses at most the
+    mutations made since the last flush (bounded by `flush_every`
+    operations / `flush_interval` seconds) and never leaves a torn file.
+    Flushes can happen in the middle of a session, so the file may hold
+    part of a session's changes.
+
+    In journal mode, each change is recorded as an event (see
+    apply_profile_event) and handed to the storage backend instead of
+    rewriting the snapshot, so an answer costs O(1) to persist. The JSON
+    backend appends events to a per-profile journal that loading replays and
+    compact() folds back into the snapshot once it holds `compact_every`
+    events; backends that prefer events (SQLite) always use this mode.
+    """
     
-    def __init__(self):
-        """Initialize user profile"""
+    def __init__(self, profiles_dir="data/user_profiles", write_behind=False,
+                 flush_every=20, flush_interval=30.0, journal=False, compact_every=500,
+                 storage=None):
+        """
+        Initialize user profile
+        
+        Args:
+            profiles_dir (str, optional): Directory holding profile JSON files
+            write_behind (bool, optional): Defer saves until flush()
+            flush_every (int, optional): Flush after this many deferred mutations
+            flush_interval (float, optional): Flush when this many seconds have
+                passed since the last flush (None to disable)
+            journal (bool, optional): Persist changes to an append-only journal
+            compact_every (int, optional): Compact once the journal holds this
+                many events (None to disable)
+            storage (ProfileStorage, optional): Storage backend (defaults to
+                JSON files in `profiles_dir`)
+        """
         self.current_profile = None
         self.profile_name = None
-        self.profiles_dir = "data/user_profiles"
-        
-        # Ensure profiles directory exists
-        create_directory_if_not_exists(self.profiles_dir)
+        self.profiles_dir = profiles_dir
+        self.storage = storage or JsonFileStorage(profiles_dir)
+        
+        # Write-behind state
+        self.write_behind = write_behind
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._pending_ops = 0
+        self._last_flush = time.monotonic()
+        
+        # Journal state
+        self.journal = journal or self.storage.prefers_events
+        self.compact_every = compact_every
+        self._pending_events = []
+        self._journal_seq = 0
+        
+        # Callbacks notified of every recorded change
+        self._listeners = []
+        
+        # Never lose deferred progress on a normal exit
+        if self.write_behind:
+            _write_behind_profiles.add(self)
         
     def create_profile(self, name):
         """
@@ -33,9 +102,11 @@ class UserProfile:
         # Create a profile ID from the name (lowercase, no spaces)
         profile_id = name.lower().replace(" ", "_")
         
+        # Don't lose deferred changes to the profile we're switching away from
+        self.flush()
+        
         # Check if profile already exists
-        profile_path = os.path.join(self.profiles_dir, f"{profile_id}.json")
-        if os.path.exists(profile_path):
+        if self.storage.exists(profile_id):
             return False
         
         # Create new profile data
@@ -48,18 +119,21 @@ class UserProfile:
                 "flashcards_practiced": 0,
                 "conversations_practiced": 0,
                 "total_score": 0,
-                "quiz_history": []
+                "quiz_history": [],
+                "quiz_rollups": new_quiz_rollups()
             },
             "mastered_words": {},
             "custom_vocabulary": [],
             "last_word_of_day": None,
+            "word_of_day": None,
             "word_of_day_history": []
         }
         
         # Save profile
-        if save_json_data(profile_data, profile_path):
+        if self.storage.save(profile_id, profile_data):
             self.current_profile = profile_data
             self.profile_name = profile_id
+            self._reset_journal_state()
             return True
         
         return False
@@ -76,65 +150,204 @@ class UserProfile:
         """
         # Try to find profile by name or ID
         profile_id = name.lower().replace(" ", "_")
-        profile_path = os.path.join(self.profiles_dir, f"{profile_id}.json")
         
-        if not os.path.exists(profile_path):
+        if not self.storage.exists(profile_id):
             return False
         
+        # Don't lose deferred changes to the profile we're switching away from
+        self.flush()
+        
         try:
-            profile_data = load_json_data(profile_path)
-            profile_data["last_login"] = datetime.datetime.now().isoformat()
-            save_json_data(profile_data, profile_path)
+            profile_data = self.storage.load(profile_id)
+            if profile_data is None:
+                return False
             
             self.current_profile = profile_data
             self.profile_name = profile_id
+            self._reset_journal_state()
+            
+            # One-off: summarize and trim the quiz history of older profiles
+            if rollup_quiz_history(profile_data["statistics"]):
+                self.save_current_profile()
+            
+            self._record({"type": "login", "at": datetime.datetime.now().isoformat()})
             return True
         except Exception as e:
             print(f"Error loading profile: {e}")
             return False
     
+    @metrics.timer("profile_save_seconds", "Time spent saving profile snapshots")
     def save_current_profile(self):
         """Save the current profile to disk"""
         if not self.current_profile or not self.profile_name:
             return False
         
-        profile_path = os.path.join(self.profiles_dir, f"{self.profile_name}.json")
-        return save_json_data(self.current_profile, profile_path)
+        # Record which journal events the snapshot already includes
+        if self._journal_seq:
+            self.current_profile["journal_seq"] = self._journal_seq
+        
+        saved = self.storage.save(self.profile_name, self.current_profile)
+        
+        if saved:
+            self._dirty = False
+            self._pending_ops = 0
+            self._last_flush = time.monotonic()
+            
+            # The snapshot supersedes the journal
+            self._pending_events = []
+        
+        return saved
+    
+    def compact(self):
+        """
+        Fold the journal back into the profile snapshot
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.save_current_profile()
+    
+    def flush(self):
+        """
+        Write deferred changes to disk, if there are any
+        
+        Returns:
+            bool: True if the profile on disk is up to date, False otherwise
+        """
+        if not self._dirty:
+            return True
+        
+        return self._write_pending()
+    
+    def _reset_journal_state(self):
+        """Forget journal bookkeeping for the previously loaded profile"""
+        self._dirty = False
+        self._pending_ops = 0
+        self._pending_events = []
+        self._journal_seq = self.current_profile.get("journal_seq", 0)
+    
+    def add_listener(self, callback):
+        """
+        Register a callback to be notified of every recorded change
+        
+        Args:
+            callback (callable): Called with each event (see apply_profile_event)
+                after it has been applied to the current profile
+        """
+        self._listeners.append(callback)
+    
+    def _record(self, event):
+        """
+        Apply a change to the current profile and persist it
+        
+        Args:
+            event (dict): Change to apply (see apply_profile_event)
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        apply_profile_event(self.current_profile, event)
+        PROFILE_EVENTS.inc()
+        
+        for callback in self._listeners:
+            callback(event)
+        
+        if self.journal:
+            self._journal_seq += 1
+            event["seq"] = self._journal_seq
+            self._pending_events.append(event)
+        
+        return self._commit()
+    
+    def _write_pending(self):
+        """Write pending changes as journal lines or as a full snapshot"""
+        if not self.journal:
+            return self.save_current_profile()
+        
+        if self._pending_events:
+            if not self.storage.append_events(self.profile_name, self._pending_events):
+                return False
+            self._pending_events = []
+        
+        self._dirty = False
+        self._pending_ops = 0
+        self._last_flush = time.monotonic()
+        
+        if self.compact_every and self.storage.journal_length(self.profile_name) >= self.compact_every:
+            return self.compact()
+        
+        return True
+    
+    def _commit(self):
+        """Persist a mutation now, or defer it when write-behind is enabled"""
+        if not self.write_behind:
+            return self._write_pending()
+        
+        self._dirty = True
+        self._pending_ops += 1
+        
+        if self.flush_every and self._pending_ops >= self.flush_every:
+            return self.flush()
+        
+        if self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            return self.flush()
+        
+        return True
+    
+    def delete_profile(self, name):
+        """
+        Delete a user profile
+        
+        Args:
+            name (str): User's name or profile ID
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        profile_id = name.lower().replace(" ", "_")
+        
+        if profile_id == self.profile_name:
+            self.current_profile = None
+            self.profile_name = None
+            self._dirty = False
+            self._pending_events = []
+        
+        return self.storage.delete(profile_id)
+    
+    def get_available_profiles(self, prefix=None, offset=0, limit=None):
+        """
+        Get a list of available profile names, ordered by name
+        
+        Args:
+            prefix (str, optional): Only include names starting with this
+            offset (int, optional): Number of matching profiles to skip
+            limit (int, optional): Maximum number of profiles to return
+            
+        Returns:
+            list: Dicts with 'id', 'name' and 'last_login'
+        """
+        return self.storage.list_profiles(prefix, offset, limit)
     
-    def get_available_profiles(self):
-        """Get a list of available profile names"""
-        profiles = []
-        for filename in os.listdir(self.profiles_dir):
-            if filename.endswith(".json"):
-                profile_id = filename[:-5]  # Remove .json extension
-                try:
-                    profile_data = load_json_data(os.path.join(self.profiles_dir, filename))
-                    profiles.append({
-                        "id": profile_id,
-                        "name": profile_data.get("name", profile_id)
-                    })
-                except:
-                    pass
-        
-        return profiles
+    def count_available_profiles(self, prefix=None):
+        """Count available profiles, optionally only names starting with `prefix`"""
+        return self.storage.count_profiles(prefix)
     
     def update_quiz_score(self, category, score, max_score):
         """
         Update the profile with a new quiz score
         
+        The quiz is added to the daily, weekly and per-category rollups, and
+        only the last QUIZ_HISTORY_LIMIT quizzes are kept in full.
+        
         Args:
             category (str): Quiz category
             score (int): Score achieved
             max_score (int): Maximum possible score
         """
-        if not self.current_profile:
+        if not self.current_profile or max_score <= 0:
             return False
         
-        # Update statistics
-        self.current_profile["statistics"]["quizzes_taken"] += 1
-        self.current_profile["statistics"]["total_score"] += score
-        
-        # Add quiz to history
+        # Add quiz to history and update statistics
         quiz_data = {
             "date": datetime.datetime.now().isoformat(),
             "category": category,
@@ -143,10 +356,8 @@ class UserProfile:
             "percentage": round((score / max_score) * 100, 1)
         }
         
-        self.current_profile["statistics"]["quiz_history"].append(quiz_data)
-        
         # Save changes
-        return self.save_current_profile()
+        return self._record({"type": "quiz", "record": quiz_data})
     
     def update_word_mastery(self, word, category, is_correct):
         """
@@ -160,19 +371,18 @@ class UserProfile:
         if not self.current_profile:
             return False
         
-        if category not in self.current_profile["mastered_words"]:
-            self.current_profile["mastered_words"][category] = {}
+        existing = self.current_profile["mastered_words"].get(category, {}).get(word)
         
-        if word not in self.current_profile["mastered_words"][category]:
-            self.current_profile["mastered_words"][category][word] = {
+        if existing:
+            word_data = existing.copy()
+        else:
+            word_data = {
                 "correct_count": 0,
                 "incorrect_count": 0,
                 "last_practiced": None,
                 "mastery_level": 0  # 0-5 scale: 0=not seen, 5=mastered
             }
         
-        word_data = self.current_profile["mastered_words"][category][word]
-        
         # Update word data
         if is_correct:
             word_data["correct_count"] += 1
@@ -186,7 +396,7 @@ class UserProfile:
         word_data["last_practiced"] = datetime.datetime.now().isoformat()
         
         # Save changes
-        return self.save_current_profile()
+        return self._record({"type": "word_mastery", "category": category, "word": word, "data": word_data})
     
     def get_mastery_level(self, word, category):
         """
@@ -238,11 +448,8 @@ class UserProfile:
             "added_on": datetime.datetime.now().isoformat()
         }
         
-        # Add to profile
-        self.current_profile["custom_vocabulary"].append(word_data)
-        
-        # Save changes
-        return self.save_current_profile()
+        # Add to profile and save changes
+        return self._record({"type": "custom_word", "word": word_data})
     
     def get_custom_words(self):
         """Get all custom words added by the user"""
@@ -256,16 +463,14 @@ class UserProfile:
         if not self.current_profile:
             return False
         
-        self.current_profile["statistics"]["flashcards_practiced"] += count
-        return self.save_current_profile()
+        return self._record({"type": "statistic", "name": "flashcards_practiced", "count": count})
     
     def update_conversation_practice(self, count=1):
         """Update stats for conversation practice"""
         if not self.current_profile:
             return False
         
-        self.current_profile["statistics"]["conversations_practiced"] += count
-        return self.save_current_profile()
+        return self._record({"type": "statistic", "name": "conversations_practiced", "count": count})
     
     def get_statistics(self):
         """Get user statistics"""
@@ -278,6 +483,9 @@ class UserProfile:
         """
         Update the word of the day
         
+        The full word is kept as today's word; the history only keeps its
+        date and 'word_id' (or category and Spanish text without one).
+        
         Args:
             word_data (dict): Word data including spanish, english, etc.
         """
@@ -294,11 +502,8 @@ class UserProfile:
         word_history_entry = word_data.copy()
         word_history_entry["date"] = today
         
-        self.current_profile["last_word_of_day"] = today
-        self.current_profile["word_of_day_history"].append(word_history_entry)
-        
         # Save changes
-        return self.save_current_profile()
+        return self._record({"type": "word_of_day", "entry": word_history_entry})
     
     def get_word_of_day(self):
         """
@@ -314,7 +519,10 @@ class UserProfile:
         
         # Check if we've already set a word today
         if self.current_profile["last_word_of_day"] == today:
-            # Return the latest word
+            if self.current_profile.get("word_of_day"):
+                return self.current_profile["word_of_day"]
+            # Profiles saved before today's word was kept on its own have
+            # full words in their history
             if self.current_profile["word_of_day_history"]:
                 return self.current_profile["word_of_day_history"][-1]
         
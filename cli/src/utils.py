@@ -6,11 +6,26 @@ This module contains utility functions used across the application
 import json
 import os
 import sys
+import uuid
+import threading
+from src.metrics import metrics
+
+# fsync policies for save_json_data()
+FSYNC_NONE = "none"     # Leave flushing to the OS
+FSYNC_FILE = "file"     # fsync the data before it replaces the old file
+FSYNC_DIR = "dir"       # Also fsync the directory so the rename itself is durable
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_FILE, FSYNC_DIR)
+
+# Process-wide cache of parsed JSON files: path -> (mtime_ns, size, data)
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+_json_cache_stats = {"hits": 0, "misses": 0}
 
 def clear_screen():
     """Clear the terminal screen based on OS"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
+@metrics.timer("json_load_seconds", "Time spent reading and parsing JSON files")
 def load_json_data(file_path):
     """
     Load data from a JSON file
@@ -35,24 +50,259 @@ def load_json_data(file_path):
         print(f"Error: Invalid JSON format in {file_path}")
         sys.exit(1)
 
-def save_json_data(data, file_path):
+def _file_signature(file_path):
+    """Get (mtime_ns, size) of a file, or None if it can't be read"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def load_json_cached(file_path):
+    """
+    Load data from a JSON file through the process-wide cache
+
+    Repeated loads of an unchanged file return the same parsed object
+    without touching its contents; a file whose mtime or size changed is
+    parsed again. The returned data is shared by every caller, so treat it
+    as read-only: copy it before changing it. save_json_data() keeps the
+    cache in step with the file, with a copy of its own.
+
+    Args:
+        file_path (str): Path to the JSON file
+
+    Returns:
+        dict: Loaded JSON data
+
+    Raises:
+        SystemExit: If file cannot be loaded
+    """
+    key = os.path.abspath(file_path)
+    signature = _file_signature(key)
+
+    with _json_cache_lock:
+        entry = _json_cache.get(key)
+        if entry is not None and signature is not None and entry[:2] == signature:
+            _json_cache_stats["hits"] += 1
+            return entry[2]
+        _json_cache_stats["misses"] += 1
+
+    data = load_json_data(file_path)
+
+    # A file that couldn't be stat'ed (e.g. created meanwhile) can't be
+    # checked for changes later, so it isn't cached
+    if signature is not None:
+        with _json_cache_lock:
+            _json_cache[key] = (*signature, data)
+    return data
+
+def json_cache_info():
+    """
+    Get JSON cache statistics
+
+    Returns:
+        dict: 'hits', 'misses' and number of cached 'files'
+    """
+    with _json_cache_lock:
+        return dict(_json_cache_stats, files=len(_json_cache))
+
+def clear_json_cache():
+    """Drop every cached file and reset the hit/miss counters"""
+    with _json_cache_lock:
+        _json_cache.clear()
+        _json_cache_stats["hits"] = 0
+        _json_cache_stats["misses"] = 0
+
+def _refresh_cached(text, file_path):
+    """
+    Update a cached file's entry after a save
+
+    The entry gets its own copy, parsed from the saved text, so the caller's
+    later changes to its data never reach other readers of the cache.
+    """
+    key = os.path.abspath(file_path)
+
+    with _json_cache_lock:
+        if key not in _json_cache:
+            return
+
+    data = json.loads(text)
+    signature = _file_signature(key)
+
+    with _json_cache_lock:
+        if key not in _json_cache:
+            return
+        if signature is None:
+            del _json_cache[key]
+        else:
+            _json_cache[key] = (*signature, data)
+
+def _fsync_directory(directory):
+    """fsync a directory so renames inside it survive a crash"""
+    # Directories can't be opened for fsync on Windows
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@metrics.timer("json_save_seconds", "Time spent writing JSON files")
+def save_json_data(data, file_path, fsync=FSYNC_NONE, compact=False):
     """
     Save data to a JSON file
 
+    The data is written to a temporary file in the same directory, which
+    then replaces the destination in one rename, so readers and crashes
+    only ever see the old or the new file, never a truncated one.
+
     Args:
         data (dict): Data to save
         file_path (str): Path to save the JSON file
+        fsync (str, optional): FSYNC_NONE, FSYNC_FILE or FSYNC_DIR
+        compact (bool, optional): Write without indentation or spaces
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+
+    directory = os.path.dirname(file_path) or "."
+    temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        # Encode in one call: json.dump() writes in many small chunks
+        if compact:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            text = json.dumps(data, ensure_ascii=False, indent=2)
+
+        with open(temp_path, 'x', encoding='utf-8') as file:
+            file.write(text)
+            if fsync != FSYNC_NONE:
+                file.flush()
+                os.fsync(file.fileno())
+
+        os.replace(temp_path, file_path)
+        if fsync == FSYNC_DIR:
+            _fsync_directory(directory)
+
+        _refresh_cached(text, file_path)
+        return True
+    except Exception as e:
+        print(f"Error saving data: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+def append_json_lines(records, file_path, fsync=FSYNC_NONE):
+    """
+    Append records to a JSON Lines file, one JSON object per line
+
+    If a crash left the file ending in a torn line, the records start on a
+    new line, so only the torn record is lost on loading.
+
+    Args:
+        records (list): Records to append
+        file_path (str): Path to the JSON Lines file
+        fsync (str, optional): FSYNC_NONE, or FSYNC_FILE / FSYNC_DIR to
+            fsync the file (and, when it was just created, its directory)
 
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, ensure_ascii=False, indent=2)
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode('utf-8')
+        created = not os.path.exists(file_path)
+        with open(file_path, 'a+b') as file:
+            # Don't continue a torn last line
+            if file.seek(0, os.SEEK_END):
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    lines = b"\n" + lines
+            file.write(lines)
+            if fsync != FSYNC_NONE:
+                file.flush()
+                os.fsync(file.fileno())
+        if created and fsync == FSYNC_DIR:
+            _fsync_directory(os.path.dirname(file_path) or ".")
+        return True
+    except Exception as e:
+        print(f"Error appending data: {e}")
+        return False
+
+def save_json_lines(records, file_path, fsync=FSYNC_NONE):
+    """
+    Save records to a JSON Lines file, replacing it atomically
+
+    Records are written one at a time, so a generator can stream a large
+    file without building it in memory.
+
+    Args:
+        records (iterable): Records to save
+        file_path (str): Path to the JSON Lines file
+        fsync (str, optional): FSYNC_NONE, FSYNC_FILE or FSYNC_DIR
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+
+    directory = os.path.dirname(file_path) or "."
+    temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+
+    try:
+        with open(temp_path, 'x', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if fsync != FSYNC_NONE:
+                file.flush()
+                os.fsync(file.fileno())
+
+        os.replace(temp_path, file_path)
+        if fsync == FSYNC_DIR:
+            _fsync_directory(directory)
         return True
     except Exception as e:
         print(f"Error saving data: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
         return False
+
+def load_json_lines(file_path):
+    """
+    Load records from a JSON Lines file
+
+    A torn final line (left by a crash in the middle of an append) is
+    skipped rather than treated as an error.
+
+    Args:
+        file_path (str): Path to the JSON Lines file
+
+    Returns:
+        list: Loaded records, or an empty list if the file doesn't exist
+    """
+    records = []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
     
 def create_directory_if_not_exists(directory):
     """
@@ -3,26 +3,138 @@ Spanish Learning Chatbot - Vocabulary Management
 This module handles vocabulary operations including adding, updating, and retrieving vocabulary
 """
 
+import copy
 import random
 import json
 import datetime
-from src.utils import save_json_data, load_json_data, clear_screen
+from src.utils import save_json_data, load_json_cached, clear_screen
+from src.vocabulary_search import VocabularySearch
+from src.word_view import WordView
+from src.word_index import WordIndex
+from src.word_of_day import WordOfDaySelector
+from src.vocabulary_stream import is_vocabulary_lines, load_vocabulary_lines, save_vocabulary_lines
 
 class VocabularyManager:
     """Class for handling vocabulary operations"""
     
-    def __init__(self, vocabulary_file='data/vocabulary.json'):
+    def __init__(self, vocabulary_file='data/vocabulary.json', categories=None, difficulties=None):
         """
         Initialize with vocabulary file path
         
+        A '.jsonl' file is read in the streaming format one word at a time,
+        indexing words as they are read, and can be limited to some
+        categories or difficulties. A limited load holds only part of the
+        file, so it can't be saved back.
+        
+        A '.json' file comes from the shared JSON cache, so other managers
+        on the same file hold the same data; it is copied once, before this
+        manager first changes it, and the copy stays this manager's own.
+        
         Args:
-            vocabulary_file (str): Path to vocabulary JSON file
+            vocabulary_file (str): Path to vocabulary JSON or JSON Lines file
+            categories (list, optional): Only load these categories ('.jsonl' only)
+            difficulties (list, optional): Only load these difficulties ('.jsonl' only)
         """
         self.vocabulary_file = vocabulary_file
-        self.vocabulary = load_json_data(vocabulary_file)
+        self.partial = categories is not None or difficulties is not None
+        
+        # Whether self.vocabulary is the JSON cache's shared copy
+        self._shared = False
+        
+        if is_vocabulary_lines(vocabulary_file):
+            self._reset_indexes()
+            self.vocabulary = load_vocabulary_lines(
+                vocabulary_file, categories, difficulties,
+                on_category=self._index_category, on_word=self._index_word
+            )
+        else:
+            if self.partial:
+                raise ValueError("Only '.jsonl' vocabulary files can be loaded by category or difficulty")
+            self.vocabulary = load_json_cached(vocabulary_file)
+            self._shared = True
+            self._build_indexes()
+    
+    def _reset_indexes(self):
+        """Start with empty lookup indexes"""
+        self._categories_by_name = {}
+        self._categories_by_display_name = {}
+        self._words_by_key = {}
+        self._words_by_difficulty = {}
+        self._word_index = WordIndex()
+        self._search_index = None
+        # Its queues are drawn from the word index, so it starts over with it
+        self.word_of_day_selector = WordOfDaySelector(self)
+    
+    def _build_indexes(self):
+        """
+        Build lookup indexes over the loaded vocabulary
+        
+        Lookups by name return the first match, as the linear scans they
+        replace did; the words of every category are indexed, including
+        categories whose name is already taken.
+        """
+        self._reset_indexes()
+        
+        for category in self.vocabulary['categories']:
+            self._index_category(category)
+    
+    def _index_category(self, category):
+        """Add a category and its words to the indexes"""
+        self._categories_by_display_name.setdefault(category['display_name'], category)
+        self._categories_by_name.setdefault(category['name'], category)
+        
+        for word in category['words']:
+            self._index_word(category, word)
+    
+    def _index_word(self, category, word):
+        """Add a word to the indexes"""
+        self._words_by_key.setdefault((category['name'], word['spanish']), word)
+        self._words_by_difficulty.setdefault(word.get('difficulty'), []).append(word)
+        self._word_index.add_word(category)
+        
+        if self._search_index is not None:
+            self._search_index.add_word(word, category['name'], category['display_name'])
+    
+    def _own_vocabulary(self):
+        """Copy the shared cached vocabulary, and re-index it, before changing it"""
+        if not self._shared:
+            return
+        
+        self.vocabulary = copy.deepcopy(self.vocabulary)
+        self._shared = False
+        self._build_indexes()
+    
+    def get_search_index(self):
+        """
+        Get the search index over all words, building it on first use
+        
+        Returns:
+            VocabularySearch: The index
+        """
+        if self._search_index is None:
+            self._search_index = VocabularySearch.from_vocabulary(self.vocabulary)
+        return self._search_index
+    
+    def search_words(self, query, limit=10):
+        """
+        Search words by Spanish or English text, ignoring accents and case
+        
+        Args:
+            query (str): Text to search for; typos are tolerated
+            limit (int, optional): Maximum number of results
+            
+        Returns:
+            list: Matching words with their category info
+        """
+        return self.get_search_index().search(query, limit)
     
     def save_vocabulary(self):
         """Save current vocabulary to file"""
+        if self.partial:
+            print("Error: Only part of the vocabulary was loaded, so it can't be saved")
+            return False
+        if is_vocabulary_lines(self.vocabulary_file):
+            return save_vocabulary_lines(self.vocabulary, self.vocabulary_file)
         return save_json_data(self.vocabulary, self.vocabulary_file)
     
     def get_categories(self):
@@ -31,17 +143,72 @@ class VocabularyManager:
     
     def get_category_by_name(self, name):
         """Get a category by its name"""
-        for category in self.vocabulary['categories']:
-            if category['name'] == name:
-                return category
-        return None
+        return self._categories_by_name.get(name)
     
     def get_category_by_display_name(self, display_name):
         """Get a category by its display name"""
-        for category in self.vocabulary['categories']:
-            if category['display_name'] == display_name:
-                return category
-        return None
+        return self._categories_by_display_name.get(display_name)
+    
+    def get_word(self, category_name, spanish_word):
+        """
+        Get a word by its category name and Spanish text
+        
+        Args:
+            category_name (str): Category name
+            spanish_word (str): Spanish word
+            
+        Returns:
+            dict: The word data, or None if not found
+        """
+        return self._words_by_key.get((category_name, spanish_word))
+    
+    def random_word(self, rng=random, weight=None):
+        """
+        Pick a random word in constant time
+        
+        Args:
+            rng (random.Random, optional): Random source
+            weight (callable, optional): Maps (category, word) to a
+                non-negative weight, for picks proportional to it; it should
+                depend on the word's own fields only
+            
+        Returns:
+            tuple: (category, word), or None if there are no words
+        """
+        if weight is None:
+            return self._word_index.choice(rng)
+        return self._word_index.weighted_choice(weight, rng)
+    
+    def count_words(self):
+        """Get the number of words in the vocabulary"""
+        return len(self._word_index)
+    
+    def sample_words(self, k, rng=random):
+        """
+        Pick k different random words without going through the vocabulary
+        
+        Args:
+            k (int): Number of words
+            rng (random.Random, optional): Random source
+            
+        Returns:
+            list: (category, word) tuples, in random order
+        """
+        return self._word_index.sample(k, rng)
+    
+    def iter_random_words(self, rng=random):
+        """
+        Yield every word once in random order, shuffling lazily, for
+        sampling with a filter: taking the first k matches costs about
+        k / (fraction of words matching) steps
+        
+        Args:
+            rng (random.Random, optional): Random source
+            
+        Yields:
+            tuple: (category, word)
+        """
+        return self._word_index.shuffled(rng)
     
     def get_word_of_day(self, user_profile=None):
         """
@@ -59,20 +226,19 @@ class VocabularyManager:
             if existing_word:
                 return existing_word
         
-        # Select a random word
-        all_words = []
-        for category in self.vocabulary['categories']:
-            # Add category name to each word for reference
-            for word in category['words']:
-                word_with_category = word.copy()
-                word_with_category['category_name'] = category['name']
-                word_with_category['category_display'] = category['display_name']
-                all_words.append(word_with_category)
-        
-        if not all_words:
+        # Pick a word the learner hasn't been shown, copying only that word
+        position = self.word_of_day_selector.pick(user_profile)
+        
+        if position is None:
             return None
         
-        word_of_day = random.choice(all_words)
+        category, word = self._word_index.get(position)
+        word_of_day = WordView(word, category).copy()
+        
+        # The history records the word by its position, which only means
+        # the same word to a manager holding the whole vocabulary
+        if not self.partial:
+            word_of_day["word_id"] = position
         
         # Save to user profile if available
         if user_profile and user_profile.current_profile:
@@ -109,12 +275,10 @@ class VocabularyManager:
         if pronunciation_tip:
             word_data["pronunciation_tip"] = pronunciation_tip
         
+        self._own_vocabulary()
+        
         # Find or create category
-        target_category = None
-        for cat in self.vocabulary['categories']:
-            if cat['name'] == category:
-                target_category = cat
-                break
+        target_category = self.get_category_by_name(category)
         
         # If category doesn't exist, create it
         if not target_category:
@@ -125,10 +289,12 @@ class VocabularyManager:
                 "words": []
             }
             self.vocabulary['categories'].append(new_category)
+            self._index_category(new_category)
             target_category = new_category
         
         # Add word to category
         target_category['words'].append(word_data)
+        self._index_word(target_category, word_data)
         
         # Save changes
         return self.save_vocabulary()
@@ -145,9 +311,10 @@ class VocabularyManager:
             bool: True if successful, False otherwise
         """
         # Check if category already exists
-        for category in self.vocabulary['categories']:
-            if category['name'] == name:
-                return False
+        if self.get_category_by_name(name):
+            return False
+        
+        self._own_vocabulary()
         
         # Create new category
         new_category = {
@@ -157,6 +324,7 @@ class VocabularyManager:
         }
         
         self.vocabulary['categories'].append(new_category)
+        self._index_category(new_category)
         
         # Save changes
         return self.save_vocabulary()
@@ -171,14 +339,7 @@ class VocabularyManager:
         Returns:
             list: List of words with the specified difficulty
         """
-        words = []
-        
-        for category in self.vocabulary['categories']:
-            for word in category['words']:
-                if word.get('difficulty') == difficulty:
-                    words.append(word)
-        
-        return words
+        return list(self._words_by_difficulty.get(difficulty, []))
     
     def get_words_by_mastery(self, user_profile, mastery_level):
         """
@@ -189,7 +350,7 @@ class VocabularyManager:
             mastery_level (int): Mastery level to filter by (0-5)
             
         Returns:
-            list: Words with specified mastery level
+            list: WordViews of the words with specified mastery level
         """
         if not user_profile or not user_profile.current_profile:
             return []
@@ -205,14 +366,10 @@ class VocabularyManager:
             for word_spanish, word_data in words.items():
                 if word_data['mastery_level'] == mastery_level:
                     # Find full word data in vocabulary
-                    for vocab_word in category['words']:
-                        if vocab_word['spanish'] == word_spanish:
-                            # Add category info to word
-                            word_with_info = vocab_word.copy()
-                            word_with_info['category_name'] = category['name']
-                            word_with_info['category_display'] = category['display_name']
-                            result_words.append(word_with_info)
-                            break
+                    vocab_word = self.get_word(category_name, word_spanish)
+                    if vocab_word:
+                        # Add category info to word
+                        result_words.append(WordView(vocab_word, category))
         
         return result_words
     
@@ -228,19 +385,32 @@ class VocabularyManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        category = self.get_category_by_name(category_name)
-        
-        if not category:
+        if not self.get_word(category_name, spanish_word):
             return False
         
-        for i, word in enumerate(category['words']):
-            if word['spanish'] == spanish_word:
-                # Update the word
-                for key, value in new_data.items():
-                    if key != 'spanish':  # Don't change the spanish word itself
-                        category['words'][i][key] = value
-                
-                # Save changes
-                return self.save_vocabulary()
+        self._own_vocabulary()
+        word = self.get_word(category_name, spanish_word)
+        
+        old_difficulty = word.get('difficulty')
+        old_english = word.get('english')
+        
+        # Update the word
+        for key, value in new_data.items():
+            if key != 'spanish':  # Don't change the spanish word itself
+                word[key] = value
         
-        return False
\ No newline at end of file
+        # Move the word to its new difficulty bucket
+        if word.get('difficulty') != old_difficulty:
+            bucket = self._words_by_difficulty[old_difficulty]
+            del bucket[next(i for i, w in enumerate(bucket) if w is word)]
+            self._words_by_difficulty.setdefault(word.get('difficulty'), []).append(word)
+        
+        # Searchable text changed: rebuild the search index on next use
+        if word.get('english') != old_english:
+            self._search_index = None
+        
+        # Cached sampling weights may depend on the changed fields
+        self._word_index.invalidate_weights()
+        
+        # Save changes
+        return self.save_vocabulary()
\ No newline at end of file
@@ -0,0 +1,440 @@
+"""
+Spanish Learning Chatbot - Vocabulary Search
+This module provides accent-insensitive prefix and fuzzy search over
+vocabulary words
+"""
+
+import re
+import bisect
+import heapq
+import unicodedata
+
+# Pattern splitting normalized text into searchable tokens
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Fields that can be searched
+SEARCH_FIELDS = ("spanish", "english")
+
+# Shortest query words that get typo tolerance of 1 and 2 edits in search()
+FUZZY_MIN_LENGTH = 3
+FUZZY_TWO_EDITS_MIN_LENGTH = 6
+
+
+def normalize_text(text):
+    """
+    Normalize text for searching: strip accents and casefold
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Text with combining marks removed (so 'á' and 'ñ' match 'a'
+            and 'n'), casefolded and with surrounding whitespace stripped
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+
+def _pattern_masks(pattern):
+    """Map each character of a pattern to the bitmask of its positions"""
+    masks = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _bounded_distance(masks, length, text, max_distance):
+    """
+    Levenshtein distance from a pattern to text using Myers' bit-vector
+    algorithm, giving up as soon as it must exceed max_distance
+
+    Args:
+        masks (dict): _pattern_masks() of the pattern
+        length (int): Length of the pattern
+        text (str): Text to compare against
+        max_distance (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger
+    """
+    too_far = max_distance + 1
+    if abs(length - len(text)) > max_distance:
+        return too_far
+    if not length:
+        return len(text)
+
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    positive, negative = full, 0
+    score = length
+    remaining = len(text)
+
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        plus = negative | (~(horizontal | positive) & full)
+        minus = positive & horizontal
+
+        if plus & high:
+            score += 1
+        elif minus & high:
+            score -= 1
+
+        # Each remaining character can lower the distance by at most one
+        remaining -= 1
+        if score - remaining > max_distance:
+            return too_far
+
+        plus = ((plus << 1) | 1) & full
+        minus = (minus << 1) & full
+        positive = minus | (~(vertical | plus) & full)
+        negative = plus & vertical
+
+    return score if score <= max_distance else too_far
+
+
+def _bounded_transposition_distance(masks, length, text, max_distance):
+    """
+    Optimal string alignment distance from a pattern to text: Levenshtein
+    distance where swapping two adjacent characters also counts as one
+    edit. Uses Hyyrö's extension of the bit-vector algorithm and gives up
+    as soon as the distance must exceed max_distance.
+
+    Args:
+        masks (dict): _pattern_masks() of the pattern
+        length (int): Length of the pattern
+        text (str): Text to compare against
+        max_distance (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger
+    """
+    too_far = max_distance + 1
+    if abs(length - len(text)) > max_distance:
+        return too_far
+    if not length:
+        return len(text)
+
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+    positive, negative = full, 0
+    diagonal, previous_equal = 0, 0
+    score = length
+    remaining = len(text)
+
+    for char in text:
+        equal = masks.get(char, 0)
+        # Pattern positions where this and the previous text character
+        # match swapped, and the diagonal before them didn't already match
+        transposed = (((~diagonal & equal) << 1) & previous_equal) & full
+        diagonal = (((equal & positive) + positive) ^ positive) | equal | negative | transposed
+        plus = negative | (~(diagonal | positive) & full)
+        minus = diagonal & positive
+
+        if plus & high:
+            score += 1
+        elif minus & high:
+            score -= 1
+
+        # Each remaining character can lower the distance by at most one
+        remaining -= 1
+        if score - remaining > max_distance:
+            return too_far
+
+        shifted = ((plus << 1) | 1) & full
+        negative = shifted & diagonal
+        positive = ((minus << 1) & full) | (~(shifted | diagonal) & full)
+        previous_equal = equal
+
+    return score if score <= max_distance else too_far
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Compute the Levenshtein distance between two strings, up to a bound
+
+    Args:
+        a (str): First string
+        b (str): Second string
+        max_distance (int): Largest distance of interest
+
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger
+    """
+    return _bounded_distance(_pattern_masks(a), len(a), b, max_distance)
+
+
+def _deletes(text, distance):
+    """Get every string made by deleting up to `distance` characters"""
+    results = {text}
+    frontier = {text}
+
+    for _ in range(distance):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))} - results
+        results |= frontier
+
+    return results
+
+
+class VocabularySearch:
+    """
+    Search index over Spanish and English word fields
+
+    Prefix search bisects a sorted array of normalized keys per field (each
+    whole field plus each token in it), so a query costs O(log n + limit).
+    Fuzzy search uses symmetric deletes: every token is stored under the
+    strings made by deleting up to `max_edit_distance` characters from its
+    first `prefix_length` characters, and a query looks up its own deletes
+    and verifies the few candidates with a bounded edit distance.
+
+    Entries can be added at any time; the sorted arrays are rebuilt on the
+    next prefix search after a change.
+    """
+
+    def __init__(self, max_edit_distance=2, prefix_length=7):
+        """
+        Initialize an empty index
+
+        Args:
+            max_edit_distance (int, optional): Largest edit distance fuzzy
+                search supports
+            prefix_length (int, optional): Characters of each token indexed
+                for fuzzy search
+        """
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.entries = []
+        self._keys = {field: [] for field in SEARCH_FIELDS}
+        self._sorted = True
+        self._token_ids = {}
+        self._tokens = []
+        self._token_entries = []
+        self._deletes = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_vocabulary(cls, vocabulary, custom_words=None, **options):
+        """
+        Build an index over vocabulary data and custom words
+
+        Args:
+            vocabulary (dict): Vocabulary data with a 'categories' list
+            custom_words (list, optional): A profile's custom words
+            **options: Passed to the constructor
+
+        Returns:
+            VocabularySearch: The index
+        """
+        index = cls(**options)
+        for category in vocabulary['categories']:
+            for word in category['words']:
+                index.add_word(word, category['name'], category['display_name'])
+        for word in custom_words or []:
+            index.add_word(word, word.get('category', 'custom'), word.get('category', 'custom').capitalize(), "custom")
+        return index
+
+    def add_word(self, word, category_name, category_display, source="vocabulary"):
+        """
+        Add a word to the index
+
+        Args:
+            word (dict): Word data with 'spanish' and 'english'
+            category_name (str): Name of the word's category
+            category_display (str): Display name of the word's category
+            source (str, optional): Where the word comes from, e.g. 'custom'
+        """
+        entry_id = len(self.entries)
+        self.entries.append({
+            "spanish": word['spanish'],
+            "english": word['english'],
+            "category_name": category_name,
+            "category_display": category_display,
+            "source": source,
+            "word": word
+        })
+
+        for field in SEARCH_FIELDS:
+            text = normalize_text(word[field])
+            tokens = TOKEN_PATTERN.findall(text)
+            keys = self._keys[field]
+
+            keys.append((text, entry_id))
+            for token in set(tokens):
+                if token != text:
+                    keys.append((token, entry_id))
+                self._add_token(token, entry_id)
+
+        self._sorted = False
+
+    def _add_token(self, token, entry_id):
+        """Register an entry under a token for fuzzy search"""
+        token_id = self._token_ids.get(token)
+
+        if token_id is None:
+            token_id = len(self._tokens)
+            self._token_ids[token] = token_id
+            self._tokens.append(token)
+            self._token_entries.append([])
+            for delete in _deletes(token[:self.prefix_length], self.max_edit_distance):
+                self._deletes.setdefault(delete, []).append(token_id)
+
+        entries = self._token_entries[token_id]
+        if not entries or entries[-1] != entry_id:
+            entries.append(entry_id)
+
+    def _ensure_sorted(self):
+        """Sort the prefix arrays after entries were added"""
+        if not self._sorted:
+            for keys in self._keys.values():
+                keys.sort()
+            self._sorted = True
+
+    def _result(self, entry_id, **extra):
+        """Build a search result from an entry"""
+        result = dict(self.entries[entry_id])
+        result.update(extra)
+        return result
+
+    def prefix_search(self, query, limit=10, field=None):
+        """
+        Find words with a field or a token in it starting with the query
+
+        Args:
+            query (str): Text to search for (accents and case are ignored)
+            limit (int, optional): Maximum number of results
+            field (str, optional): Only search 'spanish' or 'english'
+
+        Returns:
+            list: Matching entries ordered by the matched key, each with the
+                word's fields, category and the 'field' that matched
+        """
+        prefix = normalize_text(query)
+        if not prefix or limit <= 0:
+            return []
+
+        self._ensure_sorted()
+        ranges = []
+        for name in ([field] if field else SEARCH_FIELDS):
+            keys = self._keys[name]
+            start = bisect.bisect_left(keys, (prefix,))
+            ranges.append(((key, entry_id, name) for key, entry_id in self._iterate(keys, start, prefix)))
+
+        results = []
+        seen = set()
+        for key, entry_id, name in heapq.merge(*ranges):
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            results.append(self._result(entry_id, field=name))
+            if len(results) == limit:
+                break
+
+        return results
+
+    @staticmethod
+    def _iterate(keys, start, prefix):
+        """Yield sorted keys from `start` while they match a prefix"""
+        for i in range(start, len(keys)):
+            key = keys[i]
+            if not key[0].startswith(prefix):
+                return
+            yield key
+
+    def fuzzy_search(self, query, max_distance=None, limit=10):
+        """
+        Find words with a token within a small edit distance of the query
+
+        Args:
+            query (str): A single word (accents and case are ignored)
+            max_distance (int, optional): Largest edit distance, at most the
+                index's max_edit_distance (default)
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Matching entries, closest first, each with the matched
+                'token' and its 'distance'
+        """
+        term = normalize_text(query)
+        if max_distance is None or max_distance > self.max_edit_distance:
+            max_distance = self.max_edit_distance
+        if not term or limit <= 0:
+            return []
+
+        # Look up the query's deletes one depth at a time: after depth k every
+        # token within distance k has been seen, so stop once they fill `limit`
+        matches = []
+        checked = set()
+        tokens = self._tokens
+        masks = _pattern_masks(term)
+        looked_up = set()
+        frontier = {term[:self.prefix_length]}
+
+        for depth in range(max_distance + 1):
+            if depth:
+                frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))} - looked_up
+            looked_up |= frontier
+
+            for delete in frontier:
+                for token_id in self._deletes.get(delete, ()):
+                    if token_id in checked:
+                        continue
+                    checked.add(token_id)
+
+                    token = tokens[token_id]
+                    if abs(len(token) - len(term)) > max_distance:
+                        continue
+                    distance = _bounded_distance(masks, len(term), token, max_distance)
+                    if distance <= max_distance:
+                        matches.append((distance, token, token_id))
+
+            close_entries = set()
+            for distance, token, token_id in matches:
+                if distance <= depth:
+                    close_entries.update(self._token_entries[token_id])
+            if len(close_entries) >= limit:
+                break
+
+        matches.sort()
+
+        results = []
+        seen = set()
+        for distance, token, token_id in matches:
+            for entry_id in self._token_entries[token_id]:
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                results.append(self._result(entry_id, token=token, distance=distance))
+                if len(results) == limit:
+                    return results
+
+        return results
+
+    def search(self, query, limit=10):
+        """
+        Find words by prefix, topped up with fuzzy matches for typos
+
+        Args:
+            query (str): Text to search for
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Prefix matches first, then fuzzy matches of the last word
+                of the query (1 edit for short words, 2 for long ones)
+        """
+        results = self.prefix_search(query, limit)
+        tokens = TOKEN_PATTERN.findall(normalize_text(query))
+
+        if len(results) < limit and tokens and len(tokens[-1]) >= FUZZY_MIN_LENGTH:
+            max_distance = 2 if len(tokens[-1]) >= FUZZY_TWO_EDITS_MIN_LENGTH else 1
+            seen = {id(result['word']) for result in results}
+            for result in self.fuzzy_search(tokens[-1], max_distance, limit):
+                if id(result['word']) not in seen:
+                    seen.add(id(result['word']))
+                    results.append(result)
+                    if len(results) == limit:
+                        break
+
+        return results
@@ -0,0 +1,177 @@
+"""
+Spanish Learning Chatbot - Streaming Vocabulary Format
+This module reads and writes vocabulary as JSON Lines, one word per line,
+so very large word lists can be loaded without parsing one huge document
+
+Each line is a word object with the usual fields plus its 'category'. A
+line with only 'category' and 'category_display' declares a category, so
+display names and empty categories survive a round trip:
+
+    {"category": "food", "category_display": "Food"}
+    {"category": "food", "spanish": "Pan", "english": "Bread", ...}
+"""
+
+import re
+import sys
+import json
+from src.utils import save_json_lines, FSYNC_NONE
+
+# File suffix that selects the streaming format
+VOCABULARY_LINES_SUFFIX = ".jsonl"
+
+# Per-line fields that describe the word's category rather than the word
+CATEGORY_FIELDS = ("category", "category_display")
+
+# Decoder whose scanner parses a line without json.loads()'s per-call checks
+_decoder = json.JSONDecoder()
+
+
+def _parse_line(line):
+    """Parse one JSON Lines record, taking the fast path for clean lines"""
+    try:
+        record, end = _decoder.scan_once(line, 0)
+        if not line[end:].strip():
+            return record
+    except StopIteration:
+        pass
+    # Leading whitespace, trailing data or invalid JSON
+    return json.loads(line)
+
+
+def _category_filter(categories):
+    """
+    Build a pattern that every line of the given categories contains, so
+    other lines can be skipped without parsing them
+
+    Returns None when a name might be escaped differently in the file.
+    """
+    if not all(name.isascii() and json.dumps(name) == f'"{name}"' for name in categories):
+        return None
+    return re.compile("|".join(re.escape(f'"{name}"') for name in categories))
+
+
+def is_vocabulary_lines(file_path):
+    """
+    Check whether a vocabulary file uses the streaming format
+
+    Args:
+        file_path (str): Path to the vocabulary file
+
+    Returns:
+        bool: True for JSON Lines files
+    """
+    return file_path.endswith(VOCABULARY_LINES_SUFFIX)
+
+
+def load_vocabulary_lines(file_path, categories=None, difficulties=None, on_category=None, on_word=None):
+    """
+    Load a JSON Lines vocabulary file one line at a time
+
+    Only the kept words are ever held in memory. Categories appear in the
+    order they are first seen, by declaration or by word; words of a
+    category don't need to be contiguous in the file.
+
+    Args:
+        file_path (str): Path to the JSON Lines file
+        categories (iterable, optional): Only load these category names
+        difficulties (iterable, optional): Only load words of these difficulties
+        on_category (callable, optional): Called with each new category dict
+        on_word (callable, optional): Called with (category, word) for each
+            kept word, after it was added to its category
+
+    Returns:
+        dict: Vocabulary data with a 'categories' list, shaped like
+            data/vocabulary.json
+
+    Raises:
+        SystemExit: If the file is missing or has an invalid line
+    """
+    categories = set(categories) if categories is not None else None
+    prefilter = _category_filter(categories) if categories is not None else None
+    difficulties = set(difficulties) if difficulties is not None else None
+    vocabulary = {"categories": []}
+    by_name = {}
+    # Each line parses into new key strings (json.load shares them across a
+    # whole document), so share repeated keys and difficulties here
+    shared = {}
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip() or (prefilter and not prefilter.search(line)):
+                    continue
+                try:
+                    word = _parse_line(line)
+                    name = word['category']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    print(f"Error: Invalid vocabulary entry on line {line_number} of {file_path}")
+                    sys.exit(1)
+
+                if categories is not None and name not in categories:
+                    continue
+                is_word = 'spanish' in word
+                if is_word and difficulties is not None and word.get('difficulty') not in difficulties:
+                    continue
+
+                category = by_name.get(name)
+                if category is None:
+                    category = {
+                        "name": name,
+                        "display_name": word.get('category_display') or name.capitalize(),
+                        "words": []
+                    }
+                    by_name[name] = category
+                    vocabulary['categories'].append(category)
+                    if on_category:
+                        on_category(category)
+                if not is_word:
+                    continue
+
+                for field in CATEGORY_FIELDS:
+                    word.pop(field, None)
+                word = {shared.setdefault(key, key): value for key, value in word.items()}
+                if isinstance(word.get('difficulty'), str):
+                    word['difficulty'] = shared.setdefault(word['difficulty'], word['difficulty'])
+                category['words'].append(word)
+                if on_word:
+                    on_word(category, word)
+    except FileNotFoundError:
+        print(f"Error: Could not find file {file_path}")
+        print("Make sure you have the correct data files in the 'data' directory")
+        sys.exit(1)
+
+    return vocabulary
+
+
+def vocabulary_lines(vocabulary):
+    """
+    Yield the JSON Lines records of a vocabulary: each category's
+    declaration followed by its words
+
+    Args:
+        vocabulary (dict): Vocabulary data with a 'categories' list
+
+    Yields:
+        dict: A category declaration, or a word with its 'category'
+    """
+    for category in vocabulary['categories']:
+        yield {"category": category['name'], "category_display": category['display_name']}
+        for word in category['words']:
+            record = {"category": category['name']}
+            record.update(word)
+            yield record
+
+
+def save_vocabulary_lines(vocabulary, file_path, fsync=FSYNC_NONE):
+    """
+    Save a vocabulary in the streaming format
+
+    Args:
+        vocabulary (dict): Vocabulary data with a 'categories' list
+        file_path (str): Path to the JSON Lines file
+        fsync (str, optional): FSYNC_NONE, FSYNC_FILE or FSYNC_DIR
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return save_json_lines(vocabulary_lines(vocabulary), file_path, fsync)
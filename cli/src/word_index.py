@@ -0,0 +1,244 @@
+"""
+Spanish Learning Chatbot - Word Index
+This module keeps a flat index of every vocabulary word for constant-time
+random picks, weighted picks and sampling without replacement
+"""
+
+import random
+import itertools
+
+
+class _AliasTable:
+    """Walker/Vose alias table: constant-time draws from fixed weights"""
+
+    __slots__ = ("probabilities", "aliases", "total")
+
+    def __init__(self, weights):
+        """
+        Build the table
+
+        Args:
+            weights (list): Non-negative weight of each position
+        """
+        count = len(weights)
+        self.total = float(sum(weights))
+        self.probabilities = [1.0] * count
+        self.aliases = list(range(count))
+        if not count or self.total <= 0:
+            return
+
+        scaled = [weight * count / self.total for weight in weights]
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding
+        for i in small + large:
+            self.probabilities[i] = 1.0
+
+    def draw(self, rng):
+        """Pick a position with probability proportional to its weight"""
+        i = rng.randrange(len(self.probabilities))
+        return i if rng.random() < self.probabilities[i] else self.aliases[i]
+
+
+class _WeightedIndex:
+    """
+    Alias table over the words indexed so far, plus a short tail of words
+    added since it was built
+    """
+
+    __slots__ = ("table", "built", "tail", "tail_total")
+
+    def __init__(self, weights):
+        self.table = _AliasTable(weights)
+        self.built = len(weights)
+        self.tail = []
+        self.tail_total = 0.0
+
+
+class WordIndex:
+    """
+    Flat list of every word as (category id, word index) pairs
+
+    Category ids are positions in `categories`, word indexes are positions
+    in the category's 'words' list. Words are only ever appended to
+    categories, so each added word is one more pair at the end and nothing
+    already indexed has to move.
+
+    Weighted picks use an alias table per weight function, built on first
+    use. Words added later go to a short tail that is drawn from by linear
+    scan, and the table is rebuilt once the tail outgrows the square root
+    of its size, so adding words never costs a full rebuild each.
+    """
+
+    # Tail length that always triggers a rebuild, however small the index
+    MIN_TAIL = 64
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self.categories = []
+        self.entries = []
+        self._category_ids = {}   # id(category dict) -> category id
+        self._word_counts = []    # category id -> words indexed so far
+        self._weighted = {}       # weight function -> _WeightedIndex
+        self._positions = None    # (category name, spanish) -> position, built on first use
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_word(self, category):
+        """
+        Index the next word of a category
+
+        Words must be indexed in the order of the category's 'words' list,
+        i.e. right after they are appended to it.
+
+        Args:
+            category (dict): The word's category
+        """
+        category_id = self._category_ids.get(id(category))
+        if category_id is None:
+            category_id = len(self.categories)
+            self._category_ids[id(category)] = category_id
+            self.categories.append(category)
+            self._word_counts.append(0)
+
+        self.entries.append((category_id, self._word_counts[category_id]))
+        self._word_counts[category_id] += 1
+        if self._positions is not None:
+            word = category['words'][self.entries[-1][1]]
+            self._positions.setdefault((category['name'], word['spanish']), len(self.entries) - 1)
+
+    def invalidate_weights(self):
+        """Drop the weighted tables, e.g. after a word's fields changed"""
+        self._weighted = {}
+
+    def get(self, position):
+        """
+        Get the word at a position of the flat list
+
+        Args:
+            position (int): Position in the flat list
+
+        Returns:
+            tuple: (category, word)
+        """
+        category_id, word_index = self.entries[position]
+        category = self.categories[category_id]
+        return category, category['words'][word_index]
+
+    def position_of(self, category_name, spanish):
+        """
+        Get the position of a word in the flat list
+
+        Where several words share a category name and Spanish text, the
+        first indexed one is found, like the vocabulary's by-name lookups.
+
+        Args:
+            category_name (str): Name of the word's category
+            spanish (str): The word's Spanish text
+
+        Returns:
+            int: Position in the flat list, or None if there is no such word
+        """
+        if self._positions is None:
+            positions = {}
+            for position in range(len(self.entries) - 1, -1, -1):
+                category, word = self.get(position)
+                positions[(category['name'], word['spanish'])] = position
+            self._positions = positions
+        return self._positions.get((category_name, spanish))
+
+    def choice(self, rng=random):
+        """
+        Pick a uniformly random word
+
+        Args:
+            rng (random.Random, optional): Random source
+
+        Returns:
+            tuple: (category, word), or None if the index is empty
+        """
+        if not self.entries:
+            return None
+        return self.get(rng.randrange(len(self.entries)))
+
+    def weighted_choice(self, weight, rng=random):
+        """
+        Pick a word with probability proportional to its weight
+
+        Weights are cached per weight function, so they should depend on
+        the word's own fields only (call invalidate_weights() after editing
+        those).
+
+        Args:
+            weight (callable): Maps (category, word) to a non-negative number
+            rng (random.Random, optional): Random source
+
+        Returns:
+            tuple: (category, word), or None if no word has a positive weight
+        """
+        weighted = self._weighted.get(weight)
+        if weighted is None:
+            weighted = self._weighted[weight] = _WeightedIndex([weight(*self.get(i)) for i in range(len(self))])
+
+        # Words added since the table was built
+        for position in range(weighted.built + len(weighted.tail), len(self)):
+            value = weight(*self.get(position))
+            weighted.tail.append(value)
+            weighted.tail_total += value
+        if len(weighted.tail) > max(self.MIN_TAIL, weighted.built ** 0.5):
+            weighted = self._weighted[weight] = _WeightedIndex([weight(*self.get(i)) for i in range(len(self))])
+
+        total = weighted.table.total + weighted.tail_total
+        if total <= 0:
+            return None
+
+        point = rng.random() * total
+        if point < weighted.tail_total:
+            for offset, value in enumerate(weighted.tail):
+                point -= value
+                if point < 0:
+                    return self.get(weighted.built + offset)
+        return self.get(weighted.table.draw(rng))
+
+    def shuffled(self, rng=random):
+        """
+        Yield every word once, in random order, generating the order lazily
+
+        This is a Fisher-Yates shuffle that only records the swapped
+        positions, so taking the first k words costs O(k) time and memory
+        however large the index is.
+
+        Args:
+            rng (random.Random, optional): Random source
+
+        Yields:
+            tuple: (category, word)
+        """
+        count = len(self.entries)
+        swapped = {}
+        for i in range(count):
+            j = rng.randrange(i, count)
+            position = swapped.get(j, j)
+            swapped[j] = swapped.pop(i, i)
+            yield self.get(position)
+
+    def sample(self, k, rng=random):
+        """
+        Pick k different words uniformly at random
+
+        Args:
+            k (int): Number of words (fewer if the index is smaller)
+            rng (random.Random, optional): Random source
+
+        Returns:
+            list: (category, word) tuples, in random order
+        """
+        return list(itertools.islice(self.shuffled(rng), max(k, 0)))
@@ -0,0 +1,255 @@
+"""
+Spanish Learning Chatbot - Word of the Day
+This module picks each learner's word of the day, skipping words they were
+already shown and favoring words they haven't mastered yet
+"""
+
+import random
+import threading
+from collections import OrderedDict
+
+# Mastery level from which a word counts as mastered (0-5 scale)
+MASTERED_LEVEL = 5
+
+# Learners whose selection state is kept in memory (a server has many);
+# the least recently used are dropped first
+MAX_PROFILES = 1024
+
+
+class _PositionPool:
+    """
+    A set of word positions with constant-time random draws and removals
+
+    Positions are kept in slots 0..size-1 and a removal moves the last one
+    into the freed slot. Only moved slots are stored, so a pool that starts
+    out holding every position 0..size-1 takes no memory until positions
+    are removed from it.
+    """
+
+    __slots__ = ("size", "items", "slots")
+
+    def __init__(self, size=0):
+        """
+        Initialize the pool
+
+        Args:
+            size (int, optional): Start out holding positions 0..size-1
+        """
+        self.size = size
+        self.items = {}   # slot -> position, where not the slot itself
+        self.slots = {}   # position -> slot, where not the position itself
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, position):
+        slot = self.slots.get(position, position)
+        return slot < self.size and self.items.get(slot, slot) == position
+
+    def add(self, position):
+        """Add a position that isn't in the pool"""
+        self.items[self.size] = position
+        self.slots[position] = self.size
+        self.size += 1
+
+    def remove(self, position):
+        """
+        Remove a position
+
+        Returns:
+            bool: True if it was in the pool
+        """
+        if position not in self:
+            return False
+
+        slot = self.slots.get(position, position)
+        last = self.size - 1
+        moved = self.items.get(last, last)
+        self.items[slot] = moved
+        self.slots[moved] = slot
+        self.items.pop(last, None)
+        self.slots.pop(position, None)
+        self.size = last
+        return True
+
+    def draw(self, rng):
+        """Get a random position (the pool must not be empty)"""
+        slot = rng.randrange(self.size)
+        return self.items.get(slot, slot)
+
+
+class _ProfileState:
+    """A learner's words not featured yet, unmastered and mastered"""
+
+    __slots__ = ("profile_data", "history_length", "vocabulary_size", "unmastered", "mastered")
+
+    def __init__(self, profile_data, vocabulary_size):
+        self.profile_data = profile_data
+        self.history_length = 0                       # word_of_day_history entries applied
+        self.vocabulary_size = vocabulary_size        # words indexed when the pools were made
+        self.unmastered = _PositionPool(vocabulary_size)
+        self.mastered = _PositionPool()
+
+    def remove(self, position):
+        """Take a word out of both pools, e.g. once it was featured"""
+        if not self.unmastered.remove(position):
+            self.mastered.remove(position)
+
+
+class WordOfDaySelector:
+    """
+    Picks words of the day from a vocabulary
+
+    Words are identified by their position in the vocabulary's word index,
+    which is also what the profile's word_of_day_history records. For each
+    loaded profile it keeps two pools of the words not featured yet: words
+    not mastered and words mastered. A pick draws from the first pool that
+    isn't empty and removes the word, in constant time; a word found to
+    have been mastered since is moved to the other pool first, which
+    happens at most once per word.
+
+    The pools are made once per profile and process, from the profile's
+    mastered words and history, and then kept up to date as words are
+    picked. Once every word has been featured, the older half of the
+    vocabulary's worth of history is forgotten and words come round again.
+    """
+
+    def __init__(self, vocabulary_manager, rng=random):
+        """
+        Initialize without any profile state
+
+        Args:
+            vocabulary_manager (VocabularyManager): Vocabulary to pick from
+            rng (random.Random, optional): Random source
+        """
+        self.vocabulary_manager = vocabulary_manager
+        self.random = rng
+        self._states = OrderedDict()
+        # A server picks for several learners at once
+        self._lock = threading.Lock()
+
+    def history_entry_position(self, entry):
+        """
+        Get the position of a word_of_day_history entry's word
+
+        Entries record the word's 'word_id'; older ones its 'category_name'
+        and 'spanish' instead.
+
+        Args:
+            entry (dict): History entry
+
+        Returns:
+            int: Position in the word index, or None if the word isn't there
+        """
+        manager = self.vocabulary_manager
+        word_index = manager._word_index
+        if entry.get("word_id") is not None:
+            # Ids are positions in the whole vocabulary, which a partial
+            # load doesn't have
+            if manager.partial or not 0 <= entry["word_id"] < len(word_index):
+                return None
+            return entry["word_id"]
+        return word_index.position_of(entry.get("category_name"), entry.get("spanish"))
+
+    def _state(self, user_profile):
+        """Get the selection state of the loaded profile, applying new history"""
+        profile_data = user_profile.current_profile
+        history = profile_data["word_of_day_history"]
+        word_index = self.vocabulary_manager._word_index
+        state = self._states.get(user_profile.profile_name)
+
+        # A reloaded profile keeps its state if its history only grew since
+        if state is not None and state.profile_data is not profile_data:
+            if len(history) >= state.history_length and \
+                    history[:state.history_length][-1:] == state.profile_data["word_of_day_history"][-1:]:
+                state.profile_data = profile_data
+            else:
+                state = None
+
+        if state is None:
+            state = self._new_state(profile_data, history)
+            self._states[user_profile.profile_name] = state
+            if len(self._states) > MAX_PROFILES:
+                self._states.popitem(last=False)
+        self._states.move_to_end(user_profile.profile_name)
+
+        # Words added to the vocabulary since, then words featured since
+        for position in range(state.vocabulary_size, len(word_index)):
+            state.unmastered.add(position)
+        state.vocabulary_size = len(word_index)
+
+        for entry in history[state.history_length:]:
+            position = self.history_entry_position(entry)
+            if position is not None:
+                state.remove(position)
+        state.history_length = len(history)
+        return state
+
+    def _new_state(self, profile_data, featured_entries):
+        """Make the pools: every word but the featured ones, split by mastery"""
+        word_index = self.vocabulary_manager._word_index
+        state = _ProfileState(profile_data, len(word_index))
+
+        for category_name, words in profile_data["mastered_words"].items():
+            for spanish, word_data in words.items():
+                if word_data['mastery_level'] >= MASTERED_LEVEL:
+                    position = word_index.position_of(category_name, spanish)
+                    if position is not None and state.unmastered.remove(position):
+                        state.mastered.add(position)
+
+        for entry in featured_entries:
+            position = self.history_entry_position(entry)
+            if position is not None:
+                state.remove(position)
+        state.history_length = len(profile_data["word_of_day_history"])
+        return state
+
+    def _is_mastered(self, profile_data, position):
+        """Check whether the learner has mastered the word at a position"""
+        category, word = self.vocabulary_manager._word_index.get(position)
+        word_data = profile_data["mastered_words"].get(category['name'], {}).get(word['spanish'])
+        return word_data is not None and word_data['mastery_level'] >= MASTERED_LEVEL
+
+    def pick(self, user_profile=None):
+        """
+        Pick the next word of the day
+
+        Args:
+            user_profile (UserProfile, optional): Learner to pick for;
+                without a loaded profile any word may be picked
+
+        Returns:
+            int: Position of the word in the word index, or None if there
+                are no words
+        """
+        word_index = self.vocabulary_manager._word_index
+        if not len(word_index):
+            return None
+        if not user_profile or not user_profile.current_profile:
+            return self.random.randrange(len(word_index))
+
+        with self._lock:
+            return self._pick(user_profile)
+
+    def _pick(self, user_profile):
+        """Pick for a loaded profile, holding the lock"""
+        state = self._state(user_profile)
+        profile_data = state.profile_data
+
+        if not state.unmastered and not state.mastered:
+            # Every word was featured: start a new round
+            history = profile_data["word_of_day_history"]
+            keep = self.vocabulary_manager.count_words() // 2
+            state = self._new_state(profile_data, history[max(len(history) - keep, 0):] if keep else [])
+            self._states[user_profile.profile_name] = state
+
+        while state.unmastered:
+            position = state.unmastered.draw(self.random)
+            state.unmastered.remove(position)
+            if not self._is_mastered(profile_data, position):
+                return position
+            state.mastered.add(position)
+
+        position = state.mastered.draw(self.random)
+        state.mastered.remove(position)
+        return position
@@ -0,0 +1,104 @@
+"""
+Spanish Learning Chatbot - Word Views
+This module provides lightweight read-only views of vocabulary words
+"""
+
+from collections.abc import Mapping
+
+# Fields a view takes from its category instead of the word
+CATEGORY_FIELDS = ("category_name", "category_display")
+
+
+class WordView(Mapping):
+    """
+    A vocabulary word seen together with its category and extra fields
+
+    Lists of words "with their category info" used to be built from
+    word.copy() plus two or three added keys per word. A view instead
+    holds references to the shared word and category dicts, so it costs
+    one small slotted object, and reads like the copy did:
+
+        view['spanish'], view['category_name'], view.get('mastery_level')
+
+    Views are read-only and follow later edits of the word. Use copy() for
+    a plain dict, e.g. to store or modify it.
+    """
+
+    __slots__ = ("word", "category", "extra")
+
+    def __init__(self, word, category=None, extra=None):
+        """
+        Initialize a view
+
+        Args:
+            word (dict): The vocabulary word
+            category (dict, optional): Its category, which provides
+                'category_name' and 'category_display'
+            extra (dict, optional): More fields, e.g. {'mastery_level': 2};
+                these take precedence over the word's own
+        """
+        self.word = word
+        self.category = category
+        self.extra = extra
+
+    def __getitem__(self, key):
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        if self.category is not None:
+            if key == "category_name":
+                return self.category['name']
+            if key == "category_display":
+                return self.category['display_name']
+        return self.word[key]
+
+    def __contains__(self, key):
+        return self._shadowed(key) or key in self.word
+
+    def _shadowed(self, key):
+        """Check whether a word key is overridden by the category or extras"""
+        return ((self.extra is not None and key in self.extra)
+                or (self.category is not None and key in CATEGORY_FIELDS))
+
+    def __iter__(self):
+        for key in self.word:
+            if not self._shadowed(key):
+                yield key
+        if self.category is not None:
+            for key in CATEGORY_FIELDS:
+                if self.extra is None or key not in self.extra:
+                    yield key
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"WordView({dict(self)!r})"
+
+    def copy(self):
+        """
+        Get the view's fields as a new plain dict
+
+        Returns:
+            dict: The word's fields plus the category fields and extras
+        """
+        return dict(self)
+
+
+def json_default(value):
+    """
+    Convert word views for json.dumps(..., default=json_default)
+
+    Args:
+        value: An object json can't encode by itself
+
+    Returns:
+        dict: The view as a plain dict
+
+    Raises:
+        TypeError: If the value isn't a word view
+    """
+    if isinstance(value, WordView):
+        return value.copy()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
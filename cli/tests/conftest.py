@@ -0,0 +1,11 @@
+"""
+Spanish Learning Chatbot - Test Configuration
+Makes the `src` package importable when pytest runs from any directory
+"""
+
+import os
+import sys
+
+CLI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CLI_DIR not in sys.path:
+    sys.path.insert(0, CLI_DIR)
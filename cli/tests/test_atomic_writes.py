@@ -0,0 +1,72 @@
+"""
+Spanish Learning Chatbot - Atomic Write Tests
+Checks that a failed save_json_data leaves the old file in place and no
+temporary files behind
+"""
+
+import os
+
+import pytest
+
+from src import utils
+from src.utils import save_json_data, load_json_data, load_json_cached, FSYNC_NONE, FSYNC_FILE, FSYNC_DIR
+
+OLD_DATA = {"name": "Ana", "words": ["hola"]}
+
+
+@pytest.fixture
+def saved_file(tmp_path):
+    file_path = str(tmp_path / "profile.json")
+    assert save_json_data(OLD_DATA, file_path)
+    return file_path
+
+
+def assert_unchanged(file_path):
+    """The old data is still there, alone in its directory"""
+    assert load_json_data(file_path) == OLD_DATA
+    assert os.listdir(os.path.dirname(file_path)) == [os.path.basename(file_path)]
+
+
+def test_unserializable_data_keeps_the_old_file(saved_file):
+    assert not save_json_data({"words": {"not", "json"}}, saved_file)
+    assert_unchanged(saved_file)
+
+
+@pytest.mark.parametrize("fsync", [FSYNC_FILE, FSYNC_DIR])
+def test_failed_fsync_removes_the_temporary_file(saved_file, monkeypatch, fsync):
+    def failing_fsync(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr(utils.os, "fsync", failing_fsync)
+
+    assert not save_json_data({"name": "Luis"}, saved_file, fsync=fsync)
+    assert_unchanged(saved_file)
+
+
+def test_failed_rename_removes_the_temporary_file(saved_file, monkeypatch):
+    def failing_replace(source, destination):
+        raise PermissionError("destination is locked")
+    monkeypatch.setattr(utils.os, "replace", failing_replace)
+
+    assert not save_json_data({"name": "Luis"}, saved_file)
+    assert_unchanged(saved_file)
+
+
+@pytest.mark.parametrize("fsync", [FSYNC_NONE, FSYNC_FILE, FSYNC_DIR])
+@pytest.mark.parametrize("compact", [False, True])
+def test_successful_save_replaces_the_file_and_the_cached_copy(saved_file, fsync, compact):
+    load_json_cached(saved_file)
+    new_data = {"name": "Luis", "words": ["adiós"]}
+
+    assert save_json_data(new_data, saved_file, fsync=fsync, compact=compact)
+
+    assert load_json_data(saved_file) == new_data
+    assert load_json_cached(saved_file) == new_data
+    assert os.listdir(os.path.dirname(saved_file)) == [os.path.basename(saved_file)]
+    with open(saved_file, encoding="utf-8") as file:
+        assert ("\n" in file.read()) != compact
+
+
+def test_unknown_fsync_policy_is_rejected(saved_file):
+    with pytest.raises(ValueError):
+        save_json_data({"name": "Luis"}, saved_file, fsync="sometimes")
+    assert_unchanged(saved_file)
@@ -0,0 +1,55 @@
+"""
+Spanish Learning Chatbot - Batch Scheduling Tests
+Checks the vectorized scheduler against the scalar
+SpacedRepetitionSystem row by row and profile by profile (requires NumPy)
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import bench_batch_scheduling
+import common
+from src.batch_scheduling import NEVER_PRACTICED, schedule_batch, schedule_profiles
+from src.spaced_repetition import SpacedRepetitionSystem
+
+
+class LoadedProfile:
+    """Just enough of a UserProfile for the review queue"""
+
+    def __init__(self, profile_data):
+        self.current_profile = profile_data
+
+    def add_listener(self, callback):
+        pass
+
+
+def test_batch_matches_the_scalar_schedule_row_by_row():
+    rng = np.random.default_rng(7)
+    today = datetime.datetime.now().date().toordinal()
+    rows = 20000
+    # Out-of-range levels fall back to the mastered interval
+    mastery_levels = rng.integers(-1, 9, rows, dtype=np.int8)
+    last_practiced = rng.integers(today - 90, today + 1, rows, dtype=np.int32)
+    last_practiced[rng.random(rows) < 0.05] = NEVER_PRACTICED
+
+    result = schedule_batch(mastery_levels, last_practiced)
+
+    assert bench_batch_scheduling.check_rows(mastery_levels, last_practiced, result) == 0
+    assert result['due_count'] == int(np.count_nonzero(result['is_due']))
+
+
+def test_per_profile_due_counts_match_the_review_queue():
+    vocabulary = common.make_vocabulary(500)
+    profiles = [common.make_profile(f"Learner {i}", vocabulary, 200, seed=i) for i in range(5)]
+
+    columns = schedule_profiles(profiles)
+
+    expected = [len(SpacedRepetitionSystem(LoadedProfile(profile)).get_due_words()) for profile in profiles]
+    assert columns['due_counts'].tolist() == expected
+    assert columns['due_count'] == sum(expected)
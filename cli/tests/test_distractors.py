@@ -0,0 +1,81 @@
+"""
+Spanish Learning Chatbot - Distractor Tests
+Checks that quiz distractors are distinct wrong answers from the right
+pool, however few distinct answers a category has
+"""
+
+import random
+
+import pytest
+
+from src.distractors import DistractorEngine, PLACEHOLDER_ENGLISH, PLACEHOLDER_SPANISH
+
+
+def make_category(pairs, difficulties=("beginner", "intermediate")):
+    """A category of (spanish, english) words cycling through difficulties"""
+    return {
+        "name": "test",
+        "display_name": "Test",
+        "words": [
+            {"spanish": spanish, "english": english, "difficulty": difficulties[i % len(difficulties)]}
+            for i, (spanish, english) in enumerate(pairs)
+        ]
+    }
+
+
+CATEGORIES = {
+    "large": make_category([(f"palabra{i}", f"word{i}") for i in range(200)]),
+    # Many words share a few answers, as synonyms do
+    "repeated answers": make_category([(f"palabra{i}", f"word{i % 5}") for i in range(100)]),
+    "three words": make_category([("uno", "one"), ("dos", "two"), ("tres", "three")]),
+    "one word": make_category([("hola", "hello")]),
+    # A word whose answer is also a placeholder
+    "placeholder clash": make_category([("perro", "dog"), ("gato", "cat")]),
+}
+
+
+@pytest.mark.parametrize("prefer_confusables", [False, True])
+@pytest.mark.parametrize("difficulty", [None, "beginner", "advanced"])
+@pytest.mark.parametrize("direction", [1, 2])
+@pytest.mark.parametrize("name", sorted(CATEGORIES))
+def test_distractors_are_distinct_wrong_answers(name, direction, difficulty, prefer_confusables):
+    category = CATEGORIES[name]
+    engine = DistractorEngine(prefer_confusables)
+    answer_key = "english" if direction == 1 else "spanish"
+    placeholders = PLACEHOLDER_ENGLISH if direction == 1 else PLACEHOLDER_SPANISH
+    category_answers = {word[answer_key] for word in category["words"]}
+    rng = random.Random(0)
+
+    for _ in range(200):
+        word = rng.choice(category["words"])
+        options = engine.sample(category, word, direction, 3, difficulty, rng)
+
+        assert len(options) == 3
+        assert len(set(options)) == 3
+        assert word[answer_key] not in options
+        assert set(options) <= category_answers | set(placeholders)
+        # Placeholders only make up for missing distinct answers
+        if len(category_answers) > 3:
+            assert set(options) <= category_answers
+
+
+def test_distractors_come_from_the_quiz_difficulty_when_it_has_enough_words():
+    category = CATEGORIES["large"]
+    engine = DistractorEngine()
+    beginner = {w["english"] for w in category["words"] if w["difficulty"] == "beginner"}
+    rng = random.Random(1)
+
+    for _ in range(100):
+        word = rng.choice(category["words"])
+        assert set(engine.sample(category, word, 1, 3, "beginner", rng)) <= beginner
+
+
+def test_words_added_to_a_category_become_distractors():
+    category = make_category([("uno", "one"), ("dos", "two")])
+    engine = DistractorEngine()
+    word = category["words"][0]
+    assert set(engine.sample(category, word, 1)) & set(PLACEHOLDER_ENGLISH)
+
+    category["words"].extend({"spanish": s, "english": e} for s, e in [("tres", "three"), ("cuatro", "four")])
+
+    assert sorted(engine.sample(category, word, 1)) == ["four", "three", "two"]
@@ -0,0 +1,46 @@
+"""
+Spanish Learning Chatbot - Journal Tests
+Checks that profile journals survive a crash in the middle of an append
+"""
+
+from src.utils import append_json_lines, load_json_lines
+from src.profile_storage import JsonFileStorage
+from src.user_profile import UserProfile
+
+
+def tear_last_line(file_path):
+    """Cut the file's last line in half, as a crash mid-append would"""
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    with open(file_path, 'wb') as file:
+        file.write(data[:-len(data.splitlines()[-1]) // 2 - 1])
+
+
+def test_append_after_torn_line_starts_a_new_line(tmp_path):
+    journal = str(tmp_path / "events.jsonl")
+    append_json_lines([{"seq": 1}, {"seq": 2}], journal)
+    tear_last_line(journal)
+
+    append_json_lines([{"seq": 3}, {"seq": 4}], journal)
+
+    assert load_json_lines(journal) == [{"seq": 1}, {"seq": 3}, {"seq": 4}]
+
+
+def test_profile_journal_replays_events_appended_after_a_crash(tmp_path):
+    storage = JsonFileStorage(str(tmp_path))
+    profile = UserProfile(storage=storage, journal=True)
+    profile.create_profile("Ana")
+    profile.update_flashcard_practice()
+    tear_last_line(storage._journal_path("ana"))
+
+    # A new process loads the profile (replaying what it can) and carries on
+    profile = UserProfile(storage=JsonFileStorage(str(tmp_path)), journal=True)
+    assert profile.load_profile("ana")
+    profile.update_flashcard_practice(2)
+    profile.update_conversation_practice()
+
+    reloaded = JsonFileStorage(str(tmp_path)).load("ana")
+    # The login recorded on loading is the first event after the torn line
+    assert reloaded["last_login"] == profile.current_profile["last_login"]
+    assert reloaded["statistics"]["flashcards_practiced"] == 2
+    assert reloaded["statistics"]["conversations_practiced"] == 1
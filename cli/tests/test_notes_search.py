@@ -0,0 +1,112 @@
+"""
+Spanish Learning Chatbot - Notes Search Tests
+Checks BM25 ranking against a direct computation over every document, and
+that a saved index picks up notes edited since it was saved
+"""
+
+import os
+import math
+import shutil
+from collections import Counter
+
+import pytest
+
+from src.cultural_notes import CulturalNotesManager
+from src.notes_search import (NotesSearchIndex, BM25_K1, BM25_B, TITLE_WEIGHT, tokenize,
+                              country_documents, topic_documents)
+from src.utils import load_json_data, save_json_data, clear_json_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+QUERIES = ["siesta", "tapas comida", "subjuntivo", "ser estar", "the", "pronunciation of the letter",
+           "Madrid capital", "verbo", "día de los muertos", "no match here xyz"]
+
+
+@pytest.fixture
+def notes_dir(tmp_path):
+    """Copies of the shipped notes documents"""
+    for filename in ("cultural_notes.json", "grammar_notes.json"):
+        shutil.copy(os.path.join(DATA_DIR, filename), tmp_path / filename)
+    clear_json_cache()
+    yield tmp_path
+    clear_json_cache()
+
+
+def make_manager(notes_dir):
+    return CulturalNotesManager(str(notes_dir / "cultural_notes.json"), str(notes_dir / "grammar_notes.json"))
+
+
+def brute_force_scores(notes_dir, query):
+    """BM25 score of every document, computed from the notes documents"""
+    documents = []
+    for country in load_json_data(str(notes_dir / "cultural_notes.json"))["countries"]:
+        documents += [(("cultural", country["name"], position), document)
+                      for position, document in enumerate(country_documents(country))]
+    for topic in load_json_data(str(notes_dir / "grammar_notes.json"))["topics"]:
+        documents += [(("grammar", topic["name"], position), document)
+                      for position, document in enumerate(topic_documents(topic))]
+
+    counts = {}
+    for key, (title, text, _section) in documents:
+        counts[key] = Counter(tokenize(text))
+        for term in tokenize(title):
+            counts[key][term] += TITLE_WEIGHT
+    average_length = sum(sum(c.values()) for c in counts.values()) / len(counts)
+
+    scores = {}
+    for term in set(tokenize(query)):
+        matching = [key for key in counts if counts[key][term]]
+        idf = math.log(1 + (len(counts) - len(matching) + 0.5) / (len(matching) + 0.5))
+        for key in matching:
+            frequency = counts[key][term]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * sum(counts[key].values()) / average_length)
+            scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+    return scores
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10])
+@pytest.mark.parametrize("kind", [None, "cultural", "grammar"])
+def test_ranking_matches_bm25_over_every_document(notes_dir, limit, kind):
+    index = make_manager(notes_dir).get_search_index()
+
+    for query in QUERIES:
+        expected = {key: score for key, score in brute_force_scores(notes_dir, query).items()
+                    if kind in (None, key[0])}
+        results = index.search(query, limit, kind)
+
+        assert [result["score"] for result in results] == \
+            pytest.approx(sorted(expected.values(), reverse=True)[:limit], abs=1e-4)
+        for result in results:
+            key = (result["kind"], result["source"], result["position"])
+            assert result["score"] == pytest.approx(expected[key], abs=1e-4)
+
+
+def test_saved_index_is_reloaded_and_updated_after_a_note_changes(notes_dir):
+    manager = make_manager(notes_dir)
+    assert manager.search_notes("siesta")
+    assert not manager.search_notes("murciélago")
+
+    # A later run loads the saved index as it is
+    index = NotesSearchIndex.load(manager.search_index_file)
+    assert index.search("siesta tapas", 10) == manager.get_search_index().search("siesta tapas", 10)
+    assert all(index.is_current(path) for path in (manager.notes_file, manager.grammar_file))
+
+    # Someone edits a note
+    notes = load_json_data(manager.notes_file)
+    note = next(note for country in notes["countries"] for note in country["notes"]
+                if "siesta" in tokenize(note["content"] + " " + note["title"]))
+    note["title"] = "Afternoon Rest"
+    note["content"] = "A bat (murciélago) sleeps all afternoon."
+    save_json_data(notes, manager.notes_file)
+
+    manager = make_manager(notes_dir)
+    results = manager.search_notes("murcielago")
+    assert [result["title"] for result in results] == ["Afternoon Rest"]
+    assert not manager.search_notes("siesta")
+    # The saved index was brought up to date too
+    assert NotesSearchIndex.load(manager.search_index_file).search("murcielago", 10) == \
+        manager.get_search_index().search("murcielago", 10)
+    for query in QUERIES:
+        expected = sorted(brute_force_scores(notes_dir, query).values(), reverse=True)[:10]
+        assert [result["score"] for result in manager.get_search_index().search(query, 10)] == \
+            pytest.approx(expected, abs=1e-4)
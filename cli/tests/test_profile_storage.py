@@ -0,0 +1,75 @@
+"""
+Spanish Learning Chatbot - Profile Storage Tests
+Checks that SQLite profiles round-trip, that recorded events reach the
+database, and that JSON profiles migrate with their journals replayed
+"""
+
+import pytest
+
+from src.profile_storage import JsonFileStorage, SQLiteStorage, migrate_profiles
+from src.user_profile import UserProfile
+
+
+def practice(profile):
+    """Record one of every kind of profile change"""
+    profile.update_word_mastery("hola", "greetings", True)
+    profile.update_word_mastery("hola", "greetings", True)
+    profile.update_word_mastery("adiós", "greetings", False)
+    profile.update_word_mastery("pan", "food", True)
+    profile.update_quiz_score("greetings", 4, 5)
+    profile.update_quiz_score("food", 2, 5)
+    profile.update_flashcard_practice(3)
+    profile.update_conversation_practice()
+    profile.add_custom_word("gato", "cat", "El gato duerme.", "The cat sleeps.")
+    profile.update_word_of_day({"spanish": "hola", "english": "hello", "category_name": "greetings",
+                                "word_id": 0})
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "profiles.db"))
+    yield storage
+    storage.close()
+
+
+def test_sqlite_round_trips_a_saved_profile(tmp_path, sqlite_storage):
+    profile = UserProfile(storage=JsonFileStorage(str(tmp_path / "json")))
+    profile.create_profile("Ana María")
+    practice(profile)
+
+    assert sqlite_storage.save("ana_maría", profile.current_profile)
+
+    assert sqlite_storage.load("ana_maría") == profile.current_profile
+    assert sqlite_storage.exists("ana_maría")
+    assert not sqlite_storage.exists("ana")
+
+
+def test_sqlite_events_match_the_profile_in_memory(tmp_path):
+    db_path = str(tmp_path / "profiles.db")
+    profile = UserProfile(storage=SQLiteStorage(db_path))
+    profile.create_profile("Luis")
+    practice(profile)
+
+    # Another process opening the database sees every change
+    reloaded = UserProfile(storage=SQLiteStorage(db_path))
+    assert reloaded.load_profile("luis")
+    expected = dict(profile.current_profile, last_login=reloaded.current_profile["last_login"])
+    assert reloaded.current_profile == expected
+
+
+def test_migration_replays_journals_and_lists_profiles_by_name(tmp_path, sqlite_storage):
+    source = JsonFileStorage(str(tmp_path / "json"))
+    for name in ("Zoe", "ana", "Bea"):
+        profile = UserProfile(storage=source, journal=True)
+        profile.create_profile(name)
+        practice(profile)
+    # Changes still in the journal, not yet in the snapshot
+    assert source.journal_length("bea") > 0
+
+    migrated, failed = migrate_profiles(JsonFileStorage(str(tmp_path / "json")), sqlite_storage)
+
+    assert (migrated, failed) == (3, [])
+    assert [p["name"] for p in sqlite_storage.list_profiles()] == ["ana", "Bea", "Zoe"]
+    assert sqlite_storage.count_profiles(prefix="b") == 1
+    for profile_id in ("zoe", "ana", "bea"):
+        assert sqlite_storage.load(profile_id) == source.load(profile_id)
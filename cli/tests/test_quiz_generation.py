@@ -0,0 +1,76 @@
+"""
+Spanish Learning Chatbot - Quiz Generation Tests
+Checks that seeded quiz batches are reproducible whatever the number of
+worker processes, and that every generated question is well formed
+"""
+
+import pytest
+
+from src.quiz import QuizSystem
+
+
+def make_vocabulary(words=40):
+    """A vocabulary with one category of mixed difficulties"""
+    difficulties = ("beginner", "intermediate", "advanced")
+    return {"categories": [{
+        "name": "numbers",
+        "display_name": "Numbers",
+        "words": [
+            {"spanish": f"número{i}", "english": f"number{i}", "difficulty": difficulties[i % 3]}
+            for i in range(words)
+        ]
+    }]}
+
+
+@pytest.fixture(scope="module")
+def quiz_system():
+    return QuizSystem(make_vocabulary())
+
+
+@pytest.mark.parametrize("prefer_confusables", [False, True])
+def test_seeded_batches_match_across_process_counts(prefer_confusables):
+    quiz_system = QuizSystem(make_vocabulary(), prefer_confusables=prefer_confusables)
+    arguments = ("numbers", 23, 5, 2, "beginner", 42)
+
+    in_process = quiz_system.generate_quizzes(*arguments)
+
+    assert quiz_system.generate_quizzes(*arguments) == in_process
+    for processes in (2, 3):
+        assert quiz_system.generate_quizzes(*arguments, processes=processes) == in_process
+    assert [quiz["index"] for quiz in in_process] == list(range(23))
+
+
+def test_quizzes_depend_on_the_seed_and_index_only(quiz_system):
+    quizzes = quiz_system.generate_quizzes("numbers", 20, seed=7)
+
+    assert quiz_system.generate_quizzes("numbers", 10, seed=7) == quizzes[:10]
+    assert quiz_system.generate_quizzes("numbers", 20, seed=8) != quizzes
+
+
+@pytest.mark.parametrize("direction", [1, 2])
+def test_generated_questions_are_well_formed(quiz_system, direction):
+    words = {word["spanish"]: word for word in make_vocabulary()["categories"][0]["words"]}
+    answer_key = "english" if direction == 1 else "spanish"
+
+    for quiz in quiz_system.generate_quizzes("numbers", 50, num_questions=8, direction=direction,
+                                             difficulty="advanced", seed=3):
+        assert quiz["category"] == "numbers" and quiz["direction"] == direction
+        spanish = [question["spanish"] for question in quiz["questions"]]
+        assert len(spanish) == 8 and len(set(spanish)) == 8
+
+        for question in quiz["questions"]:
+            word = words[question["spanish"]]
+            assert word["difficulty"] == "advanced"
+            assert question["correct_answer"] == word[answer_key]
+            assert question["options"][question["correct_index"]] == word[answer_key]
+            assert len(set(question["options"])) == 4
+
+
+def test_questions_are_capped_at_the_words_available(quiz_system):
+    quiz = quiz_system.generate_quizzes("numbers", 1, num_questions=100)[0]
+    assert len(quiz["questions"]) == 40
+
+
+def test_unknown_category_raises_key_error(quiz_system):
+    with pytest.raises(KeyError):
+        quiz_system.generate_quizzes("colors", 3)
@@ -0,0 +1,128 @@
+"""
+Spanish Learning Chatbot - Quiz History Tests
+Checks that quiz rollups stay within their day and week bounds, agree with
+the quizzes they summarize, and that storage keeps the raw history bounded
+"""
+
+import copy
+import random
+import datetime
+
+import pytest
+
+from src.profile_storage import (QUIZ_HISTORY_LIMIT, QUIZ_ROLLUP_DAYS, QUIZ_ROLLUP_WEEKS, JsonFileStorage,
+                                 SQLiteStorage, apply_profile_event, new_quiz_rollups, rollup_quiz_history)
+from src.user_profile import UserProfile
+
+CATEGORIES = ["greetings", "food", "travel"]
+
+
+def make_quizzes(days, per_day=2, seed=0):
+    """Quiz records over consecutive days, oldest first"""
+    rng = random.Random(seed)
+    start = datetime.datetime(2021, 12, 20, 9)
+    records = []
+    for day in range(days):
+        for quiz in range(per_day):
+            score = rng.randint(0, 10)
+            records.append({
+                "date": (start + datetime.timedelta(days=day, minutes=quiz)).isoformat(),
+                "category": rng.choice(CATEGORIES),
+                "score": score,
+                "max_score": 10,
+                "percentage": round(score * 10.0, 1)
+            })
+    return records
+
+
+def make_statistics(rollups=True):
+    statistics = {"quizzes_taken": 0, "flashcards_practiced": 0, "conversations_practiced": 0,
+                  "total_score": 0, "quiz_history": []}
+    if rollups:
+        statistics["quiz_rollups"] = new_quiz_rollups()
+    return statistics
+
+
+def expected_buckets(records, key):
+    """Brute-force rollup buckets of the records, grouped by key(record)"""
+    groups = {}
+    for record in records:
+        groups.setdefault(key(record), []).append(record["percentage"])
+    return {
+        name: {"count": len(values), "sum": round(sum(values), 1),
+               "mean": round(sum(values) / len(values), 1), "best": max(values)}
+        for name, values in groups.items()
+    }
+
+
+def iso_week(record):
+    year, week, _ = datetime.date.fromisoformat(record["date"][:10]).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def assert_rollups_match(statistics, records):
+    """Rollups hold the latest days and weeks in full, and every category"""
+    rollups = statistics["quiz_rollups"]
+    daily = expected_buckets(records, lambda record: record["date"][:10])
+    weekly = expected_buckets(records, iso_week)
+
+    assert rollups["daily"] == {day: daily[day] for day in sorted(daily)[-QUIZ_ROLLUP_DAYS:]}
+    assert rollups["weekly"] == {week: weekly[week] for week in sorted(weekly)[-QUIZ_ROLLUP_WEEKS:]}
+    assert rollups["categories"] == expected_buckets(records, lambda record: record["category"])
+    assert statistics["quiz_history"] == records[-QUIZ_HISTORY_LIMIT:]
+
+
+@pytest.mark.parametrize("days", [1, QUIZ_ROLLUP_DAYS, QUIZ_ROLLUP_DAYS + 1, 7 * QUIZ_ROLLUP_WEEKS + 30])
+def test_rollups_keep_the_latest_days_and_weeks(days):
+    profile_data = {"statistics": make_statistics()}
+    records = make_quizzes(days)
+
+    for record in records:
+        apply_profile_event(profile_data, {"type": "quiz", "record": record})
+
+        rollups = profile_data["statistics"]["quiz_rollups"]
+        assert len(rollups["daily"]) <= QUIZ_ROLLUP_DAYS
+        assert len(rollups["weekly"]) <= QUIZ_ROLLUP_WEEKS
+        assert len(profile_data["statistics"]["quiz_history"]) <= QUIZ_HISTORY_LIMIT
+
+    assert_rollups_match(profile_data["statistics"], records)
+    assert profile_data["statistics"]["quizzes_taken"] == len(records)
+
+
+def test_migrating_a_full_history_gives_the_same_rollups():
+    records = make_quizzes(2 * QUIZ_ROLLUP_DAYS, seed=1)
+    incremental = {"statistics": make_statistics()}
+    legacy = {"statistics": make_statistics(rollups=False)}
+    for record in records:
+        apply_profile_event(incremental, {"type": "quiz", "record": copy.deepcopy(record)})
+        apply_profile_event(legacy, {"type": "quiz", "record": copy.deepcopy(record)})
+    # Profiles from before rollups keep every quiz until migrated
+    assert len(legacy["statistics"]["quiz_history"]) == len(records)
+
+    assert rollup_quiz_history(legacy["statistics"])
+    assert not rollup_quiz_history(legacy["statistics"])
+
+    assert legacy == incremental
+    assert_rollups_match(legacy["statistics"], records)
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_stored_quiz_history_stays_bounded(tmp_path, backend):
+    if backend == "sqlite":
+        storage = SQLiteStorage(str(tmp_path / "profiles.db"))
+    else:
+        storage = JsonFileStorage(str(tmp_path))
+    profile = UserProfile(storage=storage, journal=backend == "journal")
+    profile.create_profile("Ana")
+
+    for i in range(QUIZ_HISTORY_LIMIT + 25):
+        profile.update_quiz_score(CATEGORIES[i % 3], i % 6, 5)
+
+    statistics = storage.load("ana")["statistics"]
+    assert statistics == profile.current_profile["statistics"]
+    assert len(statistics["quiz_history"]) == QUIZ_HISTORY_LIMIT
+    assert sum(bucket["count"] for bucket in statistics["quiz_rollups"]["categories"].values()) == \
+        QUIZ_HISTORY_LIMIT + 25
+    if backend == "sqlite":
+        assert storage.connection.execute("SELECT COUNT(*) FROM quiz_history").fetchone()[0] == QUIZ_HISTORY_LIMIT
+        storage.close()
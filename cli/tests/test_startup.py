@@ -0,0 +1,71 @@
+"""
+Spanish Learning Chatbot - Startup Tests
+Checks that the first menu shows the word of the day and that reaching it
+loads only the data it needs; the time budget itself is checked by
+benchmarks/bench_startup.py
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import bench_startup
+from src.chatbot import SpanishChatbot
+from src.user_profile import UserProfile
+from src.utils import clear_json_cache
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    """A small generated data set under data/, made the working directory"""
+    bench_startup.make_data_dir(str(tmp_path), argparse.Namespace(words=2000, countries=20, mastered=200))
+    monkeypatch.chdir(tmp_path)
+    clear_json_cache()
+    yield str(tmp_path)
+    clear_json_cache()
+
+
+def run_cli(root):
+    """Run the CLI up to the first menu and exit, returning its output"""
+    env = dict(os.environ, TERM=os.environ.get("TERM", "dumb"))
+    result = subprocess.run([sys.executable, bench_startup.MAIN_SCRIPT], cwd=root, env=env,
+                            input=bench_startup.CLI_INPUT, capture_output=True, text=True,
+                            encoding="utf-8", timeout=120)
+    return result.stdout
+
+
+def test_first_menu_of_the_day_shows_the_word_of_the_day(data_root):
+    first_launch = run_cli(data_root)
+    later_launch = run_cli(data_root)
+
+    assert "Today's Word:" in first_launch.partition("Enter your choice")[0]
+    # Later launches the same day show the same word
+    word_line = next(line for line in first_launch.splitlines() if "Today's Word:" in line)
+    assert word_line in later_launch
+
+
+def test_first_menu_builds_only_the_vocabulary(data_root):
+    user_profile = UserProfile(profiles_dir="data/user_profiles", journal=True)
+    assert user_profile.load_profile("learner")
+
+    engine = SpanishChatbot(user_profile).engine
+    assert engine.get_word_of_day() is not None
+
+    assert engine._quiz_system is None
+    assert engine._spaced_repetition is None
+    assert engine._dialogues is None
+    assert engine._cultural_notes is None
+
+
+def test_todays_word_is_read_without_loading_the_vocabulary(data_root):
+    user_profile = UserProfile(profiles_dir="data/user_profiles", journal=True)
+    assert user_profile.load_profile("learner")
+    word = SpanishChatbot(user_profile).engine.get_word_of_day()
+
+    engine = SpanishChatbot(user_profile).engine
+    assert engine.get_word_of_day() == word
+    assert engine._vocabulary_manager is None
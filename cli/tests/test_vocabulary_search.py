@@ -0,0 +1,94 @@
+"""
+Spanish Learning Chatbot - Vocabulary Search Tests
+Checks fuzzy and prefix search against brute-force scans of every word
+"""
+
+import random
+
+import pytest
+
+from src.vocabulary_search import VocabularySearch, TOKEN_PATTERN, SEARCH_FIELDS, normalize_text
+
+
+def levenshtein(a, b):
+    """Plain dynamic-programming edit distance"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def random_text(rng, words):
+    """Words over a small alphabet, so many are a few edits apart"""
+    return " ".join("".join(rng.choice("abcdeá") for _ in range(rng.randint(1, 11))) for _ in range(words))
+
+
+@pytest.fixture(scope="module")
+def index_and_words():
+    rng = random.Random(5)
+    words = [{"spanish": f"{random_text(rng, rng.randint(1, 2))} {i}", "english": random_text(rng, 1)}
+             for i in range(300)]
+    index = VocabularySearch()
+    for word in words:
+        index.add_word(word, "test", "Test")
+    return index, words
+
+
+def brute_force_distances(words, term, max_distance):
+    """Smallest distance from the term to a token of each word, if close enough"""
+    distances = {}
+    for word in words:
+        tokens = [token for field in SEARCH_FIELDS for token in TOKEN_PATTERN.findall(normalize_text(word[field]))]
+        distance = min(levenshtein(term, token) for token in tokens)
+        if distance <= max_distance:
+            distances[word["spanish"]] = distance
+    return distances
+
+
+@pytest.mark.parametrize("max_distance", [0, 1, 2])
+def test_fuzzy_search_finds_every_word_a_brute_force_scan_does(index_and_words, max_distance):
+    index, words = index_and_words
+    rng = random.Random(max_distance)
+
+    for _ in range(25):
+        query = random_text(rng, 1)
+        expected = brute_force_distances(words, normalize_text(query), max_distance)
+
+        results = index.fuzzy_search(query, max_distance, limit=len(words))
+
+        assert {result["spanish"]: result["distance"] for result in results} == expected
+        assert [result["distance"] for result in results] == sorted(expected.values())
+
+
+def test_limited_fuzzy_search_returns_the_closest_words(index_and_words):
+    index, words = index_and_words
+    rng = random.Random(11)
+
+    for _ in range(25):
+        query = random_text(rng, 1)
+        expected = sorted(brute_force_distances(words, normalize_text(query), 2).values())
+
+        results = index.fuzzy_search(query, 2, limit=5)
+
+        assert [result["distance"] for result in results] == expected[:5]
+
+
+def test_prefix_search_matches_a_scan_of_fields_and_tokens(index_and_words):
+    index, words = index_and_words
+
+    for prefix in ("a", "áb", "CAD", "e", "dd", "1"):
+        normalized = normalize_text(prefix)
+        expected = {
+            word["spanish"] for word in words
+            if any(key.startswith(normalized)
+                   for field in SEARCH_FIELDS
+                   for key in [normalize_text(word[field])] + TOKEN_PATTERN.findall(normalize_text(word[field])))
+        }
+
+        results = index.prefix_search(prefix, limit=len(words))
+
+        assert {result["spanish"] for result in results} == expected
+        assert len(results) == len(expected)
@@ -0,0 +1,124 @@
+"""
+Spanish Learning Chatbot - Word Index Tests
+Checks that the alias tables give each word its weight's share exactly and
+that random picks, weighted picks and shuffles are uniform
+"""
+
+import random
+import itertools
+from collections import Counter
+
+import pytest
+
+from src.word_index import WordIndex, _AliasTable
+
+
+def chi_square_is_plausible(counts, expected):
+    """
+    Check Pearson's statistic for observed against expected counts at
+    p = 0.001 (Wilson-Hilferty approximation of the critical value); the
+    draws are seeded, so this only guards against a biased implementation
+    """
+    statistic = sum((counts.get(key, 0) - value) ** 2 / value for key, value in expected.items())
+    degrees = len(expected) - 1
+    limit = degrees * (1 - 2 / (9 * degrees) + 3.09 * (2 / (9 * degrees)) ** 0.5) ** 3
+    return statistic < limit
+
+
+def make_index(words_per_category):
+    """An index over categories of numbered words with a 'weight' field"""
+    index = WordIndex()
+    for category_number, count in enumerate(words_per_category):
+        category = {"name": f"category{category_number}", "words": []}
+        for _ in range(count):
+            add_word(index, category)
+    return index
+
+
+def add_word(index, category):
+    """Append a word to a category and index it"""
+    number = len(index)
+    category["words"].append({"spanish": f"palabra{number}", "weight": number % 4})
+    index.add_word(category)
+
+
+def weight(category, word):
+    return word["weight"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_alias_table_gives_each_position_its_weight_share(seed):
+    rng = random.Random(seed)
+    weights = [rng.choice([0, 0.5, 1, 3, 10]) * rng.random() for _ in range(rng.randint(1, 60))]
+    weights[rng.randrange(len(weights))] = 5.0
+    table = _AliasTable(weights)
+
+    # A draw picks slot i uniformly, then i itself or its alias
+    shares = [0.0] * len(weights)
+    for i, (probability, alias) in enumerate(zip(table.probabilities, table.aliases)):
+        shares[i] += probability / len(weights)
+        shares[alias] += (1 - probability) / len(weights)
+
+    assert shares == pytest.approx([w / sum(weights) for w in weights], abs=1e-9)
+
+
+def test_weighted_choice_follows_weights_including_words_added_later():
+    index = make_index([10, 6])
+    rng = random.Random(3)
+    index.weighted_choice(weight, rng)
+
+    # Added words go to the tail first, then trigger a rebuild
+    category = index.categories[0]
+    for round_words in (5, WordIndex.MIN_TAIL + 10):
+        for _ in range(round_words):
+            add_word(index, category)
+
+        draws = 100 * len(index)
+        counts = Counter(word["spanish"] for _, word in (index.weighted_choice(weight, rng) for _ in range(draws)))
+        words = [index.get(position)[1] for position in range(len(index))]
+        total = sum(word["weight"] for word in words)
+        expected = {word["spanish"]: draws * word["weight"] / total for word in words if word["weight"]}
+
+        assert set(counts) <= set(expected)
+        assert chi_square_is_plausible(counts, expected)
+
+
+def test_choice_is_uniform():
+    index = make_index([3, 7])
+    rng = random.Random(4)
+    draws = 20000
+
+    counts = Counter(word["spanish"] for _, word in (index.choice(rng) for _ in range(draws)))
+
+    expected = {index.get(position)[1]["spanish"]: draws / len(index) for position in range(len(index))}
+    assert chi_square_is_plausible(counts, expected)
+
+
+def test_shuffle_yields_every_word_once_in_uniformly_random_order():
+    index = make_index([2, 2])
+    rng = random.Random(5)
+    runs = 24000
+
+    orders = Counter(tuple(word["spanish"] for _, word in index.shuffled(rng)) for _ in range(runs))
+
+    words = [index.get(position)[1]["spanish"] for position in range(len(index))]
+    expected = {order: runs / 24 for order in itertools.permutations(words)}
+    assert set(orders) == set(expected)
+    assert chi_square_is_plausible(orders, expected)
+
+
+def test_sample_picks_distinct_words_uniformly():
+    index = make_index([4, 2])
+    rng = random.Random(6)
+    runs = 12000
+
+    counts = Counter()
+    for _ in range(runs):
+        sample = [word["spanish"] for _, word in index.sample(3, rng)]
+        assert len(set(sample)) == 3
+        counts.update(sample)
+
+    assert len(index.sample(100, rng)) == len(index)
+    assert index.sample(0, rng) == []
+    expected = {index.get(position)[1]["spanish"]: runs * 3 / len(index) for position in range(len(index))}
+    assert chi_square_is_plausible(counts, expected)